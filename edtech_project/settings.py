@@ -61,6 +61,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'question_solver.auth_middleware.JWTAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -222,6 +223,22 @@ RAZORPAY_PREMIUM_PLAN_ID = os.getenv('RAZORPAY_PREMIUM_PLAN_ID', 'plan_premium_4
 # Gemini API
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
 
+# Redis (leaderboards and shared caches). Empty = in-process fallbacks
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+# Shared cache across workers when Redis is available (login throttling,
+# daily quiz replay protection). Falls back to Django's per-process LocMemCache.
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# Lifetime of the signed token handed out with each daily quiz
+DAILY_QUIZ_TOKEN_MAX_AGE = int(os.getenv('DAILY_QUIZ_TOKEN_MAX_AGE', 2 * 60 * 60))
+
 # Google OAuth Configuration
 GOOGLE_OAUTH_CLIENT_ID = os.getenv('GOOGLE_OAUTH_CLIENT_ID', '')
 GOOGLE_OAUTH_CLIENT_SECRET = os.getenv('GOOGLE_OAUTH_CLIENT_SECRET', '')
@@ -234,6 +251,120 @@ JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
 JWT_EXPIRATION_HOURS = int(os.getenv('JWT_EXPIRATION_HOURS', 24))
 REFRESH_TOKEN_EXPIRATION_DAYS = int(os.getenv('REFRESH_TOKEN_EXPIRATION_DAYS', 7))
 
+# Verified-token LRU used by JWTAuthenticationMiddleware
+JWT_CACHE_MAX_ENTRIES = int(os.getenv('JWT_CACHE_MAX_ENTRIES', 10000))
+JWT_CACHE_TTL_SECONDS = int(os.getenv('JWT_CACHE_TTL_SECONDS', 300))
+
+# Login throughput controls (password hashing pool + failed-attempt throttling)
+LOGIN_HASH_WORKERS = int(os.getenv('LOGIN_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+LOGIN_HASH_MAX_QUEUE = int(os.getenv('LOGIN_HASH_MAX_QUEUE', 32))
+LOGIN_ACCOUNT_MAX_FAILURES = int(os.getenv('LOGIN_ACCOUNT_MAX_FAILURES', 5))
+LOGIN_IP_MAX_FAILURES = int(os.getenv('LOGIN_IP_MAX_FAILURES', 20))
+LOGIN_FAILURE_WINDOW_SECONDS = int(os.getenv('LOGIN_FAILURE_WINDOW_SECONDS', 900))
+# Reverse proxies that append to X-Forwarded-For (Render: 1). 0 = use REMOTE_ADDR
+LOGIN_TRUSTED_PROXY_COUNT = int(os.getenv('LOGIN_TRUSTED_PROXY_COUNT', 0))
+
+# Tiered search result cache (in-process LRU + shared Django cache)
+SEARCH_CACHE_L1_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_L1_MAX_ENTRIES', 2048))
+SEARCH_CACHE_L1_TTL_SECONDS = int(os.getenv('SEARCH_CACHE_L1_TTL_SECONDS', 600))
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv('SEARCH_CACHE_TTL_SECONDS', 86400))
+SEARCH_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv('SEARCH_CACHE_NEGATIVE_TTL_SECONDS', 60))
+
+# Translation / language detection cache (same tiered layout)
+TRANSLATION_CACHE_L1_MAX_ENTRIES = int(os.getenv('TRANSLATION_CACHE_L1_MAX_ENTRIES', 4096))
+TRANSLATION_CACHE_L1_TTL_SECONDS = int(os.getenv('TRANSLATION_CACHE_L1_TTL_SECONDS', 3600))
+TRANSLATION_CACHE_TTL_SECONDS = int(os.getenv('TRANSLATION_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+TRANSLATION_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv('TRANSLATION_CACHE_NEGATIVE_TTL_SECONDS', 30))
+
+# Scraped page content cache (size-bounded LRU, revalidated with conditional GETs)
+SCRAPER_CACHE_MAX_BYTES = int(os.getenv('SCRAPER_CACHE_MAX_BYTES', 4 * 1024 * 1024))
+SCRAPER_CACHE_FRESH_SECONDS = int(os.getenv('SCRAPER_CACHE_FRESH_SECONDS', 600))
+
+# Shared outbound HTTP engine (scraping, search APIs, YouTube API)
+FETCH_ENGINE_MAX_WORKERS = int(os.getenv('FETCH_ENGINE_MAX_WORKERS', 16))
+FETCH_PER_HOST_LIMIT = int(os.getenv('FETCH_PER_HOST_LIMIT', 4))
+
+# Persisted TF-IDF model for confidence scoring (manage.py fit_confidence_model)
+CONFIDENCE_MODEL_PATH = os.getenv('CONFIDENCE_MODEL_PATH', str(BASE_DIR / 'var' / 'confidence_tfidf.joblib'))
+
+# Trusted-domain tiers for search ranking. Empty = bundled question_solver/data/trusted_domains.json
+TRUSTED_DOMAINS_FILE = os.getenv('TRUSTED_DOMAINS_FILE', '')
+
+# Static Daily Quiz / Pair Quiz questions. Empty = bundled question_solver/data/question_bank.json
+QUESTION_BANK_FILE = os.getenv('QUESTION_BANK_FILE', '')
+
+# YouTube Data API quota budget (search = 100 units) and concept search cache
+YOUTUBE_DAILY_QUOTA_UNITS = int(os.getenv('YOUTUBE_DAILY_QUOTA_UNITS', 10000))
+YOUTUBE_QUOTA_RESERVE_UNITS = int(os.getenv('YOUTUBE_QUOTA_RESERVE_UNITS', 1000))
+YOUTUBE_CACHE_TTL_SECONDS = int(os.getenv('YOUTUBE_CACHE_TTL_SECONDS', 14 * 24 * 3600))
+YOUTUBE_METADATA_CACHE_TTL_SECONDS = int(os.getenv('YOUTUBE_METADATA_CACHE_TTL_SECONDS', 24 * 3600))
+
+# YouTube summarizer: how long one worker holds the generation lock for a video
+# and how long other workers wait for its stored summary before generating
+SUMMARY_LOCK_TIMEOUT_SECONDS = int(os.getenv('SUMMARY_LOCK_TIMEOUT_SECONDS', 180))
+SUMMARY_WAIT_SECONDS = int(os.getenv('SUMMARY_WAIT_SECONDS', 90))
+# Summaries with failed parts are not stored; they are cached this long so
+# repeat requests don't regenerate the whole video
+SUMMARY_PARTIAL_TTL_SECONDS = int(os.getenv('SUMMARY_PARTIAL_TTL_SECONDS', 900))
+
+# Long transcripts are summarized map-reduce: time-bounded chunks summarized
+# concurrently (cached by content hash), then merged in one reduce call
+SUMMARY_CHUNK_SECONDS = int(os.getenv('SUMMARY_CHUNK_SECONDS', 600))
+SUMMARY_CHUNK_MAX_CHARS = int(os.getenv('SUMMARY_CHUNK_MAX_CHARS', 15000))
+SUMMARY_MAP_CONCURRENCY = int(os.getenv('SUMMARY_MAP_CONCURRENCY', 4))
+SUMMARY_MAP_TIMEOUT_SECONDS = int(os.getenv('SUMMARY_MAP_TIMEOUT_SECONDS', 90))
+SUMMARY_MAP_RETRIES = int(os.getenv('SUMMARY_MAP_RETRIES', 1))
+SUMMARY_CHUNK_CACHE_TTL_SECONDS = int(os.getenv('SUMMARY_CHUNK_CACHE_TTL_SECONDS', 30 * 24 * 3600))
+
+# Document uploads (quiz / flashcards / study material / predicted questions):
+# PDF pages are extracted across a process pool once a document has
+# PARALLEL_MIN_PAGES pages to read. Extraction stops at the generator's prompt
+# budget (MAX_CHARS when none is given); documents with SAMPLE_RATIO times more
+# text than the budget are sampled (first, evenly spaced and last pages)
+DOCUMENT_INGESTION_WORKERS = int(os.getenv('DOCUMENT_INGESTION_WORKERS', min(4, os.cpu_count() or 1)))
+DOCUMENT_INGESTION_PAGES_PER_TASK = int(os.getenv('DOCUMENT_INGESTION_PAGES_PER_TASK', 8))
+DOCUMENT_INGESTION_PARALLEL_MIN_PAGES = int(os.getenv('DOCUMENT_INGESTION_PARALLEL_MIN_PAGES', 16))
+DOCUMENT_INGESTION_MAX_CHARS = int(os.getenv('DOCUMENT_INGESTION_MAX_CHARS', 100000))
+DOCUMENT_INGESTION_SAMPLE_RATIO = int(os.getenv('DOCUMENT_INGESTION_SAMPLE_RATIO', 3))
+
+# Batch quiz generation (POST /api/quiz/batch/): the most topics/documents
+# accepted in one batch. Items run as background jobs (JOB_* below)
+QUIZ_BATCH_MAX_ITEMS = int(os.getenv('QUIZ_BATCH_MAX_ITEMS', 50))
+
+# Largest document (bytes) accepted per batch item; larger uploads get 413.
+# Accepted documents are kept in default_storage until their job reads them
+QUIZ_BATCH_MAX_DOCUMENT_BYTES = int(os.getenv('QUIZ_BATCH_MAX_DOCUMENT_BYTES', 10485760))  # 10MB
+
+# Background generation jobs (manage.py run_job_worker). Quota errors are
+# retried with exponential backoff from JOB_RETRY_BASE_SECONDS; running jobs
+# not updated for JOB_LOCK_TIMEOUT_SECONDS are requeued. LOCAL_WORKERS runs
+# worker threads inside the web process, so jobs run on a deployment without
+# a separate worker; set it to 0 when run_job_worker processes are deployed.
+# FLASHCARD_ASYNC_MIN_CARDS > 0 queues requests for that many cards unless the
+# client sends async=false (off by default: clients opt in with async=true)
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 4))
+JOB_RETRY_BASE_SECONDS = int(os.getenv('JOB_RETRY_BASE_SECONDS', 15))
+JOB_RETRY_MAX_SECONDS = int(os.getenv('JOB_RETRY_MAX_SECONDS', 600))
+JOB_LOCK_TIMEOUT_SECONDS = int(os.getenv('JOB_LOCK_TIMEOUT_SECONDS', 600))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv('JOB_POLL_INTERVAL_SECONDS', 1.0))
+JOB_QUEUE_LOCAL_WORKERS = int(os.getenv('JOB_QUEUE_LOCAL_WORKERS', 2))
+JOB_PROGRESS_POLL_SECONDS = float(os.getenv('JOB_PROGRESS_POLL_SECONDS', 1.0))
+FLASHCARD_ASYNC_MIN_CARDS = int(os.getenv('FLASHCARD_ASYNC_MIN_CARDS', 0))
+
+# AI quiz feedback, cached per (quiz, wrong-answer pattern)
+QUIZ_FEEDBACK_CACHE_TTL_SECONDS = int(os.getenv('QUIZ_FEEDBACK_CACHE_TTL_SECONDS', 7 * 24 * 60 * 60))
+
+# Near-duplicate question detection (MinHash/LSH over normalized question +
+# answer text). NUM_PERM must be a multiple of BANDS; THRESHOLD is the
+# shingle Jaccard similarity at which two questions count as duplicates.
+# Generated sets are checked against the user's RECENT_QUIZZES quizzes and
+# topped up for the dropped count at most TOPUP_ROUNDS times
+QUESTION_DEDUP_NUM_PERM = int(os.getenv('QUESTION_DEDUP_NUM_PERM', 64))
+QUESTION_DEDUP_BANDS = int(os.getenv('QUESTION_DEDUP_BANDS', 16))
+QUESTION_DEDUP_THRESHOLD = float(os.getenv('QUESTION_DEDUP_THRESHOLD', 0.8))
+QUESTION_DEDUP_RECENT_QUIZZES = int(os.getenv('QUESTION_DEDUP_RECENT_QUIZZES', 20))
+QUESTION_DEDUP_TOPUP_ROUNDS = int(os.getenv('QUESTION_DEDUP_TOPUP_ROUNDS', 1))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
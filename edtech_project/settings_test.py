@@ -38,6 +38,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'question_solver.auth_middleware.JWTAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -154,6 +155,9 @@ RAZORPAY_PREMIUM_PLAN_ID = 'plan_premium_499'
 # Gemini API
 GEMINI_API_KEY = 'test-key'
 
+# Redis (empty = in-process fallbacks)
+REDIS_URL = ''
+
 # Google OAuth
 GOOGLE_OAUTH_CLIENT_ID = 'test-client-id'
 GOOGLE_OAUTH_CLIENT_SECRET = 'test-secret'
@@ -0,0 +1,237 @@
+"""
+JWT Authentication Middleware
+Verifies the Bearer token once per request and caches the decoded claims plus a
+small user projection in an LRU keyed by token hash, so authenticated endpoints
+no longer run jwt.decode + User.objects.get on every call.
+
+Attached to every request:
+    request.auth_claims  - decoded JWT payload or None
+    request.auth_user    - AuthUser projection or None
+    request.auth_error   - error message when a token was sent but rejected
+"""
+
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth.models import User
+import hashlib
+import jwt
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Fields loaded for the cached user projection (one indexed query on a miss)
+USER_PROJECTION_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'is_active', 'date_joined')
+
+
+class AuthUser:
+    """Read-only projection of auth.User carried on the request"""
+
+    __slots__ = USER_PROJECTION_FIELDS
+    is_authenticated = True
+
+    def __init__(self, **fields):
+        for name in USER_PROJECTION_FIELDS:
+            setattr(self, name, fields.get(name))
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __repr__(self):
+        return f"<AuthUser {self.id} {self.username}>"
+
+
+class TokenVerificationCache:
+    """
+    Thread-safe LRU of verified tokens
+
+    Entries expire at the token's own `exp` or after JWT_CACHE_TTL_SECONDS,
+    whichever comes first, so a cached token is never honoured past its expiry
+    and user projections are refreshed periodically.
+    """
+
+    def __init__(self, max_entries=10000, max_ttl=300):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token):
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def set(self, token, claims, user):
+        expires_at = time.time() + self.max_ttl
+        if claims.get('exp'):
+            expires_at = min(expires_at, float(claims['exp']))
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        total = self.hits + self.misses
+        return {
+            'size': size,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+token_cache = TokenVerificationCache(
+    max_entries=getattr(settings, 'JWT_CACHE_MAX_ENTRIES', 10000),
+    max_ttl=getattr(settings, 'JWT_CACHE_TTL_SECONDS', 300),
+)
+
+
+def _claims_user_id(claims):
+    return claims.get('user_id') or claims.get('id') or claims.get('sub')
+
+
+def _signing_secrets():
+    # Email/password tokens are signed with SECRET_KEY, Google OAuth tokens with JWT_SECRET
+    secrets = [settings.SECRET_KEY]
+    jwt_secret = os.getenv('JWT_SECRET') or getattr(settings, 'JWT_SECRET', '')
+    if jwt_secret and jwt_secret not in secrets:
+        secrets.append(jwt_secret)
+    return secrets
+
+
+def _algorithms():
+    algorithm = getattr(settings, 'JWT_ALGORITHM', 'HS256') or 'HS256'
+    return [algorithm] if algorithm == 'HS256' else [algorithm, 'HS256']
+
+
+def decode_token(token):
+    """
+    Decode and verify a JWT against every configured signing secret
+
+    Raises:
+        jwt.ExpiredSignatureError / jwt.InvalidTokenError
+    """
+    last_error = None
+    for secret in _signing_secrets():
+        try:
+            return jwt.decode(token, secret, algorithms=_algorithms())
+        except jwt.ExpiredSignatureError:
+            raise
+        except jwt.InvalidSignatureError as e:
+            last_error = e
+    raise last_error or jwt.InvalidTokenError('Invalid token')
+
+
+def verify_token(token):
+    """
+    Verify a token, using the LRU when possible
+
+    Returns:
+        (claims, AuthUser or None) - user is None when the account no longer exists
+
+    Raises:
+        jwt.ExpiredSignatureError / jwt.InvalidTokenError
+    """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    claims = decode_token(token)
+    user = None
+    user_id = _claims_user_id(claims)
+    if user_id is not None:
+        try:
+            row = User.objects.filter(id=user_id).values(*USER_PROJECTION_FIELDS).first()
+        except (ValueError, TypeError):
+            row = None
+        if row:
+            user = AuthUser(**row)
+
+    token_cache.set(token, claims, user)
+    return claims, user
+
+
+def _bearer_token(request):
+    auth_header = request.META.get('HTTP_AUTHORIZATION', '').strip()
+    if not auth_header.startswith('Bearer '):
+        return None
+    parts = auth_header.split(' ', 1)
+    token = parts[1].strip() if len(parts) == 2 else ''
+    return token or None
+
+
+def authenticate_request(request):
+    """
+    Populate request.auth_claims / auth_user / auth_error once per request
+
+    Safe to call from views and decorators: it is a no-op when the middleware
+    (or an earlier call) already ran for this request.
+    """
+    if getattr(request, '_jwt_auth_checked', False):
+        return request.auth_user
+
+    request.auth_claims = None
+    request.auth_user = None
+    request.auth_error = None
+
+    token = _bearer_token(request)
+    if token:
+        try:
+            claims, user = verify_token(token)
+            request.auth_claims = claims
+            request.auth_user = user
+            if user is None:
+                request.auth_error = 'User not found'
+        except jwt.ExpiredSignatureError:
+            request.auth_error = 'Token has expired'
+        except jwt.InvalidTokenError as e:
+            request.auth_error = f'Invalid token: {str(e)}'
+        except Exception as e:
+            logger.error(f"[AUTH_MIDDLEWARE] Unexpected error verifying token: {str(e)}", exc_info=True)
+            request.auth_error = 'Authentication failed'
+
+    request._jwt_auth_checked = True
+    return request.auth_user
+
+
+class JWTAuthenticationMiddleware:
+    """
+    Verify the Bearer token once per request and attach claims + user projection
+
+    Does not reject requests - views and @require_auth decide what to do with
+    request.auth_user / request.auth_error.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        authenticate_request(request)
+        return self.get_response(request)
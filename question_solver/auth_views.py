@@ -16,6 +16,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
+from .auth_middleware import authenticate_request
 import logging
 
 logger = logging.getLogger(__name__)
@@ -388,14 +389,20 @@ class UserProfileView(APIView):
                     status=status.HTTP_401_UNAUTHORIZED
                 )
 
-            token = auth_header.split(' ')[1]
-            jwt_secret = os.getenv('JWT_SECRET', settings.SECRET_KEY)
-            jwt_algorithm = os.getenv('JWT_ALGORITHM', 'HS256')
+            # Token + user projection verified by JWTAuthenticationMiddleware (LRU-cached)
+            user = authenticate_request(request)
 
-            # Decode token
-            payload = jwt.decode(token, jwt_secret, algorithms=[jwt_algorithm])
-            
-            user = User.objects.get(id=payload['user_id'])
+            if request.auth_claims is None:
+                return Response(
+                    {'error': 'Token has expired' if request.auth_error == 'Token has expired' else 'Invalid token'},
+                    status=status.HTTP_401_UNAUTHORIZED
+                )
+
+            if user is None:
+                return Response(
+                    {'error': 'User not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
             
             # Get user coins
             from .models import UserCoins, CoinWithdrawal
@@ -433,21 +440,6 @@ class UserProfileView(APIView):
                 }
             }, status=status.HTTP_200_OK)
 
-        except jwt.ExpiredSignatureError:
-            return Response(
-                {'error': 'Token has expired'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-        except jwt.InvalidTokenError:
-            return Response(
-                {'error': 'Invalid token'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-        except User.DoesNotExist:
-            return Response(
-                {'error': 'User not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
         except Exception as e:
             logger.error(f'Profile retrieval error: {str(e)}')
             return Response(
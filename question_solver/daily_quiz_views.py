@@ -1,13 +1,14 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from django.db import transaction
 from datetime import date
-from .static_questions_bank import get_random_questions
+from django.db import transaction
+from .static_questions_bank import LANGUAGES, get_pool_size, sample_question_indices, get_questions_by_indices
 from .models import UserCoins, CoinTransaction, QuizSettings
+from .services.coin_ledger_service import coin_ledger
+from .services.leaderboard_service import leaderboard_service
+from .services.quiz_token_service import quiz_token_service, QuizTokenError
 import logging
-import random
-import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -16,15 +17,20 @@ logger = logging.getLogger(__name__)
 def get_daily_quiz(request):
     user_id = request.query_params.get('user_id', 'anonymous')
     language = request.query_params.get('language', 'english').lower()
+    if language not in LANGUAGES:
+        language = 'english'
+    # Optional filters, e.g. ?category=science&difficulty=medium
+    category = request.query_params.get('category') or None
+    difficulty = request.query_params.get('difficulty') or None
     today = date.today()
     
     try:
         # Get 5 TRULY RANDOM questions from static bank - no seeding, no consistency
-        all_static = get_random_questions(language=language, count=100)
-        selected_questions = random.sample(all_static, min(5, len(all_static)))
+        question_indices = sample_question_indices(language=language, count=5, category=category, difficulty=difficulty)
+        selected_questions = get_questions_by_indices(language, question_indices)
         
         if not selected_questions:
-            logger.error(f"[DAILY_QUIZ] ❌ No questions available for language: {language}")
+            logger.error(f"[DAILY_QUIZ] ❌ No questions available for language: {language} (category={category}, difficulty={difficulty})")
             return Response({
                 'error': 'Quiz unavailable',
                 'message': 'No questions available for this language.'
@@ -32,34 +38,24 @@ def get_daily_quiz(request):
         
         logger.info(f"[DAILY_QUIZ] ✅ Generated random quiz with {len(selected_questions)} questions ({language}) for {user_id}")
         
-        # Store the questions in session for validation during submission
-        request.session['quiz_questions'] = [
-            {
-                'id': idx + 1,
-                'correct': q.get('correct'),
-                'question': q.get('question')
-            }
-            for idx, q in enumerate(selected_questions)
-        ]
-        request.session.modified = True
-        
-        # Generate unique quiz_id for this session
-        quiz_id = str(uuid.uuid4())
-        request.session['quiz_id'] = quiz_id
-        request.session.modified = True
+        # Signed token carries the question IDs - submission is verified against the bank, no session needed
+        quiz_token, nonce = quiz_token_service.issue(user_id, language, question_indices)
         
         return Response({
-            'quiz_id': quiz_id,
+            'quiz_id': quiz_token,
+            'quiz_token': quiz_token,
             'quiz_metadata': {
                 'quiz_type': 'random_questions',
                 'total_questions': len(selected_questions),
-                'difficulty': 'medium',
+                'difficulty': difficulty or 'medium',
+                'category': category,
                 'date': str(today),
                 'title': f'Random GK Quiz',
                 'description': 'Test your general knowledge! Get random questions every time.',
                 'language': language,
-                'question_bank_size': 100,
+                'question_bank_size': get_pool_size(language),
                 'questions_shown': len(selected_questions),
+                'expires_in': quiz_token_service.MAX_AGE_SECONDS,
             },
             'questions': [
                 {
@@ -106,12 +102,13 @@ def start_daily_quiz(request):
 def submit_daily_quiz(request):
     """
     Submit daily quiz answers and calculate coins
-    Validates against the questions stored in session from the get_daily_quiz call
+    Validates against the static question bank using the signed quiz token
+    (quiz_token or quiz_id) returned by get_daily_quiz
     """
     try:
         user_id = request.data.get('user_id', 'anonymous')
-        language = request.data.get('language', 'english').lower()
         answers = request.data.get('answers', {})  # {question_id: answer_index}
+        quiz_token = request.data.get('quiz_token') or request.data.get('quiz_id')
         
         if not answers:
             return Response({
@@ -119,16 +116,26 @@ def submit_daily_quiz(request):
                 'message': 'answers field is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        logger.info(f"[SUBMIT_DAILY_QUIZ] User {user_id} submitting quiz ({language})")
-        
-        # Get the questions that were sent to the user from session
-        quiz_questions = request.session.get('quiz_questions', [])
-        if not quiz_questions:
+        if not quiz_token:
             return Response({
                 'error': 'Quiz session expired',
                 'message': 'Please reload the quiz and try again.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        try:
+            quiz = quiz_token_service.verify(quiz_token, user_id)
+        except QuizTokenError as e:
+            return Response({
+                'error': 'Invalid quiz',
+                'error_code': e.code,
+                'message': e.message
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        language = quiz['language']
+        quiz_questions = get_questions_by_indices(language, quiz['question_indices'])
+        
+        logger.info(f"[SUBMIT_DAILY_QUIZ] User {user_id} submitting quiz ({language})")
+        
         correct_count = 0
         results = []
         
@@ -158,18 +165,29 @@ def submit_daily_quiz(request):
         settings = QuizSettings.get_settings()
         coins_earned = correct_count * settings.daily_quiz_coins_per_correct
         
-        # Store coins in DB
-        with transaction.atomic():
-            user_coins, created = UserCoins.objects.get_or_create(
-                user_id=user_id,
-                defaults={'total_coins': 0, 'lifetime_coins': 0}
-            )
-            user_coins.add_coins(coins_earned, reason=f"Daily Quiz completion ({language}) - {correct_count}/{len(quiz_questions)} correct")
-        
-        # Clear the session questions after submission
-        if 'quiz_questions' in request.session:
-            del request.session['quiz_questions']
-            request.session.modified = True
+        # The nonce is taken right before the credit (blocking concurrent
+        # replays) and released if the credit does not commit, so a failed
+        # submission can be retried with the same token
+        try:
+            quiz_token_service.consume(quiz['nonce'])
+        except QuizTokenError as e:
+            return Response({
+                'error': 'Invalid quiz',
+                'error_code': e.code,
+                'message': e.message
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                # Store coins in DB (single atomic UPDATE + transaction insert)
+                coin_ledger.credit(
+                    user_id,
+                    coins_earned,
+                    reason=f"Daily Quiz completion ({language}) - {correct_count}/{len(quiz_questions)} correct"
+                )
+                transaction.on_commit(lambda: leaderboard_service.record_quiz_score(user_id, correct_count))
+        except Exception:
+            quiz_token_service.release(quiz['nonce'])
+            raise
         
         return Response({
             'success': True,
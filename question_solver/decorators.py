@@ -8,7 +8,7 @@ from rest_framework import status
 from .models import UserSubscription
 from django.utils import timezone
 from django.http import JsonResponse
-import jwt
+from .auth_middleware import authenticate_request
 import json
 import logging
 
@@ -93,8 +93,6 @@ def require_auth(view_func):
     """
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        from django.conf import settings
-        
         # Try X-User-ID header first (for testing and development)
         user_id = request.META.get('HTTP_X_USER_ID', '')
         if user_id:
@@ -111,45 +109,31 @@ def require_auth(view_func):
                 'error': 'Missing or invalid authorization header. Use "Authorization: Bearer <token>" or "X-User-ID: <user_id>"'
             }, status=401)
         
-        token = auth_header.split(' ')[1]
-        
-        try:
-            # Decode JWT token
-            secret_key = getattr(settings, 'SECRET_KEY', 'your-secret-key')
-            payload = jwt.decode(token, secret_key, algorithms=['HS256'])
-            
-            # Extract user_id from token
-            user_id = payload.get('user_id') or payload.get('id') or payload.get('sub')
-            
-            if not user_id:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Invalid token: user_id not found'
-                }, status=401)
-            
-            # Inject user_id into request
-            request.user_id = user_id
-            request.user_token = payload
-            
-            # Call the actual view
-            return view_func(request, *args, **kwargs)
+        # Claims are verified once per request (and cached across requests) by JWTAuthenticationMiddleware
+        authenticate_request(request)
+        payload = request.auth_claims
         
-        except jwt.ExpiredSignatureError:
-            return JsonResponse({
-                'success': False,
-                'error': 'Token has expired'
-            }, status=401)
-        except jwt.InvalidTokenError as e:
+        if payload is None:
             return JsonResponse({
                 'success': False,
-                'error': f'Invalid token: {str(e)}'
+                'error': request.auth_error or 'Invalid token'
             }, status=401)
-        except Exception as e:
-            logger.error(f"Authentication error: {str(e)}", exc_info=True)
+        
+        # Extract user_id from token
+        user_id = payload.get('user_id') or payload.get('id') or payload.get('sub')
+        
+        if not user_id:
             return JsonResponse({
                 'success': False,
-                'error': f'Authentication failed: {str(e)}'
+                'error': 'Invalid token: user_id not found'
             }, status=401)
+        
+        # Inject user_id into request
+        request.user_id = user_id
+        request.user_token = payload
+        
+        # Call the actual view
+        return view_func(request, *args, **kwargs)
     
     return wrapper
 
@@ -0,0 +1,131 @@
+"""
+Background generation jobs: queueing helpers for the generation views plus
+status / result endpoints
+"""
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+import logging
+
+from .services.job_queue import job_queue, IdempotencyConflict, RetryJob
+
+logger = logging.getLogger(__name__)
+
+_TRUE = ('1', 'true', 'yes', 'on')
+_FALSE = ('0', 'false', 'no', 'off')
+
+
+def wants_async(request, default=False):
+    """
+    Whether the client asked for a queued job instead of a blocking response
+
+    An explicit 'async' query/body parameter wins, then a
+    'Prefer: respond-async' header, then the endpoint's default.
+    """
+    value = request.query_params.get('async')
+    if value is None and hasattr(request.data, 'get'):
+        value = request.data.get('async')
+    if value is not None:
+        value = str(value).strip().lower()
+        if value in _TRUE:
+            return True
+        if value in _FALSE:
+            return False
+    if 'respond-async' in request.headers.get('Prefer', '').lower():
+        return True
+    return default
+
+
+def queue_generation(request, kind, payload):
+    """
+    Queue a generation job and return the 202 response for it
+
+    An Idempotency-Key header (or idempotency_key field) makes resubmission
+    return the original job instead of queueing another Gemini call. Keys
+    are per user; reusing one for a different request is a 422.
+    """
+    idempotency_key = request.headers.get('Idempotency-Key')
+    if not idempotency_key and hasattr(request.data, 'get'):
+        idempotency_key = request.data.get('idempotency_key')
+    user_id = request.data.get('user_id', '') if hasattr(request.data, 'get') else ''
+
+    try:
+        job, created = job_queue.enqueue(kind, payload, idempotency_key=idempotency_key, user_id=user_id)
+    except IdempotencyConflict as e:
+        return Response({
+            'error': 'Idempotency-Key reused with a different request',
+            'details': str(e),
+            'job_id': str(e.job.id)
+        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    body = job_queue.job_status(job)
+    body['created'] = created
+    return Response(
+        body,
+        status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK,
+        headers={'Location': body['status_url']}
+    )
+
+
+def parse_retry_after(value):
+    """Whole seconds of a retry_after field or Retry-After header, None if not a number (e.g. an HTTP date)"""
+    try:
+        return max(0, int(float(value)))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def job_result(response):
+    """
+    (http_status, body) of a generation view's response, for job handlers
+
+    Quota responses (429) raise RetryJob so the queue retries them with
+    backoff instead of failing the job.
+    """
+    if response.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+        data = response.data if isinstance(response.data, dict) else {}
+        retry_after = parse_retry_after(data.get('retry_after'))
+        if retry_after is None:
+            retry_after = parse_retry_after(response.get('Retry-After'))
+        raise RetryJob(
+            data.get('details') or data.get('error') or 'quota_exceeded',
+            retry_after=retry_after,
+            result=response.data,
+            result_status=response.status_code,
+        )
+    return response.status_code, response.data
+
+
+class JobStatusView(APIView):
+    """
+    Status and progress of a generation job
+    GET /api/jobs/{job_id}/
+    """
+
+    def get(self, request, job_id):
+        job = job_queue.get(job_id)
+        if job is None:
+            return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job_queue.job_status(job))
+
+
+class JobResultView(APIView):
+    """
+    Result of a generation job: the body and HTTP status the synchronous
+    endpoint would have returned, or 202 with the job status while it runs
+    GET /api/jobs/{job_id}/result/
+    """
+
+    def get(self, request, job_id):
+        job = job_queue.get(job_id)
+        if job is None:
+            return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+        if not job.is_finished:
+            return Response(job_queue.job_status(job), status=status.HTTP_202_ACCEPTED)
+
+        headers = {}
+        if job.result_status == status.HTTP_429_TOO_MANY_REQUESTS and isinstance(job.result, dict):
+            retry_after = parse_retry_after(job.result.get('retry_after'))
+            if retry_after is not None:
+                headers['Retry-After'] = str(retry_after)
+        return Response(job.result, status=job.result_status or status.HTTP_200_OK, headers=headers)
@@ -0,0 +1,53 @@
+"""
+Job handlers for the question_solver generation endpoints
+Each runs the view's generate() with the queued input, so a job's result is
+what the synchronous request would have returned. quiz_feedback fills in the
+AI analysis of a quiz submission after its score was returned, and
+quiz_batch_item generates one quiz of a batch.
+"""
+
+from .job_views import job_result
+from .services.job_queue import job_queue
+from .services.quiz_batch_service import quiz_batch_service
+from .services.quiz_feedback_service import quiz_feedback_service
+from .views import FlashcardGeneratorView, PredictedQuestionsView, StudyMaterialGeneratorView
+
+
+@job_queue.handler('flashcards')
+def generate_flashcards(payload, progress):
+    progress(10, f"Generating {payload['num_cards']} flashcards")
+    return job_result(FlashcardGeneratorView().generate(payload['topic'], payload['num_cards'], payload['language']))
+
+
+@job_queue.handler('study_material')
+def generate_study_material(payload, progress):
+    progress(10, 'Generating study material')
+    return job_result(StudyMaterialGeneratorView().generate(payload['text_content']))
+
+
+@job_queue.handler('predicted_questions')
+def generate_predicted_questions(payload, progress):
+    progress(10, f"Generating {payload['num_questions']} predicted questions")
+    return job_result(PredictedQuestionsView().generate(
+        payload['topic'],
+        payload.get('document'),
+        payload['exam_type'],
+        payload['num_questions'],
+        payload['language']
+    ))
+
+
+@job_queue.handler('quiz_feedback')
+def generate_quiz_feedback(payload, progress):
+    progress(10, 'Analyzing answers')
+    analysis = quiz_feedback_service.analyze(payload['response_id'])
+    return 200, {
+        'response_id': payload['response_id'],
+        'analysis_status': 'failed' if 'error' in analysis else 'completed',
+        'analysis': analysis
+    }
+
+
+@job_queue.handler(quiz_batch_service.JOB_KIND)
+def generate_quiz_batch_item(payload, progress):
+    return quiz_batch_service.run_item(payload['item_id'], progress)
@@ -0,0 +1,103 @@
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from .services.leaderboard_service import leaderboard_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _board_params(request):
+    metric = request.query_params.get('metric', 'coins').lower()
+    period = request.query_params.get('period', 'all_time').lower()
+    if metric not in leaderboard_service.METRICS:
+        raise ValueError(f"metric must be one of {', '.join(leaderboard_service.METRICS)}")
+    if period not in leaderboard_service.PERIODS:
+        raise ValueError(f"period must be one of {', '.join(leaderboard_service.PERIODS)}")
+    return metric, period
+
+
+@api_view(['GET'])
+def get_leaderboard(request):
+    """
+    Top-K page of a leaderboard
+    Query params: metric (coins|quiz), period (daily|weekly|all_time), limit, offset, user_id (optional)
+    """
+    try:
+        metric, period = _board_params(request)
+        limit = int(request.query_params.get('limit', 10))
+        offset = int(request.query_params.get('offset', 0))
+    except ValueError as e:
+        return Response({
+            'error': 'Invalid parameters',
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        page = leaderboard_service.get_top(metric, period, limit=limit, offset=offset)
+        data = {
+            'success': True,
+            'metric': metric,
+            'period': period,
+            'offset': offset,
+            'total': page['total'],
+            'entries': page['entries'],
+        }
+
+        user_id = request.query_params.get('user_id')
+        if user_id:
+            data['user'] = {'user_id': user_id, **leaderboard_service.get_rank(metric, period, user_id)}
+
+        return Response(data, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"[LEADERBOARD] Error fetching leaderboard: {e}", exc_info=True)
+        return Response({
+            'error': 'Internal server error',
+            'message': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def get_leaderboard_rank(request):
+    """
+    Rank of a single user on one board, or on every board when metric/period are omitted
+    Query params: user_id (required), metric, period
+    """
+    user_id = request.query_params.get('user_id')
+    if not user_id:
+        return Response({'error': 'user_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        if 'metric' in request.query_params or 'period' in request.query_params:
+            metric, period = _board_params(request)
+            boards = [(metric, period)]
+        else:
+            boards = [
+                (metric, period)
+                for metric in leaderboard_service.METRICS
+                for period in leaderboard_service.PERIODS
+            ]
+    except ValueError as e:
+        return Response({
+            'error': 'Invalid parameters',
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        ranks = {}
+        for metric, period in boards:
+            ranks.setdefault(metric, {})[period] = leaderboard_service.get_rank(metric, period, user_id)
+
+        return Response({
+            'success': True,
+            'user_id': user_id,
+            'ranks': ranks,
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"[LEADERBOARD] Error fetching rank for {user_id}: {e}", exc_info=True)
+        return Response({
+            'error': 'Internal server error',
+            'message': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,105 @@
+from django.core.management.base import BaseCommand
+from question_solver.services.document_ingestion import DocumentIngestionService, document_ingestion
+import os
+import tempfile
+import time
+
+_WORDS = (
+    "force mass acceleration energy momentum velocity displacement equilibrium "
+    "photosynthesis chlorophyll mitochondria enzyme osmosis diffusion respiration "
+    "integral derivative matrix vector probability polynomial quadratic theorem"
+).split()
+
+
+def build_sample_pdf(path, pages, lines_per_page=45):
+    """Write a text-layer PDF with the given number of pages (no extra dependencies)"""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+    for number in range(pages):
+        lines = []
+        for line in range(lines_per_page):
+            words = ' '.join(_WORDS[(number * 7 + line * 3 + k) % len(_WORDS)] for k in range(10))
+            lines.append(f'({number + 1}.{line + 1} {words}) Tj T*')
+        stream = ('BT /F1 9 Tf 11 TL 40 800 Td ' + ' '.join(lines) + ' ET').encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        content_id = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_id
+        )
+        page_ids.append(len(objects))
+    kids = ' '.join(f'{page_id} 0 R' for page_id in page_ids).encode('ascii')
+    objects[1] = b'<< /Type /Pages /Kids [' + kids + b'] /Count %d >>' % pages
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref_at = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_at)
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def legacy_pdf_text(path):
+    """The per-view PyPDF2 loop document_ingestion replaced"""
+    import PyPDF2
+    with open(path, 'rb') as f:
+        pdf_reader = PyPDF2.PdfReader(f)
+        topic = ""
+        for page in pdf_reader.pages:
+            topic += page.extract_text() + "\n"
+    return topic
+
+
+class Command(BaseCommand):
+    help = 'Time legacy serial PDF extraction against document_ingestion (parallel, budget-bounded)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='PDF to ingest (default: a generated sample)')
+        parser.add_argument('--pages', type=int, default=200, help='Pages of the generated sample')
+        parser.add_argument('--budget', type=int, default=0, help='Character budget (0 = whole document)')
+
+    def handle(self, *args, **options):
+        path = options['file']
+        generated = path is None
+        if generated:
+            path = os.path.join(tempfile.gettempdir(), f"ingest_benchmark_{options['pages']}.pdf")
+            build_sample_pdf(path, options['pages'])
+
+        try:
+            started = time.perf_counter()
+            legacy = legacy_pdf_text(path)
+            legacy_seconds = time.perf_counter() - started
+            self.stdout.write(f'  legacy serial loop     {legacy_seconds * 1000:8.1f} ms  {len(legacy)} chars')
+
+            budget = options['budget'] or len(legacy) + 1
+            serial = DocumentIngestionService(max_workers=1, max_chars=budget)
+            runs = [('ingestion, 1 process', serial), (f'ingestion, {document_ingestion.max_workers} processes', document_ingestion)]
+
+            # Warm the worker pool so process start-up is not timed
+            with open(path, 'rb') as f:
+                document_ingestion.ingest(f, max_chars=budget)
+
+            timings = {}
+            for name, service in runs:
+                with open(path, 'rb') as f:
+                    started = time.perf_counter()
+                    result = service.ingest(f, max_chars=budget)
+                    timings[name] = time.perf_counter() - started
+                self.stdout.write(
+                    f"  {name:<22} {timings[name] * 1000:8.1f} ms  {len(result['text'])} chars, "
+                    f"{len(result['pages'])}/{result['page_count']} pages{' (sampled)' if result['sampled'] else ''}"
+                )
+                if not options['budget'] and result['text'].split() != legacy.split():
+                    self.stdout.write(self.style.WARNING('    text differs from the legacy loop'))
+
+            best = min(timings.values())
+            self.stdout.write(self.style.SUCCESS(f'Best ingestion run is {legacy_seconds / best:.1f}x the legacy loop'))
+        finally:
+            if generated:
+                os.remove(path)
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from pathlib import Path
+from question_solver.services.html_extractor import extract_page_text, soup_extract_page_text
+import random
+import time
+
+
+def _fixture_page(rng, index):
+    """Solution-site shaped page: heavy head/nav/footer chrome around an article"""
+    words = ['force', 'mass', 'acceleration', 'equation', 'solve', 'value', 'step', 'answer',
+             'integral', 'derivative', 'triangle', 'angle', 'velocity', 'energy', 'reaction']
+    sentence = lambda n: ' '.join(rng.choice(words) for _ in range(n)).capitalize() + '.'
+    scripts = ''.join(
+        f'<script>window.__d{i}={{"k":"{"x" * rng.randint(200, 2000)}"}};</script>' for i in range(rng.randint(8, 20))
+    )
+    styles = ''.join(f'<style>.c{i}{{margin:{i}px;padding:{i}px}}</style>' for i in range(rng.randint(5, 15)))
+    nav = '<nav><ul>' + ''.join(
+        f'<li><a href="/topic/{i}">Topic {i}</a></li>' for i in range(rng.randint(50, 200))
+    ) + '</ul></nav>'
+    article = ''.join(
+        f'<div class="content"><h2>Step {i}</h2><p>{" ".join(sentence(rng.randint(8, 20)) for _ in range(5))}</p></div>'
+        for i in range(rng.randint(20, 80))
+    )
+    related = '<aside>' + ''.join(f'<p>{sentence(12)}</p>' for _ in range(rng.randint(20, 60))) + '</aside>'
+    footer = '<footer>' + ''.join(f'<a href="/f/{i}">Link {i}</a>' for i in range(100)) + '</footer>'
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Solution {index} &amp; explanation</title>'
+        f'{styles}{scripts}</head><body><header><div>Site header</div></header>{nav}'
+        f'<main><article>{article}</article>{related}</main>{footer}</body></html>'
+    ).encode('utf-8')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark streaming HTML text extraction against the BeautifulSoup path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=50, help='Number of generated fixture pages')
+        parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus per extractor')
+        parser.add_argument('--dir', type=str, help='Also include saved *.html pages from this directory')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        corpus = [_fixture_page(rng, i) for i in range(options['pages'])]
+        if options.get('dir'):
+            corpus.extend(path.read_bytes() for path in sorted(Path(options['dir']).glob('*.html')))
+
+        total_kb = sum(len(page) for page in corpus) / 1024
+        self.stdout.write(f'Corpus: {len(corpus)} pages, {total_kb:.0f} KB')
+
+        timings = {}
+        outputs = {}
+        for name, extractor in (('beautifulsoup', soup_extract_page_text), ('streaming', extract_page_text)):
+            started = time.process_time()
+            for _ in range(options['repeat']):
+                outputs[name] = [extractor(page) for page in corpus]
+            elapsed = time.process_time() - started
+            timings[name] = elapsed * 1000 / (len(corpus) * options['repeat'])
+            self.stdout.write(f'  {name:<14} {timings[name]:8.2f} ms CPU/page')
+
+        same_title = sum(1 for a, b in zip(outputs['beautifulsoup'], outputs['streaming']) if a[0] == b[0])
+        same_text = sum(1 for a, b in zip(outputs['beautifulsoup'], outputs['streaming']) if a[1] == b[1])
+        speedup = timings['beautifulsoup'] / timings['streaming'] if timings['streaming'] else 0
+        self.stdout.write(f'  identical titles: {same_title}/{len(corpus)}, identical text: {same_text}/{len(corpus)}')
+        self.stdout.write(self.style.SUCCESS(f'Streaming extraction is {speedup:.1f}x faster per page'))
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand
+from question_solver.services.text_normalizer import text_normalizer
+import random
+import re
+import timeit
+import unicodedata
+
+
+def legacy_clean_text(text):
+    """The regex implementation clean_text used before text_normalizer"""
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s\+\-\*/=\(\)\[\]\{\}\?\.,:;°√∫∑∏αβγδεπθλμσφψω]', '', text)
+    text = re.sub(r'\s*([+\-*/=])\s*', r' \1 ', text)
+    return text.strip()
+
+
+_SAMPLES = [
+    "Find the value of x if 2x+3 = 7",
+    "A body of mass 5 kg moves with velocity 10 m/s. Calculate its kinetic energy!",
+    "What is Newton's second law of motion?\n\nExplain with an example.",
+    "∫ x^2 dx from 0 to 1 = ?",
+    "If sin θ = 3/5, find cos θ and tan θ.",
+    "Solve:  (a+b)^2 - (a-b)^2 = 4ab  ->  prove it",
+    "The pH of a 0.01 M HCl solution is ___ (assume complete dissociation)",
+    "न्यूटन का दूसरा नियम क्या है?",
+    "एक वस्तु का द्रव्यमान 5 kg है तथा वेग 10 m/s है। गतिज ऊर्जा ज्ञात कीजिए।",
+    "Q.12) Th3 ar3a of a circ1e with radius r is — πr² ✓ @#%",
+]
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark text_normalizer.clean / clean_many against the legacy regex clean_text'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--texts', type=int, default=1000, help='Corpus size')
+        parser.add_argument('--number', type=int, default=20, help='Timing loops per measurement')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        corpus = [rng.choice(_SAMPLES) * rng.randint(1, 4) for _ in range(options['texts'])]
+        number = options['number']
+        per_call = lambda seconds: seconds * 1e6 / (number * len(corpus))
+
+        ascii_corpus = [text for text in corpus if text.isascii()]
+        cases = [
+            ('legacy regex (all)', lambda: [legacy_clean_text(t) for t in corpus]),
+            ('clean (all)', lambda: [text_normalizer.clean(t) for t in corpus]),
+            ('clean_many (all)', lambda: text_normalizer.clean_many(corpus)),
+            ('legacy regex (ascii)', lambda: [legacy_clean_text(t) for t in ascii_corpus]),
+            ('clean (ascii)', lambda: [text_normalizer.clean(t) for t in ascii_corpus]),
+            ('clean_many (ascii)', lambda: text_normalizer.clean_many(ascii_corpus)),
+            ('keywords (all)', lambda: text_normalizer.keywords_many(corpus)),
+        ]
+
+        self.stdout.write(f'Corpus: {len(corpus)} texts ({len(ascii_corpus)} ASCII), {number} loops')
+        results = {}
+        for name, func in cases:
+            func()  # warm the code point tables
+            size = len(ascii_corpus) if '(ascii)' in name else len(corpus)
+            seconds = min(timeit.repeat(func, number=number, repeat=3))
+            results[name] = seconds * 1e6 / (number * size)
+            self.stdout.write(f'  {name:<22} {results[name]:7.2f} us/text')
+
+        # Parity: identical to the legacy output once its leftover double spaces
+        # are collapsed, except where legacy stripped combining marks (\w misses them)
+        mismatches = 0
+        for text in set(corpus):
+            legacy = ' '.join(legacy_clean_text(text).split())
+            has_marks = any(unicodedata.category(ch) in ('Mn', 'Mc') for ch in text)
+            if not has_marks and legacy != text_normalizer.clean(text):
+                mismatches += 1
+                self.stdout.write(self.style.WARNING(f'  mismatch: {text!r}'))
+        batch_ok = text_normalizer.clean_many(corpus) == [text_normalizer.clean(t) for t in corpus]
+
+        self.stdout.write(f'  parity mismatches: {mismatches}, clean_many == clean: {batch_ok}')
+        speedup = results['legacy regex (all)'] / results['clean (all)']
+        self.stdout.write(self.style.SUCCESS(f'clean() is {speedup:.1f}x faster than the legacy regex path'))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from question_solver.models import QuizQuestion, DailyQuestion
+from question_solver.services.confidence_service import (
+    confidence_scorer, TfidfConfidenceModel, build_default_corpus
+)
+import time
+
+
+class Command(BaseCommand):
+    help = 'Fit the confidence scorer TF-IDF weights on the educational corpus and save them to disk'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--include-db',
+            action='store_true',
+            help='Also fit on generated quiz and daily quiz questions stored in the database'
+        )
+        parser.add_argument('--output', type=str, help='Model path (defaults to CONFIDENCE_MODEL_PATH)')
+
+    def handle(self, *args, **options):
+        documents = build_default_corpus()
+        self.stdout.write(f'Bundled question banks: {len(documents)} documents')
+
+        if options['include_db']:
+            quiz_docs = [
+                f"{text} {explanation}"
+                for text, explanation in QuizQuestion.objects.values_list('question_text', 'explanation').iterator()
+            ]
+            daily_docs = list(DailyQuestion.objects.values_list('question_text', flat=True).iterator())
+            documents.extend(quiz_docs)
+            documents.extend(daily_docs)
+            self.stdout.write(f'Database questions: {len(quiz_docs) + len(daily_docs)} documents')
+
+        started = time.perf_counter()
+        model = TfidfConfidenceModel().fit(documents)
+        path = options.get('output') or confidence_scorer.model_path
+        model.save(path)
+        confidence_scorer.set_model(model)
+
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stdout.write(self.style.SUCCESS(f'Fitted on {model.documents} documents in {elapsed:.0f} ms, saved to {path}'))
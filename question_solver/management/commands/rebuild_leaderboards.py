@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from question_solver.services.leaderboard_service import leaderboard_service
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily, weekly and all-time leaderboards from CoinTransaction history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--metric',
+            choices=leaderboard_service.METRICS,
+            help='Rebuild only this metric (coins or quiz). Defaults to both.'
+        )
+
+    def handle(self, *args, **options):
+        metric = options.get('metric')
+        metrics = (metric,) if metric else None
+
+        self.stdout.write(f'Rebuilding leaderboards using the {leaderboard_service.backend.name} backend...')
+        summary = leaderboard_service.rebuild(metrics=metrics)
+
+        for key, users in sorted(summary.items()):
+            self.stdout.write(f'  {key}: {users} users')
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(summary)} leaderboards'))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from question_solver.services.job_queue import job_queue
+import os
+import signal
+import socket
+import threading
+
+
+class Command(BaseCommand):
+    help = 'Run background generation jobs (start one per worker process you want)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=2, help='Jobs run at once by this process')
+        parser.add_argument('--once', action='store_true', help='Run every due job, then exit')
+
+    def handle(self, *args, **options):
+        job_queue.autodiscover()
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            self.stdout.write('Stopping after the running jobs finish...')
+            stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(
+            f"Job worker {prefix}: {options['threads']} thread(s), "
+            f"handlers: {', '.join(job_queue.stats()['handlers'])}"
+        )
+        counts = []
+        threads = [
+            threading.Thread(
+                target=lambda n=n: counts.append(
+                    job_queue.work(worker_id=f"{prefix}:{n}", stop_event=stop, idle_exit=options['once'])
+                ),
+                name=f"job-worker-{n}",
+            )
+            for n in range(max(1, options['threads']))
+        ]
+        for thread in threads:
+            thread.start()
+        # Join with a timeout so the main thread keeps handling signals
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=0.5)
+        self.stdout.write(self.style.SUCCESS(f'Ran {sum(counts)} jobs'))
@@ -0,0 +1,22 @@
+# Functional indexes for case-insensitive login lookups (LOWER(email) / LOWER(username))
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("question_solver", "0020_adanalytics_featureadconfig_adimpressionlog_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE INDEX IF NOT EXISTS auth_user_email_lower_idx ON auth_user (LOWER(email));",
+            reverse_sql="DROP INDEX IF EXISTS auth_user_email_lower_idx;",
+        ),
+        migrations.RunSQL(
+            sql="CREATE INDEX IF NOT EXISTS auth_user_username_lower_idx ON auth_user (LOWER(username));",
+            reverse_sql="DROP INDEX IF EXISTS auth_user_username_lower_idx;",
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0 on 2026-10-19 17:14
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question_solver', '0021_auth_user_lower_email_username_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizBatchJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('user_id', models.CharField(blank=True, db_index=True, max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('partial', 'Partially Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('num_questions', models.IntegerField(default=5)),
+                ('difficulty', models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced')], default='intermediate', max_length=20)),
+                ('total_items', models.IntegerField(default=0)),
+                ('unique_items', models.IntegerField(default=0)),
+                ('completed_items', models.IntegerField(default=0)),
+                ('failed_items', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='QuizBatchItem',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('position', models.IntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('source_type', models.CharField(default='text', max_length=50)),
+                ('source_id', models.CharField(blank=True, max_length=255)),
+                ('content', models.TextField(blank=True)),
+                ('topic_hash', models.CharField(max_length=40)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('error', models.TextField(blank=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('quiz', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='batch_items', to='question_solver.quiz')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='question_solver.quizbatchjob')),
+            ],
+            options={
+                'ordering': ['job', 'position'],
+                'indexes': [models.Index(fields=['job', 'topic_hash'], name='question_so_job_id_d283ad_idx')],
+                'unique_together': {('job', 'position')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-19 17:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question_solver', '0023_generationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userquizresponse',
+            name='analysis',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='userquizresponse',
+            name='analysis_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed')], default='completed', max_length=20),
+        ),
+    ]
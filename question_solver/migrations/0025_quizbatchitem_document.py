@@ -0,0 +1,24 @@
+# Generated by Django 5.0 on 2026-10-19 17:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question_solver', '0024_userquizresponse_analysis'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizbatchitem',
+            name='document',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quizbatchitem',
+            name='generation_job',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='question_solver.generationjob'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question_solver', '0025_quizbatchitem_document'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='quizbatchitem',
+            name='document',
+        ),
+        migrations.AddField(
+            model_name='quizbatchitem',
+            name='document_path',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
@@ -433,6 +433,16 @@ class UserQuizResponse(models.Model):
     strengths = models.JSONField(default=list)  # Topics user performed well on
     weaknesses = models.JSONField(default=list)  # Topics needing improvement
     
+    # AI analysis is generated after the score is returned; 'pending' until
+    # the quiz_feedback job fills in feedback/strengths/weaknesses
+    ANALYSIS_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    analysis = models.JSONField(default=dict, blank=True)  # Full quiz_service analysis
+    analysis_status = models.CharField(max_length=20, choices=ANALYSIS_STATUS_CHOICES, default='completed')
+    
     class Meta:
         ordering = ['-started_at']
     
@@ -466,6 +476,140 @@ class QuizSummary(models.Model):
         return f"Summary: {self.quiz.title} - Best: {self.best_score}%"
 
 
+class QuizBatchJob(models.Model):
+    """
+    One batch quiz generation request (many topics/documents -> many quizzes)
+    Counters are updated with F() expressions as items finish, so the row can
+    be polled for progress while generation runs in the background.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('partial', 'Partially Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user_id = models.CharField(max_length=255, blank=True, db_index=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    num_questions = models.IntegerField(default=5)
+    difficulty = models.CharField(max_length=20, choices=Quiz.DIFFICULTY_CHOICES, default='intermediate')
+
+    # Progress
+    total_items = models.IntegerField(default=0)
+    unique_items = models.IntegerField(default=0)  # Items left after merging identical topics
+    completed_items = models.IntegerField(default=0)
+    failed_items = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'partial', 'failed')
+
+    def __str__(self):
+        return f"Batch {self.id} - {self.status} ({self.completed_items}/{self.total_items})"
+
+
+class QuizBatchItem(models.Model):
+    """
+    One topic or document of a QuizBatchJob
+    Items with the same topic_hash (normalized content, or the bytes of an
+    uploaded document) share one generation and point at the same Quiz.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.ForeignKey(QuizBatchJob, on_delete=models.CASCADE, related_name='items')
+    position = models.IntegerField()
+    title = models.CharField(max_length=255)
+    source_type = models.CharField(max_length=50, default='text')
+    source_id = models.CharField(max_length=255, blank=True)  # Topic text or uploaded file name
+    content = models.TextField(blank=True)
+    document_path = models.CharField(max_length=255, blank=True)  # Uploaded file in default_storage until its job extracts the text
+    topic_hash = models.CharField(max_length=40)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    quiz = models.ForeignKey(Quiz, on_delete=models.SET_NULL, null=True, blank=True, related_name='batch_items')
+    generation_job = models.ForeignKey('GenerationJob', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    error = models.TextField(blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['job', 'position']
+        unique_together = ['job', 'position']
+        indexes = [
+            models.Index(fields=['job', 'topic_hash']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.status})"
+
+
+class GenerationJob(models.Model):
+    """
+    Queued AI generation request (study material, predicted questions,
+    flashcards, YouTube summaries, batch quiz items) run by a job worker
+    result/result_status hold the response body and HTTP status the
+    synchronous endpoint would have returned.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    payload = models.JSONField(default=dict)
+    idempotency_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    user_id = models.CharField(max_length=255, blank=True, db_index=True)
+
+    # Scheduling / retries
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=4)
+    run_after = models.DateTimeField(default=timezone.now)
+    worker_id = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)  # Refreshed on progress; stale = worker died
+
+    # Progress / outcome
+    progress = models.IntegerField(default=0)  # 0-100
+    progress_message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    result_status = models.IntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'generation_job'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    @property
+    def is_finished(self):
+        return self.status in ('succeeded', 'failed')
+
+    def __str__(self):
+        return f"{self.kind} {self.id} - {self.status}"
+
+
 class UserCoins(models.Model):
     """Track user coins earned from Daily Quizzes and other activities"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -485,35 +629,22 @@ class UserCoins(models.Model):
         return f"{self.user_id} - {self.total_coins} coins"
     
     def add_coins(self, amount, reason=""):
-        """Add coins to user account"""
-        self.total_coins += amount
-        self.lifetime_coins += amount
-        self.save()
+        """Add coins to user account (atomic UPDATE via the coin ledger)"""
+        from .services.coin_ledger_service import coin_ledger
         
-        # Log the transaction
-        CoinTransaction.objects.create(
-            user_coins=self,
-            amount=amount,
-            transaction_type='earn',
-            reason=reason
-        )
+        self.total_coins = coin_ledger.credit(self.user_id, amount, reason=reason)
+        self.lifetime_coins += amount
     
     def spend_coins(self, amount, reason=""):
-        """Spend coins from user account"""
-        if self.total_coins >= amount:
-            self.total_coins -= amount
-            self.coins_spent += amount
-            self.save()
-            
-            # Log the transaction
-            CoinTransaction.objects.create(
-                user_coins=self,
-                amount=amount,
-                transaction_type='spend',
-                reason=reason
-            )
-            return True
-        return False
+        """Spend coins from user account (atomic UPDATE via the coin ledger)"""
+        from .services.coin_ledger_service import coin_ledger
+        
+        balance = coin_ledger.debit(self.user_id, amount, reason=reason)
+        if balance is None:
+            return False
+        self.total_coins = balance
+        self.coins_spent += amount
+        return True
 
 
 class CoinTransaction(models.Model):
@@ -8,12 +8,11 @@ from rest_framework.response import Response
 from rest_framework import status
 import logging
 import os
-import jwt
 from django.contrib.auth.models import User
-from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 
+from .auth_middleware import authenticate_request
 from .models import Payment, UserSubscription
 from .services.payment_service import payment_service
 
@@ -23,77 +22,19 @@ logger = logging.getLogger(__name__)
 def get_user_from_token(request):
     """
     Extract and validate JWT token from request header
-    Returns User object or None if invalid/missing
+    Returns the cached user projection (AuthUser) or None if invalid/missing
     Supports Bearer token format
     """
     try:
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '').strip()
-        
-        # Check if header exists
-        if not auth_header:
-            logger.warning("No Authorization header found in request")
-            logger.warning(f"Available headers: {list(request.META.keys())}")
-            return None
-        
-        logger.info(f"[TOKEN_DEBUG] Auth header found: {auth_header[:50]}...")
-        
-        # Extract token from Bearer format
-        if not auth_header.startswith('Bearer '):
-            logger.warning(f"Invalid auth header format: {auth_header[:20]}...")
-            return None
-        
-        token = auth_header.split(' ')[1].strip()
-        logger.info(f"[TOKEN_DEBUG] Token extracted, length: {len(token)}")
-        
-        if not token:
-            logger.warning("Empty token in Authorization header")
-            return None
-        
-        # Get JWT configuration from settings
-        # IMPORTANT: Must use the same SECRET_KEY used for token encoding in simple_auth_views.py
-        jwt_secret = getattr(settings, 'SECRET_KEY', 'your-secret-key-change-this')
-        jwt_algorithm = getattr(settings, 'JWT_ALGORITHM', 'HS256')
-        
-        logger.info(f"[TOKEN_DEBUG] Using SECRET_KEY length: {len(jwt_secret)}")
-        logger.info(f"[TOKEN_DEBUG] Using algorithm: {jwt_algorithm}")
-        
-        # Decode token
-        try:
-            payload = jwt.decode(token, jwt_secret, algorithms=[jwt_algorithm])
-            logger.info(f"[TOKEN_DEBUG] JWT decoded successfully. Payload: {payload}")
-        except jwt.InvalidAlgorithmError:
-            # Try with HS256 if configured algorithm fails
-            logger.warning(f"Algorithm {jwt_algorithm} failed, trying HS256")
-            payload = jwt.decode(token, jwt_secret, algorithms=['HS256'])
-        except jwt.DecodeError as e:
-            logger.error(f"JWT decode error: {str(e)}. Token length: {len(token)}, Secret length: {len(jwt_secret)}")
-            raise
-        
-        # Extract user_id from payload (support different key names)
-        user_id = payload.get('user_id') or payload.get('id') or payload.get('sub')
-        
-        if not user_id:
-            logger.error(f"No user_id found in token payload: {list(payload.keys())}")
-            return None
-        
-        # Get user
-        user = User.objects.get(id=user_id)
-        logger.info(f"User {user_id} authenticated successfully")
+        # Verified once per request by JWTAuthenticationMiddleware (LRU-cached across requests)
+        user = authenticate_request(request)
+        if user is None and request.auth_error:
+            logger.warning(f"Token rejected: {request.auth_error}")
         return user
     
-    except jwt.ExpiredSignatureError:
-        logger.warning("JWT token has expired")
-        return None
-    except jwt.InvalidTokenError as e:
-        logger.warning(f"Invalid JWT token: {str(e)}")
-        return None
-    except User.DoesNotExist:
-        logger.warning(f"User not found for token")
-        return None
     except Exception as e:
         logger.error(f"Unexpected error extracting user from token: {str(e)}", exc_info=True)
         return None
-        return None
 
 
 class CreatePaymentOrderView(APIView):
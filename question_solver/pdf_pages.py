@@ -0,0 +1,58 @@
+"""
+PDF page extraction run inside document_ingestion's process pool
+Kept outside the services package, which imports Django models and OCR
+engines: pool workers are started with forkserver/spawn and import only this
+module and PyPDF2.
+"""
+
+# Pages with less extracted text than this are treated as scanned
+MIN_PAGE_TEXT_CHARS = 20
+
+
+def open_pdf(path):
+    from PyPDF2 import PdfReader
+    reader = PdfReader(path)
+    if reader.is_encrypted:
+        # Many "protected" PDFs only carry an owner password
+        reader.decrypt('')
+    return reader
+
+
+def extract_pages(reader, page_indexes):
+    """
+    Text layer of each page, plus the embedded images of pages that have no
+    usable text layer (for OCR in the parent)
+
+    Returns:
+        list of (page_index, text, [(image_name, image_bytes), ...])
+    """
+    extracted = []
+    for index in page_indexes:
+        page = reader.pages[index]
+        try:
+            text = page.extract_text() or ''
+        except Exception:
+            text = ''
+        images = []
+        if len(text.strip()) < MIN_PAGE_TEXT_CHARS:
+            try:
+                images = [(image.name, image.data) for image in page.images]
+            except Exception:
+                images = []
+        extracted.append((index, text, images))
+    return extracted
+
+
+# Pool workers keep the last document they opened: parsing the xref table and
+# flattening the page tree costs more than extracting a batch of pages
+_worker_reader = (None, None)
+
+
+def extract_pdf_batch(path, page_indexes):
+    """Pool worker entry point for extract_pages"""
+    global _worker_reader
+    cached_path, reader = _worker_reader
+    if cached_path != path:
+        reader = open_pdf(path)
+        _worker_reader = (path, reader)
+    return extract_pages(reader, page_indexes)
@@ -8,9 +8,8 @@ from rest_framework.response import Response
 from rest_framework import status
 import logging
 import os
-from django.contrib.auth.models import User
-from django.conf import settings
 
+from .auth_middleware import authenticate_request
 from .models import Payment, UserCoins, CoinTransaction, CoinWithdrawal
 from .services.payment_service import payment_service
 
@@ -20,28 +19,12 @@ logger = logging.getLogger(__name__)
 def get_user_from_token(request):
     """
     Extract and validate JWT token from request header
-    Returns User object or None if invalid/missing
+    Returns the cached user projection (AuthUser) or None if invalid/missing
     """
     try:
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if not auth_header.startswith('Bearer '):
-            return None
+        # Verified once per request by JWTAuthenticationMiddleware (LRU-cached across requests)
+        return authenticate_request(request)
 
-        token = auth_header.split(' ')[1]
-        # IMPORTANT: Must use the same SECRET_KEY used for token encoding in simple_auth_views.py
-        jwt_secret = getattr(settings, 'SECRET_KEY', 'your-secret-key-change-this')
-        jwt_algorithm = getattr(settings, 'JWT_ALGORITHM', 'HS256')
-
-        # Decode token
-        import jwt
-        payload = jwt.decode(token, jwt_secret, algorithms=[jwt_algorithm])
-
-        # Get user
-        user = User.objects.get(id=payload['user_id'])
-        return user
-
-    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, User.DoesNotExist):
-        return None
     except Exception as e:
         logger.error(f"Error extracting user from token: {str(e)}")
         return None
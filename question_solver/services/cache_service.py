@@ -0,0 +1,307 @@
+"""
+Cache Service - Tiered result caching for external lookups
+- L1: in-process TTL-LRU (microsecond hits, bounded memory per worker)
+- L2: the Django cache (Redis when REDIS_URL is set), shared by every worker
+- Normalized query keys so "What is  Newton's 2nd law?" and
+  "what is newton's 2nd law" share an entry
+- Short-lived negative entries for failed lookups, so a failing upstream is
+  not hammered with the same query
+- Hit / miss / latency stats for the status endpoint
+"""
+
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+NEGATIVE_MARKER = '__negative__'
+
+
+# Stripped from the end of each word: "law?" and "law" are the same query
+_SENTENCE_END = '.,;:!?'
+
+
+def normalize_query(text):
+    """
+    Fold case, whitespace and trailing sentence punctuation of a free-text query
+
+    ASCII punctuation is otherwise kept: "C#" and "C", "2*3" and "2 3",
+    "50%" and "50", "2x-3" and "2x 3" are different queries. Non-ASCII
+    punctuation (curly quotes, dashes, the Devanagari danda) becomes a space,
+    except the typographic apostrophe, which becomes "'". Combining marks are
+    kept so Devanagari text is not mangled.
+    """
+    if text is None:
+        return ''
+    text = unicodedata.normalize('NFKC', str(text)).casefold()
+    text = ''.join(
+        "'" if ch == '\u2019' else ' ' if not ch.isascii() and unicodedata.category(ch).startswith('P') else ch
+        for ch in text
+    )
+    words = (word.rstrip(_SENTENCE_END) for word in text.split())
+    return ' '.join(word for word in words if word)
+
+
+class TTLLRUCache:
+    """Thread-safe in-process LRU whose entries also expire after a TTL"""
+
+    def __init__(self, max_entries=1024, ttl=600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TieredCache:
+    """
+    L1 (TTLLRUCache) in front of L2 (Django cache)
+
+    L2 is skipped when the configured Django cache is itself a per-process
+    LocMemCache, since it would only duplicate L1. L2 errors (e.g. Redis down)
+    are logged and treated as misses - the cache never fails a request.
+    """
+
+    def __init__(self, namespace, l1_max_entries=1024, l1_ttl=600, l2_ttl=24 * 60 * 60,
+                 negative_ttl=60, cache_alias='default'):
+        self.namespace = namespace
+        self.l2_ttl = l2_ttl
+        self.negative_ttl = negative_ttl
+        self.l1 = TTLLRUCache(max_entries=l1_max_entries, ttl=l1_ttl)
+        self._cache_alias = cache_alias
+        self._l2 = None
+        self._l2_checked = False
+        self._lock = threading.Lock()
+        self._stats = {
+            'l1_hits': 0,
+            'l2_hits': 0,
+            'misses': 0,
+            'negative_hits': 0,
+            'sets': 0,
+            'negative_sets': 0,
+            'l2_errors': 0,
+            'lookup_ms': 0.0,
+            'lookups': 0,
+            'upstream_ms': 0.0,
+            'upstream_calls': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def make_key(self, query, *parts):
+        """Stable key from a normalized query plus extra discriminators (count, source, ...)"""
+        raw = '\x1f'.join([normalize_query(query)] + [str(p) for p in parts])
+        digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        return f"{self.namespace}:{digest}"
+
+    def make_exact_key(self, value, *parts):
+        """
+        Stable key from value as given (surrounding whitespace stripped) plus
+        extra discriminators, for identifiers and texts where case and
+        punctuation matter (video ids, translation sources)
+        """
+        # Prefixed so an exact key never equals a make_key() key
+        raw = '\x1f'.join(['\x00' + str(value).strip()] + [str(p) for p in parts])
+        digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        return f"{self.namespace}:{digest}"
+
+    # ------------------------------------------------------------------
+    # L2
+    # ------------------------------------------------------------------
+
+    @property
+    def l2(self):
+        if not self._l2_checked:
+            try:
+                backend = caches[self._cache_alias]
+                if 'locmem' not in type(backend).__module__:
+                    self._l2 = backend
+            except Exception as e:
+                logger.warning(f"[CACHE] L2 unavailable for {self.namespace}: {e}")
+            self._l2_checked = True
+        return self._l2
+
+    def _l2_call(self, method, *args, **kwargs):
+        backend = self.l2
+        if backend is None:
+            return None
+        try:
+            return getattr(backend, method)(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                self._stats['l2_errors'] += 1
+            logger.debug(f"[CACHE] L2 {method} failed for {self.namespace}: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Get / set
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def is_negative(value):
+        return isinstance(value, dict) and value.get(NEGATIVE_MARKER) is True
+
+    def get(self, key):
+        """
+        Returns:
+            cached value, a negative entry (check with is_negative) or None on miss
+        """
+        started = time.perf_counter()
+        tier = 'l1_hits'
+        value = self.l1.get(key)
+        if value is None:
+            value = self._l2_call('get', key)
+            if value is not None:
+                tier = 'l2_hits'
+                # Promote into L1; negative entries keep their short lifetime
+                self.l1.set(key, value, ttl=self.negative_ttl if self.is_negative(value) else None)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats['lookups'] += 1
+            self._stats['lookup_ms'] += elapsed_ms
+            if value is None:
+                self._stats['misses'] += 1
+            else:
+                self._stats[tier] += 1
+                if self.is_negative(value):
+                    self._stats['negative_hits'] += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.l1.set(key, value)
+        self._l2_call('set', key, value, self.l2_ttl if ttl is None else ttl)
+        with self._lock:
+            self._stats['sets'] += 1
+
+    def set_negative(self, key, error=''):
+        """Remember a failed lookup for negative_ttl seconds"""
+        value = {NEGATIVE_MARKER: True, 'error': str(error)[:500]}
+        self.l1.set(key, value, ttl=self.negative_ttl)
+        self._l2_call('set', key, value, self.negative_ttl)
+        with self._lock:
+            self._stats['negative_sets'] += 1
+
+    def delete(self, key):
+        self.l1.delete(key)
+        self._l2_call('delete', key)
+
+    def record_upstream(self, elapsed_ms):
+        """Record the latency of an upstream call made after a miss"""
+        with self._lock:
+            self._stats['upstream_calls'] += 1
+            self._stats['upstream_ms'] += elapsed_ms
+
+    def clear_local(self):
+        self.l1.clear()
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+        hits = s['l1_hits'] + s['l2_hits']
+        total = hits + s['misses']
+        return {
+            'namespace': self.namespace,
+            'l1_size': len(self.l1),
+            'l1_max_entries': self.l1.max_entries,
+            'l1_evictions': self.l1.evictions,
+            'l2_backend': type(self.l2).__name__ if self.l2 is not None else None,
+            'l1_hits': s['l1_hits'],
+            'l2_hits': s['l2_hits'],
+            'misses': s['misses'],
+            'negative_hits': s['negative_hits'],
+            'sets': s['sets'],
+            'negative_sets': s['negative_sets'],
+            'l2_errors': s['l2_errors'],
+            'hit_rate': round(hits / total, 3) if total else 0.0,
+            'avg_lookup_ms': round(s['lookup_ms'] / s['lookups'], 3) if s['lookups'] else 0.0,
+            'avg_upstream_ms': round(s['upstream_ms'] / s['upstream_calls'], 2) if s['upstream_calls'] else 0.0,
+        }
+
+
+# Global instances
+search_cache = TieredCache(
+    'search',
+    l1_max_entries=getattr(settings, 'SEARCH_CACHE_L1_MAX_ENTRIES', 2048),
+    l1_ttl=getattr(settings, 'SEARCH_CACHE_L1_TTL_SECONDS', 10 * 60),
+    l2_ttl=getattr(settings, 'SEARCH_CACHE_TTL_SECONDS', 24 * 60 * 60),
+    negative_ttl=getattr(settings, 'SEARCH_CACHE_NEGATIVE_TTL_SECONDS', 60),
+)
+
+translation_cache = TieredCache(
+    'translation',
+    l1_max_entries=getattr(settings, 'TRANSLATION_CACHE_L1_MAX_ENTRIES', 4096),
+    l1_ttl=getattr(settings, 'TRANSLATION_CACHE_L1_TTL_SECONDS', 60 * 60),
+    l2_ttl=getattr(settings, 'TRANSLATION_CACHE_TTL_SECONDS', 7 * 24 * 60 * 60),
+    negative_ttl=getattr(settings, 'TRANSLATION_CACHE_NEGATIVE_TTL_SECONDS', 30),
+)
+
+youtube_search_cache = TieredCache(
+    'youtube_search',
+    l1_max_entries=getattr(settings, 'YOUTUBE_CACHE_L1_MAX_ENTRIES', 4096),
+    l1_ttl=getattr(settings, 'YOUTUBE_CACHE_L1_TTL_SECONDS', 6 * 60 * 60),
+    l2_ttl=getattr(settings, 'YOUTUBE_CACHE_TTL_SECONDS', 14 * 24 * 60 * 60),
+    negative_ttl=getattr(settings, 'YOUTUBE_CACHE_NEGATIVE_TTL_SECONDS', 5 * 60),
+)
+
+youtube_metadata_cache = TieredCache(
+    'youtube_metadata',
+    l1_max_entries=getattr(settings, 'YOUTUBE_METADATA_CACHE_L1_MAX_ENTRIES', 2048),
+    l1_ttl=getattr(settings, 'YOUTUBE_METADATA_CACHE_L1_TTL_SECONDS', 60 * 60),
+    l2_ttl=getattr(settings, 'YOUTUBE_METADATA_CACHE_TTL_SECONDS', 24 * 60 * 60),
+    negative_ttl=getattr(settings, 'YOUTUBE_METADATA_CACHE_NEGATIVE_TTL_SECONDS', 10 * 60),
+)
+
+summary_chunk_cache = TieredCache(
+    'summary_chunk',
+    l1_max_entries=getattr(settings, 'SUMMARY_CHUNK_CACHE_L1_MAX_ENTRIES', 512),
+    l1_ttl=getattr(settings, 'SUMMARY_CHUNK_CACHE_L1_TTL_SECONDS', 60 * 60),
+    l2_ttl=getattr(settings, 'SUMMARY_CHUNK_CACHE_TTL_SECONDS', 30 * 24 * 60 * 60),
+)
+
+quiz_feedback_cache = TieredCache(
+    'quiz_feedback',
+    l1_max_entries=getattr(settings, 'QUIZ_FEEDBACK_CACHE_L1_MAX_ENTRIES', 2048),
+    l1_ttl=getattr(settings, 'QUIZ_FEEDBACK_CACHE_L1_TTL_SECONDS', 60 * 60),
+    l2_ttl=getattr(settings, 'QUIZ_FEEDBACK_CACHE_TTL_SECONDS', 7 * 24 * 60 * 60),
+)
@@ -0,0 +1,284 @@
+"""
+Coin Ledger Service - Atomic coin balance updates
+Applies every balance change as a single conditional UPDATE on UserCoins
+and writes the matching CoinTransaction in the same statement batch.
+No read-modify-write in Python, so concurrent quiz submissions cannot lose coins.
+"""
+
+from django.db import connection, transaction as db_transaction, IntegrityError
+from django.db.models import F, Case, When, Value, IntegerField
+from django.utils import timezone
+import logging
+import uuid
+
+from ..models import UserCoins, CoinTransaction
+from .leaderboard_service import leaderboard_service
+
+logger = logging.getLogger(__name__)
+
+
+class CoinLedgerService:
+    """
+    Race-free coin ledger on top of UserCoins / CoinTransaction
+
+    PostgreSQL: one round trip per credit/debit (data-modifying CTE that
+    upserts the balance and inserts the transaction row together).
+    Other backends: conditional ORM UPDATE + transaction insert inside one
+    atomic block.
+    """
+
+    # Max rows per statement for bulk awards
+    BULK_BATCH_SIZE = 500
+
+    @staticmethod
+    def _use_cte():
+        return connection.vendor == 'postgresql'
+
+    # ------------------------------------------------------------------
+    # Single-user operations
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def credit(user_id, amount, reason="", transaction_type='earn'):
+        """
+        Add coins to a user's balance (creates the UserCoins row if missing)
+
+        Returns:
+            int: New total_coins balance
+        """
+        amount = int(amount)
+        if amount < 0:
+            raise ValueError("Credit amount must be non-negative")
+
+        user_id = str(user_id)
+        if CoinLedgerService._use_cte():
+            balance = CoinLedgerService._credit_cte(user_id, amount, reason, transaction_type)
+        else:
+            balance = CoinLedgerService._credit_orm(user_id, amount, reason, transaction_type)
+
+        logger.info(f"[COIN_LEDGER] +{amount} coins for {user_id} ({transaction_type}). Balance: {balance}")
+        db_transaction.on_commit(
+            lambda: leaderboard_service.record_coins(user_id, amount, transaction_type)
+        )
+        return balance
+
+    @staticmethod
+    def debit(user_id, amount, reason="", transaction_type='spend'):
+        """
+        Spend coins from a user's balance, never letting it go negative
+
+        Returns:
+            int | None: New total_coins balance, or None if the balance was insufficient
+        """
+        amount = int(amount)
+        if amount < 0:
+            raise ValueError("Debit amount must be non-negative")
+
+        user_id = str(user_id)
+        if CoinLedgerService._use_cte():
+            balance = CoinLedgerService._debit_cte(user_id, amount, reason, transaction_type)
+        else:
+            balance = CoinLedgerService._debit_orm(user_id, amount, reason, transaction_type)
+
+        if balance is None:
+            logger.warning(f"[COIN_LEDGER] Insufficient balance for {user_id} to spend {amount} coins")
+        else:
+            logger.info(f"[COIN_LEDGER] -{amount} coins for {user_id} ({transaction_type}). Balance: {balance}")
+        return balance
+
+    # ------------------------------------------------------------------
+    # Bulk operations
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def bulk_award(awards, transaction_type='bonus'):
+        """
+        Credit many users at once (batch rewards, contest payouts)
+
+        Args:
+            awards: iterable of (user_id, amount, reason) tuples.
+                    Multiple entries for the same user are summed for the
+                    balance and logged as separate transactions.
+
+        Returns:
+            int: Number of users credited
+        """
+        entries = []
+        totals = {}
+        for user_id, amount, reason in awards:
+            amount = int(amount)
+            if amount < 0:
+                raise ValueError("Award amounts must be non-negative")
+            user_id = str(user_id)
+            entries.append((user_id, amount, reason or ""))
+            totals[user_id] = totals.get(user_id, 0) + amount
+
+        if not entries:
+            return 0
+
+        user_ids = list(totals)
+        size = CoinLedgerService.BULK_BATCH_SIZE
+        now = timezone.now()
+
+        with db_transaction.atomic():
+            # Make sure every user has a balance row (no-op for existing users)
+            UserCoins.objects.bulk_create(
+                [UserCoins(user_id=uid) for uid in user_ids],
+                ignore_conflicts=True,
+                batch_size=size,
+            )
+
+            coin_ids = {}
+            for start in range(0, len(user_ids), size):
+                chunk = user_ids[start:start + size]
+                increment = Case(
+                    *[When(user_id=uid, then=Value(totals[uid])) for uid in chunk],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                UserCoins.objects.filter(user_id__in=chunk).update(
+                    total_coins=F('total_coins') + increment,
+                    lifetime_coins=F('lifetime_coins') + increment,
+                    updated_at=now,
+                )
+                coin_ids.update(
+                    UserCoins.objects.filter(user_id__in=chunk).values_list('user_id', 'id')
+                )
+
+            CoinTransaction.objects.bulk_create(
+                [
+                    CoinTransaction(
+                        user_coins_id=coin_ids[uid],
+                        amount=amount,
+                        transaction_type=transaction_type,
+                        reason=reason[:255],
+                    )
+                    for uid, amount, reason in entries
+                ],
+                batch_size=size,
+            )
+
+        def _update_leaderboards():
+            for uid, total in totals.items():
+                leaderboard_service.record_coins(uid, total, transaction_type)
+
+        db_transaction.on_commit(_update_leaderboards)
+        logger.info(f"[COIN_LEDGER] Bulk award: {len(entries)} transactions for {len(user_ids)} users")
+        return len(user_ids)
+
+    # ------------------------------------------------------------------
+    # PostgreSQL single-statement paths
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _credit_cte(user_id, amount, reason, transaction_type):
+        now = timezone.now()
+        sql = f"""
+            WITH bal AS (
+                INSERT INTO {UserCoins._meta.db_table} AS uc
+                    (id, user_id, total_coins, lifetime_coins, coins_spent, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, 0, %s, %s)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    total_coins = uc.total_coins + EXCLUDED.total_coins,
+                    lifetime_coins = uc.lifetime_coins + EXCLUDED.lifetime_coins,
+                    updated_at = EXCLUDED.updated_at
+                RETURNING uc.id, uc.total_coins
+            ), tx AS (
+                INSERT INTO {CoinTransaction._meta.db_table}
+                    (id, user_coins_id, amount, transaction_type, reason, created_at)
+                SELECT %s, bal.id, %s, %s, %s, %s FROM bal
+            )
+            SELECT total_coins FROM bal
+        """
+        params = [
+            uuid.uuid4(), user_id, amount, amount, now, now,
+            uuid.uuid4(), amount, transaction_type, reason[:255], now,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def _debit_cte(user_id, amount, reason, transaction_type):
+        now = timezone.now()
+        sql = f"""
+            WITH bal AS (
+                UPDATE {UserCoins._meta.db_table} SET
+                    total_coins = total_coins - %s,
+                    coins_spent = coins_spent + %s,
+                    updated_at = %s
+                WHERE user_id = %s AND total_coins >= %s
+                RETURNING id, total_coins
+            ), tx AS (
+                INSERT INTO {CoinTransaction._meta.db_table}
+                    (id, user_coins_id, amount, transaction_type, reason, created_at)
+                SELECT %s, bal.id, %s, %s, %s, %s FROM bal
+            )
+            SELECT total_coins FROM bal
+        """
+        params = [
+            amount, amount, now, user_id, amount,
+            uuid.uuid4(), amount, transaction_type, reason[:255], now,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    # ------------------------------------------------------------------
+    # Portable ORM paths
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    @db_transaction.atomic
+    def _credit_orm(user_id, amount, reason, transaction_type):
+        now = timezone.now()
+        updated = UserCoins.objects.filter(user_id=user_id).update(
+            total_coins=F('total_coins') + amount,
+            lifetime_coins=F('lifetime_coins') + amount,
+            updated_at=now,
+        )
+        if not updated:
+            try:
+                with db_transaction.atomic():
+                    UserCoins.objects.create(user_id=user_id, total_coins=amount, lifetime_coins=amount)
+            except IntegrityError:
+                # Another request created the row first - apply as an increment
+                UserCoins.objects.filter(user_id=user_id).update(
+                    total_coins=F('total_coins') + amount,
+                    lifetime_coins=F('lifetime_coins') + amount,
+                    updated_at=now,
+                )
+
+        coins_id, balance = UserCoins.objects.filter(user_id=user_id).values_list('id', 'total_coins').get()
+        CoinTransaction.objects.create(
+            user_coins_id=coins_id,
+            amount=amount,
+            transaction_type=transaction_type,
+            reason=reason[:255],
+        )
+        return balance
+
+    @staticmethod
+    @db_transaction.atomic
+    def _debit_orm(user_id, amount, reason, transaction_type):
+        updated = UserCoins.objects.filter(user_id=user_id, total_coins__gte=amount).update(
+            total_coins=F('total_coins') - amount,
+            coins_spent=F('coins_spent') + amount,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            return None
+
+        coins_id, balance = UserCoins.objects.filter(user_id=user_id).values_list('id', 'total_coins').get()
+        CoinTransaction.objects.create(
+            user_coins_id=coins_id,
+            amount=amount,
+            transaction_type=transaction_type,
+            reason=reason[:255],
+        )
+        return balance
+
+
+# Global instance
+coin_ledger = CoinLedgerService()
@@ -1,19 +1,164 @@
 """
 Confidence Scoring Service - Calculates confidence scores for solutions
 Based on OCR quality, search match quality, and domain trust
+Text similarity uses IDF weights fitted once on an educational corpus
+(manage.py fit_confidence_model) and loaded lazily from disk; requests only
+hash, weight and multiply sparse vectors.
 """
 
+from django.conf import settings
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from .text_normalizer import text_normalizer
+import joblib
 import logging
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
+MODEL_VERSION = 1
+
+
+def tokenize(text):
+    # Module-level so the persisted model can be unpickled
+    return text_normalizer.tokens(text)
+
+
+def build_default_corpus():
+    """Question, option and explanation text from the bundled question banks"""
+    from question_solver.static_questions_bank import get_question_pool
+    from question_solver.HINDI_QUESTIONS_POOL_100 import HINDI_QUESTIONS_POOL
+
+    documents = []
+    for language in ('english', 'hindi'):
+        for question in get_question_pool(language):
+            documents.append(' '.join([question['question']] + list(question['options'])))
+    for question in HINDI_QUESTIONS_POOL:
+        options = ' '.join(option['text'] for option in question.get('options', []))
+        documents.append(f"{question['question_text']} {options} {question.get('explanation', '')}")
+    return documents
+
+
+class TfidfConfidenceModel:
+    """
+    Hashed term features with IDF weights fitted once on a fixed corpus
+
+    Hashing keeps the feature space fixed, so terms never seen during the fit
+    still count - smoothed IDF gives them the highest (rarest) weight instead
+    of silently dropping them as a fixed vocabulary would.
+    """
+
+    N_FEATURES = 2 ** 17
+
+    def __init__(self, transformer=None, documents=0):
+        self.hasher = HashingVectorizer(
+            n_features=self.N_FEATURES,
+            tokenizer=tokenize,
+            token_pattern=None,
+            preprocessor=None,
+            lowercase=False,
+            alternate_sign=False,
+            norm=None,
+        )
+        self.transformer = transformer
+        self.documents = documents
+
+    def fit(self, documents):
+        counts = self.hasher.transform(documents)
+        self.transformer = TfidfTransformer(norm='l2', sublinear_tf=True, smooth_idf=True).fit(counts)
+        self.documents = len(documents)
+        return self
+
+    def vectors(self, texts):
+        return self.transformer.transform(self.hasher.transform(texts))
+
+    def similarities(self, query, texts):
+        """
+        Cosine similarity of query against each text (one sparse product)
+
+        Returns:
+            numpy array aligned with texts
+        """
+        if not texts:
+            return np.zeros(0)
+        matrix = self.vectors([query] + list(texts))
+        return (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump({
+            'version': MODEL_VERSION,
+            'n_features': self.N_FEATURES,
+            'documents': self.documents,
+            'transformer': self.transformer,
+        }, path)
+
+    @classmethod
+    def load(cls, path):
+        data = joblib.load(path)
+        if data.get('version') != MODEL_VERSION or data.get('n_features') != cls.N_FEATURES:
+            raise ValueError(f'Incompatible confidence model at {path}')
+        return cls(transformer=data['transformer'], documents=data['documents'])
+
 
 class ConfidenceScoreService:
     def __init__(self):
-        self.vectorizer = TfidfVectorizer(max_features=100)
+        self.model_path = getattr(
+            settings, 'CONFIDENCE_MODEL_PATH',
+            os.path.join(settings.BASE_DIR, 'var', 'confidence_tfidf.joblib')
+        )
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._loading = False
+    
+    # ------------------------------------------------------------------
+    # Model lifecycle
+    # ------------------------------------------------------------------
+    
+    def _load_or_fit(self):
+        """Load the persisted model, fitting (and saving) the default one if missing"""
+        try:
+            if os.path.exists(self.model_path):
+                model = TfidfConfidenceModel.load(self.model_path)
+                logger.info(f"[CONFIDENCE] Loaded TF-IDF model ({model.documents} docs) from {self.model_path}")
+                return model
+        except Exception as e:
+            logger.warning(f"[CONFIDENCE] Could not load {self.model_path}, refitting: {e}")
+        
+        model = TfidfConfidenceModel().fit(build_default_corpus())
+        try:
+            model.save(self.model_path)
+        except OSError as e:
+            logger.warning(f"[CONFIDENCE] Could not persist TF-IDF model: {e}")
+        logger.info(f"[CONFIDENCE] Fitted TF-IDF model on {model.documents} bundled documents")
+        return model
+    
+    def get_model(self, wait=True):
+        """
+        Returns:
+            TfidfConfidenceModel, or None when wait=False and it is still loading
+            (loading then continues in a background thread)
+        """
+        if self._model is not None:
+            return self._model
+        if not wait:
+            with self._model_lock:
+                if self._model is None and not self._loading:
+                    self._loading = True
+                    threading.Thread(target=self.get_model, name='confidence-model-load', daemon=True).start()
+            return self._model
+        with self._model_lock:
+            if self._model is None:
+                try:
+                    self._model = self._load_or_fit()
+                finally:
+                    self._loading = False
+        return self._model
+    
+    def set_model(self, model):
+        with self._model_lock:
+            self._model = model
     
     def calculate_overall_confidence(self, ocr_confidence, search_results, original_query):
         """
@@ -87,17 +232,12 @@ class ConfidenceScoreService:
             if not result_texts:
                 return 0.5
             
-            # Add query to the list for vectorization
-            all_texts = [query] + result_texts
-            
-            # Calculate TF-IDF vectors
-            tfidf_matrix = self.vectorizer.fit_transform(all_texts)
-            
-            # Calculate cosine similarity between query and each result
-            query_vector = tfidf_matrix[0:1]
-            result_vectors = tfidf_matrix[1:]
-            
-            similarities = cosine_similarity(query_vector, result_vectors)[0]
+            # Never block the request on loading/fitting the model
+            model = self.get_model(wait=False)
+            if model is None:
+                similarities = [self._jaccard(query, text) for text in result_texts]
+            else:
+                similarities = model.similarities(query, result_texts)
             
             # Average similarity as match quality
             avg_similarity = np.mean(similarities)
@@ -156,45 +296,8 @@ class ConfidenceScoreService:
         else:
             return 'very_low'
     
-    def score_individual_result(self, result, query, rank_position):
-        """
-        Score an individual search result
-        
-        Args:
-            result: Search result dict
-            query: Original query
-            rank_position: Position in search results (1-based)
-            
-        Returns:
-            float: Score for this result (0-100)
-        """
-        score = 0
-        
-        # Domain trust (40 points)
-        trust = result.get('trust_score', 50)
-        score += (trust / 100) * 40
-        
-        # Position in results (20 points - higher rank = higher score)
-        position_score = max(0, (10 - rank_position) / 10) * 20
-        score += position_score
-        
-        # Title/snippet relevance (40 points)
-        relevance = self._calculate_text_relevance(
-            query,
-            f"{result.get('title', '')} {result.get('snippet', '')}"
-        )
-        score += relevance * 40
-        
-        return round(score, 2)
-    
-    def _calculate_text_relevance(self, query, text):
-        """
-        Calculate relevance between query and text
-        Simple keyword-based approach
-        """
-        if not query or not text:
-            return 0.5
-        
+    @staticmethod
+    def _jaccard(query, text):
         query_words = set(query.lower().split())
         text_words = set(text.lower().split())
         
@@ -0,0 +1,332 @@
+"""
+Dedup Service - Near-duplicate detection for generated and static questions
+- Each question (its text plus answer, after normalize_query) becomes a set of
+  character 5-gram shingles and a MinHash signature of them
+- Signatures are split into LSH bands, so a lookup only compares the few
+  questions sharing a band bucket instead of every indexed question; those
+  are confirmed on exact shingle Jaccard similarity and must contain the
+  same numbers, so "x^2 + 3x" and "x^2 + 5x" are different questions
+- Used on Gemini quiz/flashcard output (duplicates are dropped and only the
+  missing count is requested again), against a user's recent quizzes, and
+  over the static question pools
+"""
+
+from django.conf import settings
+import logging
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from .cache_service import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Largest prime below 2**32: a * h + b stays below 2**64 for 32-bit hashes
+_PRIME = np.uint64(4294967291)
+
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+def item_text(item):
+    """
+    Text of a question dict used for comparison
+
+    The answer is included so template questions that differ only in what
+    they ask about ("capital of France" / "capital of Japan") stay distinct.
+    Understands generated quiz/flashcard items, the static pools and
+    QuizQuestion values.
+    """
+    if isinstance(item, str):
+        return item
+    question = item.get('question') or item.get('question_text') or ''
+    answer = next(
+        (item[key] for key in ('answer', 'correct_answer', 'correctAnswer', 'correct')
+         if item.get(key) not in (None, '')),
+        None
+    )
+    options = item.get('options') or []
+    if isinstance(answer, int) and not isinstance(answer, bool):
+        # Index into options (Gemini quizzes, static bank)
+        answer = options[answer] if 0 <= answer < len(options) else None
+    elif answer is None:
+        # quiz_service MCQ: [{"text": ..., "is_correct": bool}]
+        answer = next((o for o in options if isinstance(o, dict) and o.get('is_correct')), None)
+    if isinstance(answer, dict):
+        answer = answer.get('text', '')
+    if not isinstance(answer, str):
+        answer = ''
+    return f"{question} {answer}"
+
+
+def avoid_prompt(avoid):
+    """Prompt lines listing questions a top-up request must not repeat"""
+    if not avoid:
+        return ''
+    listed = '\n'.join(f"- {text[:200]}" for text in avoid[:50])
+    return f"\nDo NOT repeat or rephrase any of these existing questions:\n{listed}\n"
+
+
+class MinHasher:
+    """Seeded MinHash over character shingles of normalized text"""
+
+    def __init__(self, num_perm=64, shingle_size=5, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_PRIME), size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=num_perm).astype(np.uint64)
+
+    def shingles(self, text):
+        text = normalize_query(text)
+        k = self.shingle_size
+        if len(text) <= k:
+            return {text} if text else set()
+        return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+    def fingerprint(self, text):
+        """
+        (signature, shingle hashes, numbers) of text, or None when it is empty
+
+        The signature (uint64 array) is what LSH buckets on; the hash set
+        gives the exact Jaccard similarity of the few candidates, and the
+        sorted numbers in the text must be equal for a match.
+        """
+        text = normalize_query(text)
+        hashes = frozenset(zlib.crc32(s.encode('utf-8')) for s in self.shingles(text))
+        if not hashes:
+            return None
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        signature = ((np.outer(self._a, values) + self._b[:, None]) % _PRIME).min(axis=1)
+        return signature, hashes, tuple(sorted(_NUMBER.findall(text)))
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash fingerprints
+
+    With b bands of r rows, two questions of Jaccard similarity s share a
+    bucket with probability 1 - (1 - s**r)**b (over 0.99 at s=0.8 for 16x4).
+    Only questions sharing a bucket are compared, on their exact shingle
+    Jaccard, so the threshold is not subject to MinHash estimation noise.
+    Questions whose numbers differ never match: a changed coefficient
+    barely moves the Jaccard of a short math question.
+    """
+
+    def __init__(self, hasher, bands=16, threshold=0.8):
+        if hasher.num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands')
+        self.hasher = hasher
+        self.bands = bands
+        self.rows = hasher.num_perm // bands
+        self.threshold = threshold
+        self._buckets = [{} for _ in range(bands)]
+        self._shingles = {}
+        self._numbers = {}
+        self._texts = {}
+
+    def __len__(self):
+        return len(self._shingles)
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, key, fingerprint, text=''):
+        if fingerprint is None:
+            return
+        signature, hashes, numbers = fingerprint
+        self._shingles[key] = hashes
+        self._numbers[key] = numbers
+        self._texts[key] = text
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def text(self, key):
+        """Text an indexed question was added with"""
+        return self._texts.get(key, '')
+
+    def find(self, fingerprint):
+        """(key, similarity) of the closest indexed question at or above the threshold, or None"""
+        if fingerprint is None:
+            return None
+        signature, hashes, numbers = fingerprint
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        best = None
+        for key in candidates:
+            if self._numbers[key] != numbers:
+                continue
+            other = self._shingles[key]
+            similarity = len(hashes & other) / len(hashes | other)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+
+class QuestionDedupService:
+    def __init__(self, num_perm=64, bands=16, threshold=0.8, recent_quizzes=20, topup_rounds=1):
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.bands = bands
+        self.threshold = threshold
+        self.recent_quizzes = recent_quizzes
+        self.topup_rounds = topup_rounds
+        self._lock = threading.Lock()
+        self._stats = {
+            'checked': 0,
+            'dropped': 0,
+            'topups': 0,
+            'topup_items': 0,
+            'restored': 0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def new_index(self, items=()):
+        """NearDuplicateIndex seeded with items (question dicts or strings)"""
+        index = NearDuplicateIndex(self.hasher, bands=self.bands, threshold=self.threshold)
+        for position, item in enumerate(items):
+            text = item_text(item)
+            index.add(('seen', position), self.hasher.fingerprint(text), text)
+        return index
+
+    def dedupe(self, items, index=None):
+        """
+        Drop items that nearly duplicate an earlier item or anything in index
+
+        Kept items are added to index, so the same index can check a later
+        top-up batch against everything accepted so far.
+
+        Returns:
+            (kept, dropped) - kept items in their original order, dropped count
+        """
+        kept, duplicates = self._dedupe(items, index if index is not None else self.new_index())
+        return kept, len(duplicates)
+
+    def _dedupe(self, items, index, count=True):
+        """(kept items, [(dropped item, key of the indexed question it matched)])"""
+        kept = []
+        duplicates = []
+        for item in items:
+            text = item_text(item)
+            fingerprint = self.hasher.fingerprint(text)
+            match = index.find(fingerprint)
+            if match is not None:
+                duplicates.append((item, match[0]))
+                continue
+            index.add(('kept', len(index)), fingerprint, text)
+            kept.append(item)
+        if count:
+            self._count('checked', len(items))
+            if duplicates:
+                self._count('dropped', len(duplicates))
+        return kept, duplicates
+
+    def duplicate_positions(self, items):
+        """Positions of items that nearly duplicate an earlier item (static pools)"""
+        index = self.new_index()
+        duplicates = set()
+        for position, item in enumerate(items):
+            fingerprint = self.hasher.fingerprint(item_text(item))
+            if index.find(fingerprint) is not None:
+                duplicates.add(position)
+            else:
+                index.add(position, fingerprint)
+        return duplicates
+
+    def fill(self, items, requested, regenerate, index=None):
+        """
+        Dedupe generated items and top up to requested
+
+        Args:
+            regenerate(count, avoid): returns up to count new items; avoid is
+                the list of question texts the new items must not repeat
+                (the accepted ones and the ones the dropped items matched)
+            index: questions the result must not repeat (e.g. a user's
+                recent quizzes)
+
+        Only the missing count is requested, at most topup_rounds times, and
+        only when duplicates were dropped. If the result is still short,
+        items dropped only for repeating a question in index (not another
+        item of this result) are put back, so a user's second quiz on the
+        same material repeats questions instead of coming back empty.
+        Returns the kept items.
+        """
+        index = index if index is not None else self.new_index()
+        kept, duplicates = self._dedupe(items, index)
+        # Items that only repeat a question from before this call
+        repeats = [item for item, key in duplicates if key[0] == 'seen']
+        rounds = 0
+        while duplicates and len(kept) < requested and rounds < self.topup_rounds:
+            rounds += 1
+            missing = requested - len(kept)
+            self._count('topups')
+            logger.info(f"[DEDUP] Dropped {len(duplicates)} near-duplicate(s); requesting {missing} more")
+            avoid = list(dict.fromkeys(
+                [index.text(key) for _, key in duplicates] + [item_text(item) for item in kept]
+            ))
+            try:
+                extra = regenerate(missing, avoid) or []
+            except Exception as e:
+                logger.warning(f"[DEDUP] Top-up generation failed: {e}")
+                break
+            more, duplicates = self._dedupe(extra, index)
+            repeats.extend(item for item, key in duplicates if key[0] == 'seen')
+            kept.extend(more[:missing])
+            self._count('topup_items', len(more[:missing]))
+
+        if len(kept) < requested and repeats:
+            # Still checked against each other and the kept items
+            restored, _ = self._dedupe(repeats, self.new_index(kept), count=False)
+            restored = restored[:requested - len(kept)]
+            if restored:
+                logger.info(f"[DEDUP] Still {requested - len(kept)} short; reusing {len(restored)} question(s) seen before")
+                kept.extend(restored)
+                self._count('restored', len(restored))
+        return kept
+
+    def recent_user_index(self, user_id):
+        """
+        Index of the questions in a user's most recent quizzes: quizzes they
+        submitted (session_id) and quizzes from their batch jobs
+        """
+        from ..models import QuizBatchItem, QuizQuestion, UserQuizResponse
+
+        if not user_id:
+            return self.new_index()
+        quiz_ids = set(
+            UserQuizResponse.objects.filter(session_id=user_id)
+            .order_by('-started_at').values_list('quiz_id', flat=True)[:self.recent_quizzes]
+        )
+        quiz_ids.update(
+            QuizBatchItem.objects.filter(job__user_id=user_id, quiz__isnull=False)
+            .order_by('-finished_at').values_list('quiz_id', flat=True)[:self.recent_quizzes]
+        )
+        if not quiz_ids:
+            return self.new_index()
+
+        return self.new_index(
+            QuizQuestion.objects.filter(quiz_id__in=quiz_ids).values('question_text', 'correct_answer', 'options')
+        )
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+        s['num_perm'] = self.hasher.num_perm
+        s['bands'] = self.bands
+        s['threshold'] = self.threshold
+        return s
+
+
+# Global instance
+question_dedup = QuestionDedupService(
+    num_perm=getattr(settings, 'QUESTION_DEDUP_NUM_PERM', 64),
+    bands=getattr(settings, 'QUESTION_DEDUP_BANDS', 16),
+    threshold=getattr(settings, 'QUESTION_DEDUP_THRESHOLD', 0.8),
+    recent_quizzes=getattr(settings, 'QUESTION_DEDUP_RECENT_QUIZZES', 20),
+    topup_rounds=getattr(settings, 'QUESTION_DEDUP_TOPUP_ROUNDS', 1),
+)
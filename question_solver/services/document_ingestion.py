@@ -0,0 +1,431 @@
+"""
+Document Ingestion - One upload path for every document-based generator
+- The upload is streamed to a private temp file once (no MEDIA_ROOT copies)
+- Type is detected from magic bytes, not from the file name
+- PDF pages are extracted in page-order batches across a process pool; only
+  pages without a text layer (scans) go through OCR
+- Each generator passes its prompt budget; pages are extracted lazily and
+  extraction stops once the budget is collected. When a document holds far
+  more text than the budget, a spread of pages (first, evenly spaced, last)
+  is read instead, so CPU and latency stay bounded on 300-page uploads
+- Returns structured page text alongside the joined text
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+import logging
+import math
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from ..pdf_pages import MIN_PAGE_TEXT_CHARS, extract_pages, extract_pdf_batch, open_pdf
+from .ocr_service import ocr_service
+
+logger = logging.getLogger(__name__)
+
+PDF = 'pdf'
+IMAGE = 'image'
+TEXT = 'text'
+
+SUPPORTED_FORMATS = ['.txt', '.md', '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']
+
+# Bytes sniffed for the type check; PDF headers may sit anywhere in the first 1 KB
+HEAD_BYTES = 2048
+
+# Assumed page size when the probed pages have no text at all
+DEFAULT_PAGE_CHARS = 2000
+
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'II*\x00', 'tiff'),
+    (b'MM\x00*', 'tiff'),
+)
+
+
+def detect_document_type(head):
+    """
+    Classify an upload from its first bytes
+
+    Returns:
+        (kind, extension) - kind is 'pdf', 'image', 'text' or None if unsupported
+    """
+    if b'%PDF-' in head[:1024]:
+        return PDF, 'pdf'
+    for signature, extension in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return IMAGE, extension
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return IMAGE, 'webp'
+    # BMP: 'BM', file size, then four reserved zero bytes (plain text has no NULs)
+    if head[:2] == b'BM' and head[6:10] == b'\x00\x00\x00\x00':
+        return IMAGE, 'bmp'
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')) or b'\x00' not in head:
+        return TEXT, 'txt'
+    return None, None
+
+
+def decode_text(data):
+    """Decode a text upload: UTF-16 when it has a BOM, otherwise UTF-8 (BOM stripped)"""
+    if data.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return data.decode('utf-16', errors='ignore')
+    return data.decode('utf-8-sig', errors='ignore')
+
+
+class DocumentIngestionService:
+    def __init__(self, max_workers=4, pages_per_task=8, parallel_min_pages=16, max_chars=100000,
+                 sample_ratio=3):
+        self.max_workers = max(1, max_workers)
+        self.pages_per_task = max(1, pages_per_task)
+        self.parallel_min_pages = parallel_min_pages
+        self.max_chars = max_chars
+        self.sample_ratio = sample_ratio
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._stats = {
+            'documents': 0,
+            'failures': 0,
+            'pages_extracted': 0,
+            'pages_ocr': 0,
+            'parallel_documents': 0,
+            'sampled_documents': 0,
+            'budget_stops': 0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    # ------------------------------------------------------------------
+    # Upload handling
+    # ------------------------------------------------------------------
+
+    def _spool(self, upload):
+        """Stream an upload (Django UploadedFile or file object) to a temp file"""
+        suffix = os.path.splitext(getattr(upload, 'name', '') or '')[1].lower()[:10]
+        if hasattr(upload, 'chunks'):
+            chunks = upload.chunks()
+        else:
+            chunks = iter(lambda: upload.read(1024 * 1024), b'')
+
+        head = b''
+        handle = tempfile.NamedTemporaryFile(prefix='ingest_', suffix=suffix, delete=False)
+        with handle:
+            for chunk in chunks:
+                if len(head) < HEAD_BYTES:
+                    head += chunk[:HEAD_BYTES - len(head)]
+                handle.write(chunk)
+        return handle.name, head
+
+    def ingest(self, upload, max_chars=None):
+        """
+        Extract text from an uploaded document
+
+        Args:
+            upload: uploaded file (anything with .chunks() or .read())
+            max_chars: character budget of the downstream prompt; extraction
+                stops once it is reached (defaults to DOCUMENT_INGESTION_MAX_CHARS)
+
+        Returns:
+            dict: {
+                'success': True,
+                'kind': 'pdf' | 'image' | 'text',
+                'text': joined page text, at most max_chars long,
+                'pages': [{'page': 1-based number, 'text': str, 'method': 'text' | 'ocr'}],
+                'page_count': pages in the document,
+                'sampled': True when only a spread of PDF pages was read,
+                'truncated': True when the budget cut extraction short,
+                'elapsed_ms': float
+            }
+            or {'success': False, 'error': str, 'details': str, 'supported_formats': [...]}
+        """
+        started = time.perf_counter()
+        budget = max_chars or self.max_chars
+        name = getattr(upload, 'name', 'document')
+        path, head = self._spool(upload)
+        try:
+            kind, extension = detect_document_type(head)
+            if kind == PDF:
+                result = self._ingest_pdf(path, budget)
+            elif kind == IMAGE:
+                result = self._ingest_image(path)
+            elif kind == TEXT:
+                result = self._ingest_text(path, budget)
+            else:
+                result = self._failure(
+                    f'Unsupported document type: {name}',
+                    'Upload a PDF, an image or a plain-text file'
+                )
+        except Exception as e:
+            logger.error(f"[INGEST] Failed to ingest {name}: {e}", exc_info=True)
+            result = self._failure('Failed to process document', str(e))
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        if not result['success']:
+            self._count('failures')
+            return result
+
+        self._count('documents')
+        pages = result['pages']
+        text = '\n'.join(page['text'] for page in pages)
+        if len(text) > budget:
+            text = text[:budget]
+            result['truncated'] = True
+        result['text'] = text
+        result['kind'] = kind
+        result.setdefault('sampled', False)
+        result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(
+            f"[INGEST] {name}: {kind}, {len(pages)}/{result['page_count']} pages, "
+            f"{len(text)} chars{' (sampled)' if result['sampled'] else ' (budget reached)' if result['truncated'] else ''} "
+            f"in {result['elapsed_ms']}ms"
+        )
+        return result
+
+    @staticmethod
+    def _failure(error, details=''):
+        return {
+            'success': False,
+            'error': error,
+            'details': details,
+            'supported_formats': SUPPORTED_FORMATS,
+        }
+
+    # ------------------------------------------------------------------
+    # Text and images
+    # ------------------------------------------------------------------
+
+    def _ingest_text(self, path, budget):
+        with open(path, 'rb') as f:
+            # UTF-8 needs at most 4 bytes per character (UTF-16: 4 per pair)
+            data = f.read(budget * 4 + 4)
+            truncated = bool(f.read(1))
+        text = decode_text(data)
+        return {
+            'success': True,
+            'pages': [{'page': 1, 'text': text, 'method': 'text'}],
+            'page_count': 1,
+            'truncated': truncated,
+        }
+
+    def _ingest_image(self, path):
+        ocr_result = ocr_service.extract_text_from_image(path)
+        if not ocr_result.get('success') or not (ocr_result.get('text') or '').strip():
+            return self._failure(
+                'Failed to extract text from image',
+                ocr_result.get('error', 'Text extraction failed')
+            )
+        self._count('pages_ocr')
+        return {
+            'success': True,
+            'pages': [{'page': 1, 'text': ocr_result['text'].strip(), 'method': 'ocr'}],
+            'page_count': 1,
+            'truncated': False,
+        }
+
+    def _ocr_page_images(self, images):
+        """OCR the images embedded in a scanned page; returns '' if none yields text"""
+        texts = []
+        for image_name, data in images:
+            suffix = os.path.splitext(image_name)[1][:10] or '.png'
+            handle = tempfile.NamedTemporaryFile(prefix='ingest_img_', suffix=suffix, delete=False)
+            try:
+                with handle:
+                    handle.write(data)
+                ocr_result = ocr_service.extract_text_from_image(handle.name)
+                if ocr_result.get('success') and (ocr_result.get('text') or '').strip():
+                    texts.append(ocr_result['text'].strip())
+            except Exception as e:
+                logger.warning(f"[INGEST] OCR failed for embedded image {image_name}: {e}")
+            finally:
+                try:
+                    os.remove(handle.name)
+                except OSError:
+                    pass
+        return '\n'.join(texts)
+
+    # ------------------------------------------------------------------
+    # PDF
+    # ------------------------------------------------------------------
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                # Not fork: this process runs request, job worker and pool
+                # threads, and a forked child can inherit a lock one of
+                # them held (logging, DB driver) and deadlock on it
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._pool
+
+    def _reset_pool(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_batches(self, path, reader, batches, parallel):
+        """
+        Yield extracted batches in page order
+
+        In parallel mode at most 2 x max_workers batches are in flight, so
+        closing the generator (budget reached) leaves little wasted work;
+        pending batches are cancelled on close.
+        """
+        batches = iter(batches)
+        if not parallel:
+            for batch in batches:
+                yield extract_pages(reader, batch)
+            return
+
+        pool = self._get_pool()
+        pending = deque()
+        try:
+            for batch in batches:
+                pending.append((batch, pool.submit(extract_pdf_batch, path, batch)))
+                if len(pending) >= self.max_workers * 2:
+                    break
+            while pending:
+                batch, future = pending.popleft()
+                try:
+                    extracted = future.result()
+                except BrokenProcessPool:
+                    logger.error("[INGEST] PDF worker pool broke, extracting the rest in-process")
+                    self._reset_pool()
+                    remaining = [batch] + [queued for queued, _ in pending] + list(batches)
+                    pending.clear()
+                    for batch in remaining:
+                        yield extract_pages(reader, batch)
+                    return
+                next_batch = next(batches, None)
+                if next_batch is not None:
+                    pending.append((next_batch, pool.submit(extract_pdf_batch, path, next_batch)))
+                yield extracted
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def _page_entry(self, index, text, images):
+        method = 'text'
+        if len(text.strip()) < MIN_PAGE_TEXT_CHARS and images:
+            ocr_text = self._ocr_page_images(images)
+            if ocr_text:
+                text, method = ocr_text, 'ocr'
+                self._count('pages_ocr')
+        return {'page': index + 1, 'text': text, 'method': method}
+
+    def iter_pdf_pages(self, path, reader, indexes, parallel=False):
+        """
+        Lazily yield {'page', 'text', 'method'} for the given page indexes, in order
+
+        Scanned pages are OCR'd only when reached, so closing the generator
+        early also skips their OCR.
+        """
+        size = self.pages_per_task
+        batches = [indexes[start:start + size] for start in range(0, len(indexes), size)]
+        batch_iter = self._iter_batches(path, reader, batches, parallel)
+        try:
+            for extracted in batch_iter:
+                for index, text, images in extracted:
+                    yield self._page_entry(index, text, images)
+        finally:
+            batch_iter.close()
+
+    @staticmethod
+    def sample_page_indexes(page_count, count):
+        """count page indexes: the first, the last and evenly spaced ones between"""
+        if count >= page_count:
+            return list(range(page_count))
+        count = max(2, count)
+        return sorted({round(i * (page_count - 1) / (count - 1)) for i in range(count)})
+
+    def _ingest_pdf(self, path, budget):
+        try:
+            reader = open_pdf(path)
+            page_count = len(reader.pages)
+        except Exception as e:
+            return self._failure('Failed to extract text from PDF', str(e))
+        if not page_count:
+            return {'success': True, 'pages': [], 'page_count': 0, 'truncated': False}
+
+        # Probe the first and middle pages to estimate how many pages the
+        # budget covers (a cover page alone would underestimate)
+        probes = {}
+        for index in sorted({0, page_count // 2}):
+            probes[index] = self._page_entry(*extract_pages(reader, [index])[0])
+        probe_chars = [len(page['text']) for page in probes.values() if page['text'].strip()]
+        chars_per_page = max(sum(probe_chars) // len(probe_chars), MIN_PAGE_TEXT_CHARS) if probe_chars else DEFAULT_PAGE_CHARS
+        pages_needed = math.ceil(budget / chars_per_page) + 1
+
+        # Far more text than the prompt can use: read a spread of pages, each
+        # trimmed to an equal share of the budget, instead of only the opening
+        sampled = page_count > pages_needed * self.sample_ratio
+        if sampled:
+            indexes = self.sample_page_indexes(page_count, pages_needed)
+            share = max((budget - len(indexes)) // len(indexes), 0)
+            self._count('sampled_documents')
+        else:
+            indexes = list(range(page_count))
+            share = None
+
+        remaining = [index for index in indexes if index not in probes]
+        parallel = self.max_workers > 1 and min(len(remaining), pages_needed) >= self.parallel_min_pages
+        if parallel:
+            self._count('parallel_documents')
+
+        pages = []
+        collected = 0
+        page_iter = self.iter_pdf_pages(path, reader, remaining, parallel)
+        try:
+            for index in indexes:
+                page = probes[index] if index in probes else next(page_iter)
+                if share is not None:
+                    page['text'] = page['text'][:share]
+                pages.append(page)
+                collected += len(page['text']) + 1
+                if share is None and collected >= budget:
+                    break
+        finally:
+            page_iter.close()
+
+        truncated = sampled or len(pages) < page_count
+        if truncated:
+            self._count('budget_stops')
+        self._count('pages_extracted', len(pages))
+        return {
+            'success': True,
+            'pages': pages,
+            'page_count': page_count,
+            'sampled': sampled,
+            'truncated': truncated,
+        }
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+        s['max_workers'] = self.max_workers
+        s['pool_started'] = self._pool is not None
+        return s
+
+
+# Global instance
+document_ingestion = DocumentIngestionService(
+    max_workers=getattr(settings, 'DOCUMENT_INGESTION_WORKERS', 4),
+    pages_per_task=getattr(settings, 'DOCUMENT_INGESTION_PAGES_PER_TASK', 8),
+    parallel_min_pages=getattr(settings, 'DOCUMENT_INGESTION_PARALLEL_MIN_PAGES', 16),
+    max_chars=getattr(settings, 'DOCUMENT_INGESTION_MAX_CHARS', 100000),
+    sample_ratio=getattr(settings, 'DOCUMENT_INGESTION_SAMPLE_RATIO', 3),
+)
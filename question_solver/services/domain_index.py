@@ -0,0 +1,119 @@
+"""
+Domain Index - Trusted-domain reputation lookups for search ranking
+Domains are indexed by suffix, so a lookup walks the host's labels from the
+right (hi.byjus.com -> byjus.com -> com) with one dict probe each: cost is
+O(labels) no matter how many domains are configured, and subdomains such as
+m.geeksforgeeks.org inherit their site's tier without substring false
+positives (stackoverflow.com.example.net does not match).
+
+Tiers, label rules (.edu / .gov / .ac.*) and the keyword heuristic are
+loaded from TRUSTED_DOMAINS_FILE (question_solver/data/trusted_domains.json).
+"""
+
+from django.conf import settings
+from functools import lru_cache
+from urllib.parse import urlsplit
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRUSTED_DOMAINS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'trusted_domains.json'
+)
+
+
+@lru_cache(maxsize=8192)
+def extract_domain(url):
+    """Host of a URL, lower-cased, without port, trailing dot or leading 'www.'"""
+    try:
+        host = urlsplit(url).hostname or ''
+    except ValueError:
+        return ''
+    host = host.rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+class DomainReputationIndex:
+    def __init__(self, config):
+        self.default_score = config.get('default_score', 40)
+        self.label_rules = dict(config.get('label_rules', {}))
+        # Only count before the TLD: ox.ac.uk, not the .ac ccTLD (foo.ac)
+        self.inner_label_rules = dict(config.get('inner_label_rules', {}))
+        keyword_rule = config.get('keyword_rule', {})
+        self.keyword_score = keyword_rule.get('score', self.default_score)
+        self.keywords = tuple(keyword_rule.get('keywords', ()))
+
+        self._suffixes = {}
+        self.domains = []
+        # Higher tiers first so a domain listed twice keeps its best score
+        tiers = sorted(config.get('tiers', {}).items(), key=lambda item: -item[1]['score'])
+        for tier, spec in tiers:
+            for domain in spec.get('domains', []):
+                domain = domain.strip().lower().rstrip('.')
+                if domain and domain not in self._suffixes:
+                    self._suffixes[domain] = (spec['score'], tier)
+                    self.domains.append(domain)
+
+        self._lookup = lru_cache(maxsize=8192)(self._lookup_uncached)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _lookup_uncached(self, domain):
+        labels = domain.lower().rstrip('.').split('.')
+        if not labels or not labels[0]:
+            return 0, None
+
+        # Longest configured suffix wins (most specific entry)
+        for start in range(len(labels)):
+            match = self._suffixes.get('.'.join(labels[start:]))
+            if match is not None:
+                return match
+
+        # Academic / government labels anywhere after the host label
+        # (mit.edu, cs.ox.ac.uk, data.gov.in)
+        label_scores = [self.label_rules[label] for label in labels[1:] if label in self.label_rules]
+        label_scores += [self.inner_label_rules[label] for label in labels[1:-1] if label in self.inner_label_rules]
+        if label_scores:
+            return max(label_scores), 'institutional'
+
+        if any(keyword in domain for keyword in self.keywords):
+            return self.keyword_score, 'keyword'
+
+        return self.default_score, None
+
+    def lookup(self, domain):
+        """
+        Returns:
+            (score 0-100, tier name or None)
+        """
+        if not domain:
+            return 0, None
+        return self._lookup(domain.lower())
+
+    def score(self, domain):
+        return self.lookup(domain)[0]
+
+    def __len__(self):
+        return len(self.domains)
+
+
+def _load_index():
+    path = getattr(settings, 'TRUSTED_DOMAINS_FILE', '') or DEFAULT_TRUSTED_DOMAINS_FILE
+    try:
+        index = DomainReputationIndex.from_file(path)
+        logger.info(f"[DOMAIN_INDEX] Loaded {len(index)} trusted domains from {path}")
+        return index
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"[DOMAIN_INDEX] Could not load {path}: {e}")
+        return DomainReputationIndex({})
+
+
+# Global instance
+domain_index = _load_index()
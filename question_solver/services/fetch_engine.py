@@ -0,0 +1,191 @@
+"""
+Fetch Engine - Shared outbound HTTP for scraping, search and YouTube calls
+- One requests.Session with a keep-alive connection pool for every caller
+- Per-host concurrency limits (a burst of scrapes cannot monopolise one site,
+  and API hosts see at most FETCH_PER_HOST_LIMIT parallel calls per worker)
+- One long-lived worker pool instead of a ThreadPoolExecutor per call
+- gather() with a global deadline: returns whatever finished in time and
+  cancels the rest instead of raising and dropping every result
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from django.conf import settings
+from urllib.parse import urlparse
+import logging
+import requests
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HostLimitTimeout(requests.exceptions.Timeout):
+    """No per-host slot became free before the request's time budget ran out"""
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """The task was still queued or running when the gather() deadline passed"""
+
+
+class FetchEngine:
+    """
+    Pooled, host-limited HTTP client plus a deadline-bounded task runner
+
+    Tasks submitted through gather() must not themselves call gather() - the
+    worker pool is shared and nested waits could starve it.
+    """
+
+    def __init__(self, max_workers=16, per_host_limit=4, pool_connections=32):
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=per_host_limit,
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+        self._host_slots = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'errors': 0,
+            'host_limit_timeouts': 0,
+            'host_waits': 0,
+            'gathers': 0,
+            'tasks_completed': 0,
+            'tasks_cancelled': 0,
+            'deadline_misses': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Single requests
+    # ------------------------------------------------------------------
+
+    def _slot(self, host):
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slot
+            return slot
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def request(self, method, url, timeout=3, deadline=None, **kwargs):
+        """
+        Pooled request that holds one of the host's slots while in flight
+
+        Args:
+            timeout: per-request timeout in seconds
+            deadline: optional time.monotonic() value the request must finish by
+
+        Raises:
+            requests.RequestException (HostLimitTimeout when no slot was free)
+        """
+        budget = timeout
+        if deadline is not None:
+            budget = min(budget, deadline - time.monotonic())
+            if budget <= 0:
+                raise DeadlineExceeded(f'Deadline passed before requesting {url}')
+
+        slot = self._slot(urlparse(url).netloc.lower())
+        waited_from = time.monotonic()
+        if not slot.acquire(blocking=False):
+            self._count('host_waits')
+            if not slot.acquire(timeout=budget):
+                self._count('host_limit_timeouts')
+                raise HostLimitTimeout(f'No free connection slot for {urlparse(url).netloc}')
+        try:
+            remaining = budget - (time.monotonic() - waited_from)
+            if remaining <= 0:
+                raise HostLimitTimeout(f'Waited too long for a connection slot for {urlparse(url).netloc}')
+            self._count('requests')
+            return self.session.request(method, url, timeout=remaining, **kwargs)
+        except requests.RequestException:
+            self._count('errors')
+            raise
+        finally:
+            slot.release()
+
+    def get(self, url, timeout=3, deadline=None, **kwargs):
+        return self.request('GET', url, timeout=timeout, deadline=deadline, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Deadline-bounded fan-out
+    # ------------------------------------------------------------------
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Start func on the shared worker pool and return its Future, for I/O
+        that should overlap with work the caller does meanwhile
+        """
+        return self._executor.submit(func, *args, **kwargs)
+
+    def gather(self, calls, deadline_seconds):
+        """
+        Run calls concurrently and collect whatever finishes within the deadline
+
+        Args:
+            calls: list of (func, args) tuples; each func receives a keyword
+                argument `deadline` (a time.monotonic() value) to pass on to get()
+            deadline_seconds: overall budget for the whole batch
+
+        Returns:
+            list aligned with calls: (True, result) or (False, exception)
+        """
+        deadline = time.monotonic() + deadline_seconds
+        cancelled = threading.Event()
+
+        def _run(func, args):
+            if cancelled.is_set():
+                raise DeadlineExceeded('Cancelled before start')
+            return func(*args, deadline=deadline)
+
+        futures = [self._executor.submit(_run, func, args) for func, args in calls]
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+
+        # Queued tasks are cancelled outright; running ones see the flag or
+        # their request timeout, which never extends past the deadline
+        cancelled.set()
+        for future in not_done:
+            future.cancel()
+
+        outcomes = []
+        for future in futures:
+            if future in done:
+                error = future.exception()
+                outcomes.append((False, error) if error else (True, future.result()))
+            else:
+                outcomes.append((False, DeadlineExceeded(f'Deadline of {deadline_seconds}s exceeded')))
+
+        with self._lock:
+            self._stats['gathers'] += 1
+            self._stats['tasks_completed'] += len(done)
+            self._stats['tasks_cancelled'] += len(not_done)
+            if not_done:
+                self._stats['deadline_misses'] += 1
+        if not_done:
+            logger.warning(f"[FETCH] Deadline {deadline_seconds}s hit: {len(done)}/{len(futures)} tasks finished")
+        return outcomes
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+            s['hosts_tracked'] = len(self._host_slots)
+        s['max_workers'] = self.max_workers
+        s['per_host_limit'] = self.per_host_limit
+        return s
+
+
+# Global instance
+fetch_engine = FetchEngine(
+    max_workers=getattr(settings, 'FETCH_ENGINE_MAX_WORKERS', 16),
+    per_host_limit=getattr(settings, 'FETCH_PER_HOST_LIMIT', 4),
+)
@@ -9,6 +9,8 @@ import json
 import google.generativeai as genai
 from typing import Dict, List, Any
 
+from .dedup_service import avoid_prompt, question_dedup
+
 logger = logging.getLogger(__name__)
 
 # Configure Gemini API
@@ -22,6 +24,12 @@ else:
 class GeminiService:
     """Service for generating educational content using Gemini AI"""
     
+    # Characters of source content each generator puts into its prompt;
+    # document uploads are only extracted up to these budgets
+    QUIZ_CONTENT_BUDGET = 10000
+    FLASHCARD_CONTENT_BUDGET = 10000
+    STUDY_MATERIAL_CONTENT_BUDGET = 30000
+    
     def __init__(self):
         # Using gemini-pro as Gemini 1.5 Flash is not available in this environment
         try:
@@ -31,19 +39,32 @@ class GeminiService:
             logger.error(f"Failed to initialize Gemini model: {e}")
             self.model = None
     
-    def generate_quiz(self, topic: str, num_questions: int = 5, difficulty: str = 'medium') -> Dict[str, Any]:
+    @staticmethod
+    def _generated_items(result, data_key, items_key):
+        """Items of a top-up generation result (raises on failure)"""
+        if not result.get('success'):
+            raise RuntimeError(result.get('error', 'generation failed'))
+        return result[data_key].get(items_key, [])
+    
+    def generate_quiz(self, topic: str, num_questions: int = 5, difficulty: str = 'medium',
+                      avoid: List[str] = None) -> Dict[str, Any]:
         """
         Generate a quiz based on a topic
         
+        Near-duplicate questions are dropped and only the missing count is
+        requested again (see dedup_service).
+        
         Args:
             topic: The topic or text content to generate quiz from
             num_questions: Number of questions to generate (default: 5)
             difficulty: Difficulty level - easy, medium, hard (default: medium)
+            avoid: questions already accepted (top-up requests only)
         
         Returns:
             Dictionary containing quiz data with questions, options, and answers
         """
         try:
+            topic = topic[:self.QUIZ_CONTENT_BUDGET]
             prompt = f"""Generate a {difficulty} difficulty quiz with {num_questions} multiple-choice questions about the following topic:
 
 Topic: {topic}
@@ -77,7 +98,7 @@ Rules:
 - correctAnswer should be the index (0-3) of the correct option
 - Include a brief explanation for each answer
 - Ensure JSON is properly formatted with all strings on single lines
-"""
+{avoid_prompt(avoid)}"""
             
             logger.info(f"Generating quiz for topic: {topic}")
             response = self.model.generate_content(prompt)
@@ -144,6 +165,17 @@ Rules:
                     logger.error(repr(repaired[max(0, err2.pos-50):err2.pos+50]))
                     raise json_err  # Raise original error
             
+            if avoid is None:
+                quiz_data['questions'] = question_dedup.fill(
+                    quiz_data.get('questions', []),
+                    num_questions,
+                    lambda count, texts: self._generated_items(
+                        self.generate_quiz(topic, count, difficulty, avoid=texts), 'quiz', 'questions'
+                    ),
+                )
+                for i, question in enumerate(quiz_data['questions']):
+                    question['id'] = i + 1
+            
             logger.info(f"Successfully generated {len(quiz_data.get('questions', []))} questions")
             return {
                 'success': True,
@@ -187,19 +219,26 @@ Rules:
                 'details': str(e)
             }
     
-    def generate_flashcards(self, topic: str, num_cards: int = 10, language: str = 'english') -> Dict[str, Any]:
+    def generate_flashcards(self, topic: str, num_cards: int = 10, language: str = 'english',
+                            avoid: List[str] = None) -> Dict[str, Any]:
         """
         Generate concise, high-quality flashcards from topic or text content
+        
+        Near-duplicate cards are dropped and only the missing count is
+        requested again (see dedup_service).
 
         Args:
             topic: The topic or text content to generate flashcards from
             num_cards: Number of flashcards to generate (default: 10)
             language: Language for flashcards - 'english' or 'hindi' (default: 'english')
+            avoid: questions already accepted (top-up requests only)
 
         Returns:
             Dictionary containing flashcard data
         """
         try:
+            topic = topic[:self.FLASHCARD_CONTENT_BUDGET]
+            
             # Language-specific instruction
             if language.lower() == 'hindi':
                 lang_instruction = "in Hindi language (देवनागरी script). All content must be in Hindi."
@@ -245,7 +284,7 @@ IMPORTANT:
 - Ensure variety in question types and concepts covered
 - All flashcards must be unique and non-redundant
 - All text must be in {lang_instruction}
-"""
+{avoid_prompt(avoid)}"""
 
             logger.info(f"Generating {num_cards} conceptual flashcards for topic: {topic[:100]}... (language: {language})")
             response = self.model.generate_content(prompt)
@@ -276,6 +315,18 @@ IMPORTANT:
                 if 'category' not in card:
                     card['category'] = 'General'
 
+            if avoid is None:
+                flashcard_data['cards'] = question_dedup.fill(
+                    flashcard_data['cards'],
+                    num_cards,
+                    lambda count, texts: self._generated_items(
+                        self.generate_flashcards(topic, count, language, avoid=texts), 'flashcards', 'cards'
+                    ),
+                )
+                for i, card in enumerate(flashcard_data['cards']):
+                    card['id'] = i + 1
+                flashcard_data['total_cards'] = len(flashcard_data['cards'])
+
             logger.info(f"Successfully generated {len(flashcard_data.get('cards', []))} conceptual flashcards")
             return {
                 'success': True,
@@ -372,6 +423,7 @@ IMPORTANT:
             Dictionary containing topics, concepts, notes, and questions
         """
         try:
+            document_text = document_text[:self.STUDY_MATERIAL_CONTENT_BUDGET]
             prompt = f"""You are an expert academic examiner and study material creator.
 
 From the following sample paper/document text, generate comprehensive study material:
@@ -0,0 +1,448 @@
+"""
+Job Queue - Database-backed background jobs for long-running AI generation
+- Views queue a GenerationJob and return its id at once instead of holding a
+  web worker for a 10-30 s Gemini call
+- Workers (manage.py run_job_worker, any number of processes, and/or
+  JOB_QUEUE_LOCAL_WORKERS threads in each web process) claim jobs with a
+  conditional UPDATE, so two workers never run the same job; no broker is
+  needed, the queue is the generation_job table
+- Idempotency keys are scoped by kind and user: resubmitting the same
+  request with the same key returns the existing job, reusing the key for a
+  different payload raises IdempotencyConflict
+- Gemini quota errors are retried with exponential backoff (at least the
+  retry delay Gemini asked for) up to JOB_MAX_ATTEMPTS
+- Jobs whose worker died are requeued once their lock goes stale
+- Workers write a heartbeat to the cache; run_soon() runs a job on a thread
+  of the calling process when no worker is alive to pick it up
+- Handlers are registered per kind in each app's jobs.py (autodiscovered)
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, close_old_connections
+from django.db.models import Count, F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+from datetime import timedelta
+import hashlib
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+
+from ..models import GenerationJob
+
+logger = logging.getLogger(__name__)
+
+
+class RetryJob(Exception):
+    """Raised by a handler for transient failures (e.g. Gemini quota_exceeded)"""
+
+    def __init__(self, message='', retry_after=None, result=None, result_status=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        # What to store if no attempts are left
+        self.result = result
+        self.result_status = result_status
+
+
+class IdempotencyConflict(Exception):
+    """An idempotency key was reused with a different payload"""
+
+    def __init__(self, job):
+        super().__init__(f"Idempotency key already used for a different {job.kind} request")
+        self.job = job
+
+
+class JobQueue:
+    HEARTBEAT_KEY = 'job_queue:heartbeat'
+    HEARTBEAT_INTERVAL = 10
+
+    def __init__(self, max_attempts=4, retry_base_seconds=15, retry_max_seconds=600,
+                 lock_timeout=600, poll_interval=1.0, local_workers=0):
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.local_workers = local_workers
+        self._handlers = {}
+        self._discovered = False
+        self._local_threads = []
+        self._local_lock = threading.Lock()
+        self._last_heartbeat = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            'enqueued': 0,
+            'idempotent_hits': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'retried': 0,
+            'requeued_stale': 0,
+            'run_soon': 0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    # ------------------------------------------------------------------
+    # Handlers
+    # ------------------------------------------------------------------
+
+    def handler(self, kind):
+        """
+        Register func(payload, progress) -> (http_status, result) for a job kind
+
+        progress(percent, message='') records progress on the job row.
+        """
+        def register(func):
+            self._handlers[kind] = func
+            return func
+        return register
+
+    def autodiscover(self):
+        """Import every installed app's jobs module so its handlers register"""
+        if not self._discovered:
+            autodiscover_modules('jobs')
+            self._discovered = True
+
+    # ------------------------------------------------------------------
+    # Enqueue
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _idempotency_key(kind, user_id, idempotency_key):
+        # Hashed so long client keys are never truncated into each other
+        digest = hashlib.sha256(f"{user_id}\x1f{idempotency_key}".encode('utf-8')).hexdigest()
+        return f"{kind}:{digest}"
+
+    def _existing(self, key, payload):
+        existing = GenerationJob.objects.filter(idempotency_key=key).first()
+        if existing is None:
+            return None
+        # Compare as stored: JSON turns tuples into lists
+        if existing.payload != json.loads(json.dumps(payload)):
+            raise IdempotencyConflict(existing)
+        self._count('idempotent_hits')
+        return existing
+
+    def enqueue(self, kind, payload, idempotency_key=None, user_id=''):
+        """
+        Returns:
+            (job, created) - created is False when idempotency_key matched an
+            existing job of the same kind and user with the same payload
+
+        Raises:
+            IdempotencyConflict: the key matched a job with another payload
+        """
+        key = self._idempotency_key(kind, user_id or '', idempotency_key) if idempotency_key else None
+        if key:
+            existing = self._existing(key, payload)
+            if existing is not None:
+                return existing, False
+
+        try:
+            job = GenerationJob.objects.create(
+                kind=kind,
+                payload=payload,
+                idempotency_key=key,
+                user_id=user_id or '',
+                max_attempts=self.max_attempts,
+            )
+        except IntegrityError:
+            # Same key submitted concurrently
+            existing = self._existing(key, payload) if key else None
+            if existing is None:
+                raise
+            return existing, False
+
+        self._count('enqueued')
+        logger.info(f"[JOB_QUEUE] Queued {kind} job {job.id}")
+        self.start_local_workers()
+        return job, True
+
+    # ------------------------------------------------------------------
+    # Claim / run
+    # ------------------------------------------------------------------
+
+    def claim(self, worker_id):
+        """Take the oldest due job this process has a handler for, or None"""
+        now = timezone.now()
+        candidates = list(
+            GenerationJob.objects.filter(status='queued', run_after__lte=now, kind__in=list(self._handlers))
+            .order_by('run_after')
+            .values_list('pk', flat=True)[:10]
+        )
+        for pk in candidates:
+            job = self._claim(pk, worker_id, now)
+            if job is not None:
+                return job
+        return None
+
+    def _claim(self, pk, worker_id, now):
+        # Conditional update: only one worker moves a job out of 'queued'
+        claimed = GenerationJob.objects.filter(pk=pk, status='queued').update(
+            status='running',
+            worker_id=worker_id,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+            progress=0,
+            progress_message='Started',
+        )
+        if not claimed:
+            return None
+        job = GenerationJob.objects.get(pk=pk)
+        if job.started_at is None:
+            GenerationJob.objects.filter(pk=pk).update(started_at=now)
+        return job
+
+    def _progress_callback(self, job):
+        def progress(percent, message=''):
+            GenerationJob.objects.filter(pk=job.pk, status='running').update(
+                progress=max(0, min(int(percent), 100)),
+                progress_message=str(message)[:255],
+                locked_at=timezone.now(),
+            )
+        return progress
+
+    def backoff_seconds(self, attempts, retry_after=None):
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** max(attempts - 1, 0))
+        delay = max(delay, retry_after or 0)
+        # Jitter so jobs that hit the quota together do not retry together
+        return delay + random.uniform(0, delay * 0.1)
+
+    def run(self, job):
+        """Run a claimed job and record its outcome"""
+        handler = self._handlers.get(job.kind)
+        logger.info(f"[JOB_QUEUE] Running {job.kind} job {job.id} (attempt {job.attempts}/{job.max_attempts})")
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind '{job.kind}'")
+            result_status, result = handler(job.payload, self._progress_callback(job))
+        except RetryJob as e:
+            if job.attempts < job.max_attempts:
+                delay = self.backoff_seconds(job.attempts, e.retry_after)
+                GenerationJob.objects.filter(pk=job.pk).update(
+                    status='queued',
+                    run_after=timezone.now() + timedelta(seconds=delay),
+                    progress_message=f"Retrying in {int(delay)}s: {e}"[:255],
+                    error=str(e),
+                    worker_id='',
+                    locked_at=None,
+                )
+                self._count('retried')
+                logger.warning(f"[JOB_QUEUE] {job.kind} job {job.id} retry in {delay:.0f}s: {e}")
+                return
+            result_status = e.result_status or 503
+            result = e.result if e.result is not None else {'success': False, 'error': str(e)}
+        except Exception as e:
+            logger.error(f"[JOB_QUEUE] {job.kind} job {job.id} crashed: {e}", exc_info=True)
+            result_status = 500
+            result = {'success': False, 'error': 'Internal server error', 'details': str(e)}
+
+        succeeded = result_status < 400
+        error = ''
+        if not succeeded and isinstance(result, dict):
+            error = str(result.get('error') or '')
+        GenerationJob.objects.filter(pk=job.pk).update(
+            status='succeeded' if succeeded else 'failed',
+            result=result,
+            result_status=result_status,
+            error=error,
+            progress=100,
+            progress_message='Done' if succeeded else 'Failed',
+            finished_at=timezone.now(),
+            locked_at=None,
+        )
+        self._count('succeeded' if succeeded else 'failed')
+        logger.info(f"[JOB_QUEUE] {job.kind} job {job.id} {'succeeded' if succeeded else 'failed'} ({result_status})")
+
+    def requeue_stale(self):
+        """Requeue running jobs whose worker stopped updating them"""
+        cutoff = timezone.now() - timedelta(seconds=self.lock_timeout)
+        stale = GenerationJob.objects.filter(status='running', locked_at__lt=cutoff)
+        failed = stale.filter(attempts__gte=F('max_attempts')).update(
+            status='failed',
+            result_status=500,
+            result={'success': False, 'error': 'Worker stopped while running the job'},
+            error='Worker stopped while running the job',
+            finished_at=timezone.now(),
+            locked_at=None,
+        )
+        requeued = stale.update(status='queued', run_after=timezone.now(), worker_id='', locked_at=None)
+        if failed or requeued:
+            self._count('requeued_stale', requeued)
+            logger.warning(f"[JOB_QUEUE] Stale jobs: {requeued} requeued, {failed} failed")
+        return requeued
+
+    def work(self, worker_id=None, stop_event=None, max_jobs=None, idle_exit=False):
+        """
+        Worker loop: claim and run jobs until stop_event is set
+
+        Args:
+            max_jobs: stop after this many jobs
+            idle_exit: stop as soon as no job is due
+        """
+        self.autodiscover()
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        stop_event = stop_event or threading.Event()
+        done = 0
+        idle_loops = 0
+        while not stop_event.is_set():
+            try:
+                self._heartbeat()
+                if idle_loops % 60 == 0:
+                    self.requeue_stale()
+                job = self.claim(worker_id)
+                if job is None:
+                    idle_loops += 1
+                    if idle_exit:
+                        break
+                    stop_event.wait(self.poll_interval)
+                    continue
+                idle_loops = 0
+                self.run(job)
+                done += 1
+                if max_jobs and done >= max_jobs:
+                    break
+            except Exception as e:
+                logger.error(f"[JOB_QUEUE] Worker {worker_id} error: {e}", exc_info=True)
+                stop_event.wait(self.poll_interval)
+            finally:
+                close_old_connections()
+        return done
+
+    def _heartbeat(self):
+        now = time.time()
+        if now - self._last_heartbeat < self.HEARTBEAT_INTERVAL:
+            return
+        self._last_heartbeat = now
+        try:
+            cache.set(self.HEARTBEAT_KEY, now, self.HEARTBEAT_INTERVAL * 3)
+        except Exception as e:
+            logger.warning(f"[JOB_QUEUE] Heartbeat not recorded: {e}")
+
+    def workers_alive(self):
+        """Whether a worker thread of this process or a recent heartbeat exists"""
+        if any(thread.is_alive() for thread in self._local_threads):
+            return True
+        try:
+            return cache.get(self.HEARTBEAT_KEY) is not None
+        except Exception:
+            return False
+
+    def run_soon(self, job):
+        """
+        Run a queued job on a new thread of this process if no worker is alive
+
+        The job stays in the queue until the thread claims it, so it still
+        runs on a worker if this process dies first.
+
+        Returns:
+            True when a thread was started
+        """
+        if self.workers_alive():
+            return False
+        self._count('run_soon')
+        logger.warning(f"[JOB_QUEUE] No worker alive, running {job.kind} job {job.id} in this process")
+        thread = threading.Thread(target=self._run_claimed, args=(job.pk,), name=f"job-{job.kind}", daemon=True)
+        thread.start()
+        return True
+
+    def _run_claimed(self, pk):
+        try:
+            self.autodiscover()
+            job = self._claim(pk, f"inline:{os.getpid()}", timezone.now())
+            if job is not None:
+                self.run(job)
+        except Exception as e:
+            logger.error(f"[JOB_QUEUE] Job {pk} failed to run in process: {e}", exc_info=True)
+        finally:
+            close_old_connections()
+
+    def start_local_workers(self):
+        """
+        Run JOB_QUEUE_LOCAL_WORKERS worker threads inside this process, so
+        jobs run without a separate worker process
+
+        Started by the first enqueue or status lookup in the process rather
+        than at import, so management commands don't start workers.
+        """
+        if self.local_workers <= 0 or self._local_threads:
+            return
+        with self._local_lock:
+            if self._local_threads:
+                return
+            for number in range(self.local_workers):
+                thread = threading.Thread(
+                    target=self.work,
+                    kwargs={'worker_id': f"local:{os.getpid()}:{number}"},
+                    name=f"job-worker-{number}",
+                    daemon=True,
+                )
+                thread.start()
+                self._local_threads.append(thread)
+            logger.info(f"[JOB_QUEUE] Started {self.local_workers} in-process worker(s)")
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def get(self, job_id):
+        # A client polling after a restart resumes the jobs left queued
+        self.start_local_workers()
+        try:
+            return GenerationJob.objects.get(pk=job_id)
+        except Exception:
+            # Unknown id or not a UUID
+            return None
+
+    def job_status(self, job):
+        next_attempt_at = None
+        if job.status == 'queued' and job.run_after > timezone.now():
+            next_attempt_at = job.run_after.isoformat()
+        return {
+            'job_id': str(job.id),
+            'kind': job.kind,
+            'status': job.status,
+            'finished': job.is_finished,
+            'progress': job.progress,
+            'progress_message': job.progress_message,
+            'attempts': job.attempts,
+            'max_attempts': job.max_attempts,
+            'next_attempt_at': next_attempt_at,
+            'error': job.error or None,
+            'created_at': job.created_at.isoformat(),
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+            'status_url': f'/api/jobs/{job.id}/',
+            'result_url': f'/api/jobs/{job.id}/result/',
+        }
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+        try:
+            s['by_status'] = dict(GenerationJob.objects.order_by().values_list('status').annotate(n=Count('id')))
+        except Exception as e:
+            s['by_status'] = {'error': str(e)}
+        s['handlers'] = sorted(self._handlers)
+        s['local_workers'] = len(self._local_threads)
+        s['workers_alive'] = self.workers_alive()
+        return s
+
+
+# Global instance
+job_queue = JobQueue(
+    max_attempts=getattr(settings, 'JOB_MAX_ATTEMPTS', 4),
+    retry_base_seconds=getattr(settings, 'JOB_RETRY_BASE_SECONDS', 15),
+    retry_max_seconds=getattr(settings, 'JOB_RETRY_MAX_SECONDS', 600),
+    lock_timeout=getattr(settings, 'JOB_LOCK_TIMEOUT_SECONDS', 600),
+    poll_interval=getattr(settings, 'JOB_POLL_INTERVAL_SECONDS', 1.0),
+    local_workers=getattr(settings, 'JOB_QUEUE_LOCAL_WORKERS', 0),
+)
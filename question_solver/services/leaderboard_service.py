@@ -0,0 +1,467 @@
+"""
+Leaderboard Service - Daily, weekly and all-time rankings
+Coins earned and Daily Quiz scores are kept in sorted sets so rank lookups
+are O(log n) and top-K pages are O(log n + k), instead of sorting UserCoins.
+
+Backends:
+- Redis sorted sets when settings.REDIS_URL is configured (shared by all workers)
+- In-process indexable skiplist otherwise (per-process, rebuilt on demand)
+"""
+
+from django.conf import settings
+from django.utils import timezone
+import logging
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _Max:
+    """Sentinel key that sorts after every real key"""
+
+    def __lt__(self, other):
+        return False
+
+    def __le__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+    def __ge__(self, other):
+        return True
+
+
+class _SkipNode:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key, level):
+        self.key = key
+        self.next = [None] * level
+        self.width = [1] * level
+
+
+class SortedScoreSet:
+    """
+    Indexable skiplist ordered by (-score, member), i.e. highest score first
+
+    Each link stores its width (number of level-0 hops it skips) so both
+    rank-of-member and member-at-rank run in O(log n).
+    """
+
+    MAX_LEVEL = 24
+
+    def __init__(self):
+        self._nil = _SkipNode(_Max(), 0)
+        self._head = _SkipNode(None, self.MAX_LEVEL)
+        self._head.next = [self._nil] * self.MAX_LEVEL
+        self._scores = {}
+
+    def __len__(self):
+        return len(self._scores)
+
+    def score(self, member):
+        return self._scores.get(member)
+
+    def incr(self, member, amount):
+        old = self._scores.get(member)
+        new = (old or 0) + amount
+        if old is not None:
+            self._remove((-old, member))
+        self._insert((-new, member))
+        self._scores[member] = new
+        return new
+
+    def rank(self, member):
+        """0-based rank of member (highest score = 0), or None"""
+        score = self._scores.get(member)
+        if score is None:
+            return None
+        key = (-score, member)
+        node = self._head
+        position = 0
+        for level in reversed(range(self.MAX_LEVEL)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position
+
+    def range(self, offset, limit):
+        """[(member, score), ...] for ranks offset .. offset + limit - 1"""
+        if offset >= len(self._scores) or limit <= 0:
+            return []
+        node = self._head
+        remaining = offset + 1
+        for level in reversed(range(self.MAX_LEVEL)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        results = []
+        while node is not self._nil and len(results) < limit:
+            results.append((node.key[1], -node.key[0]))
+            node = node.next[0]
+        return results
+
+    def _insert(self, key):
+        chain = [None] * self.MAX_LEVEL
+        steps_at_level = [0] * self.MAX_LEVEL
+        node = self._head
+        for level in reversed(range(self.MAX_LEVEL)):
+            while node.next[level].key <= key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        height = 1
+        while height < self.MAX_LEVEL and random.random() < 0.5:
+            height += 1
+
+        new_node = _SkipNode(key, height)
+        steps = 0
+        for level in range(height):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(height, self.MAX_LEVEL):
+            chain[level].width[level] += 1
+
+    def _remove(self, key):
+        chain = [None] * self.MAX_LEVEL
+        node = self._head
+        for level in reversed(range(self.MAX_LEVEL)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        height = len(target.next)
+        for level in range(height):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(height, self.MAX_LEVEL):
+            chain[level].width[level] -= 1
+
+
+class _MemoryBoardBackend:
+    """Process-local sorted sets with key expiry"""
+
+    name = 'memory'
+
+    def __init__(self):
+        self._boards = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, create=False):
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at < time.time():
+            self._boards.pop(key, None)
+            self._expires.pop(key, None)
+        board = self._boards.get(key)
+        if board is None and create:
+            board = self._boards[key] = SortedScoreSet()
+        return board
+
+    def incr_many(self, updates):
+        with self._lock:
+            for key, member, amount, ttl in updates:
+                self._get(key, create=True).incr(member, amount)
+                if ttl:
+                    self._expires[key] = time.time() + ttl
+
+    def rank(self, key, member):
+        with self._lock:
+            board = self._get(key)
+            if board is None:
+                return None, None, 0
+            return board.rank(member), board.score(member), len(board)
+
+    def top(self, key, offset, limit):
+        with self._lock:
+            board = self._get(key)
+            if board is None:
+                return [], 0
+            return board.range(offset, limit), len(board)
+
+    def replace(self, key, scores, ttl):
+        board = SortedScoreSet()
+        for member, score in scores.items():
+            board.incr(member, score)
+        with self._lock:
+            self._boards[key] = board
+            if ttl:
+                self._expires[key] = time.time() + ttl
+            else:
+                self._expires.pop(key, None)
+
+
+class _RedisBoardBackend:
+    """Redis sorted sets (ZINCRBY / ZREVRANK / ZREVRANGE)"""
+
+    name = 'redis'
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(
+            url,
+            decode_responses=True,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+        self.client.ping()
+
+    def incr_many(self, updates):
+        pipe = self.client.pipeline(transaction=False)
+        for key, member, amount, ttl in updates:
+            pipe.zincrby(key, amount, member)
+            if ttl:
+                pipe.expire(key, ttl)
+        pipe.execute()
+
+    def rank(self, key, member):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrevrank(key, member)
+        pipe.zscore(key, member)
+        pipe.zcard(key)
+        rank, score, total = pipe.execute()
+        return rank, score, total
+
+    def top(self, key, offset, limit):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrevrange(key, offset, offset + limit - 1, withscores=True)
+        pipe.zcard(key)
+        entries, total = pipe.execute()
+        return entries, total
+
+    def replace(self, key, scores, ttl):
+        # Build into a temp key and RENAME so readers never see a half-built board
+        tmp_key = f"{key}:rebuild"
+        pipe = self.client.pipeline(transaction=False)
+        pipe.delete(tmp_key)
+        items = list(scores.items())
+        for start in range(0, len(items), 1000):
+            pipe.zadd(tmp_key, dict(items[start:start + 1000]))
+        if items:
+            pipe.rename(tmp_key, key)
+            if ttl:
+                pipe.expire(key, ttl)
+        else:
+            pipe.delete(key)
+        pipe.execute()
+
+
+class LeaderboardService:
+    """
+    Coins and Daily Quiz leaderboards per day, ISO week and all time
+
+    Scores:
+    - coins: coins earned ('earn' and 'bonus' transactions)
+    - quiz: correct answers across Daily Quiz submissions
+    """
+
+    METRICS = ('coins', 'quiz')
+    PERIODS = ('daily', 'weekly', 'all_time')
+    EARNING_TRANSACTION_TYPES = ('earn', 'bonus')
+
+    # Keep a finished period around for a while so "yesterday" / "last week" still resolve
+    PERIOD_TTL = {
+        'daily': 2 * 24 * 3600,
+        'weekly': 15 * 24 * 3600,
+        'all_time': None,
+    }
+
+    MAX_PAGE_SIZE = 100
+    KEY_PREFIX = 'leaderboard'
+
+    # Reason written by submit_daily_quiz, used when rebuilding quiz boards
+    DAILY_QUIZ_REASON_RE = re.compile(r'Daily Quiz completion.*- (\d+)/(\d+) correct')
+
+    # Shared placeholder for unauthenticated submissions - never ranked
+    EXCLUDED_USERS = frozenset({'', 'anonymous'})
+
+    def __init__(self):
+        self._backend = None
+        self._backend_lock = threading.Lock()
+        self._warmed = False
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = self._create_backend()
+        return self._backend
+
+    def _create_backend(self):
+        redis_url = getattr(settings, 'REDIS_URL', '')
+        if redis_url:
+            try:
+                backend = _RedisBoardBackend(redis_url)
+                logger.info("[LEADERBOARD] Using Redis sorted sets")
+                return backend
+            except Exception as e:
+                logger.warning(f"[LEADERBOARD] Redis unavailable ({e}), falling back to in-process skiplist")
+        return _MemoryBoardBackend()
+
+    def _ensure_warm(self):
+        """In-process boards start empty - load them from history once per process"""
+        if self._warmed or self.backend.name != 'memory':
+            return
+        with self._backend_lock:
+            if not self._warmed:
+                self._warmed = True
+                try:
+                    self.rebuild()
+                except Exception as e:
+                    logger.warning(f"[LEADERBOARD] Warm-up rebuild failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _bucket(period, day):
+        if period == 'daily':
+            return day.isoformat()
+        if period == 'weekly':
+            year, week, _ = day.isocalendar()
+            return f"{year}-W{week:02d}"
+        return 'all'
+
+    def board_key(self, metric, period, day=None):
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown leaderboard metric: {metric}")
+        if period not in self.PERIODS:
+            raise ValueError(f"Unknown leaderboard period: {period}")
+        day = day or timezone.localdate()
+        return f"{self.KEY_PREFIX}:{metric}:{period}:{self._bucket(period, day)}"
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def record(self, metric, user_id, amount, day=None):
+        """Add amount to user's score on the daily, weekly and all-time boards"""
+        user_id = str(user_id)
+        if not amount or user_id in self.EXCLUDED_USERS:
+            return
+        try:
+            self.backend.incr_many([
+                (self.board_key(metric, period, day), user_id, amount, self.PERIOD_TTL[period])
+                for period in self.PERIODS
+            ])
+        except Exception as e:
+            # Leaderboards are derived data - never fail the caller
+            logger.warning(f"[LEADERBOARD] Failed to record {metric} for {user_id}: {e}")
+
+    def record_coins(self, user_id, amount, transaction_type='earn'):
+        if transaction_type in self.EARNING_TRANSACTION_TYPES and amount > 0:
+            self.record('coins', user_id, amount)
+
+    def record_quiz_score(self, user_id, correct_count):
+        self.record('quiz', user_id, correct_count)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get_top(self, metric, period, limit=10, offset=0, day=None):
+        """
+        Returns:
+            dict: {'entries': [{'rank', 'user_id', 'score'}], 'total': int}
+        """
+        self._ensure_warm()
+        limit = max(1, min(int(limit), self.MAX_PAGE_SIZE))
+        offset = max(0, int(offset))
+        entries, total = self.backend.top(self.board_key(metric, period, day), offset, limit)
+        return {
+            'entries': [
+                {'rank': offset + idx + 1, 'user_id': member, 'score': int(score)}
+                for idx, (member, score) in enumerate(entries)
+            ],
+            'total': total,
+        }
+
+    def get_rank(self, metric, period, user_id, day=None):
+        """
+        Returns:
+            dict: {'rank': 1-based rank or None, 'score': int, 'total': int}
+        """
+        self._ensure_warm()
+        rank, score, total = self.backend.rank(self.board_key(metric, period, day), str(user_id))
+        return {
+            'rank': rank + 1 if rank is not None else None,
+            'score': int(score) if score is not None else 0,
+            'total': total,
+        }
+
+    # ------------------------------------------------------------------
+    # Rebuild
+    # ------------------------------------------------------------------
+
+    def rebuild(self, metrics=None):
+        """
+        Recompute the current daily, weekly and all-time boards from CoinTransaction history
+
+        Returns:
+            dict: {board_key: number of ranked users}
+        """
+        from ..models import CoinTransaction
+
+        metrics = metrics or self.METRICS
+        today = timezone.localdate()
+        buckets = {period: self._bucket(period, today) for period in self.PERIODS}
+        scores = {
+            (metric, period): {}
+            for metric in metrics
+            for period in self.PERIODS
+        }
+
+        rows = CoinTransaction.objects.filter(
+            transaction_type__in=self.EARNING_TRANSACTION_TYPES
+        ).values_list(
+            'user_coins__user_id', 'amount', 'reason', 'created_at'
+        ).iterator(chunk_size=2000)
+
+        for user_id, amount, reason, created_at in rows:
+            if user_id in self.EXCLUDED_USERS:
+                continue
+            day = timezone.localtime(created_at).date() if timezone.is_aware(created_at) else created_at.date()
+            periods = [
+                period for period in self.PERIODS
+                if self._bucket(period, day) == buckets[period]
+            ]
+
+            increments = []
+            if 'coins' in metrics and amount > 0:
+                increments.append(('coins', amount))
+            if 'quiz' in metrics:
+                match = self.DAILY_QUIZ_REASON_RE.search(reason or '')
+                if match and int(match.group(1)):
+                    increments.append(('quiz', int(match.group(1))))
+
+            for metric, value in increments:
+                for period in periods:
+                    board = scores[(metric, period)]
+                    board[user_id] = board.get(user_id, 0) + value
+
+        summary = {}
+        for (metric, period), board in scores.items():
+            key = self.board_key(metric, period, today)
+            self.backend.replace(key, board, self.PERIOD_TTL[period])
+            summary[key] = len(board)
+
+        logger.info(f"[LEADERBOARD] Rebuilt boards: {summary}")
+        return summary
+
+
+# Global instance
+leaderboard_service = LeaderboardService()
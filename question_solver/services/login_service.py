@@ -0,0 +1,266 @@
+"""
+Login Service - Bounded-cost password hashing and login throttling
+- Case-insensitive user lookups that hit the lower(email) / lower(username)
+  functional indexes (migration 0021) instead of UPPER(...) iexact scans
+- Password hashing on a bounded thread pool with queue-depth metrics, so a
+  login spike sheds load with 503s instead of tying up every web worker
+- Failed-attempt throttling per account and per client IP
+"""
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password, identify_hasher
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.functions import Lower
+import hashlib
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HashingPoolBusy(Exception):
+    """Raised when the hashing queue is full (caller should answer 503)"""
+
+
+class LoginThrottled(Exception):
+    """Raised when an account or IP has too many recent failed attempts"""
+
+    def __init__(self, scope, retry_after):
+        super().__init__(f"Too many failed login attempts ({scope})")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class PasswordHashingPool:
+    """
+    Fixed-size thread pool for password hashing / verification
+
+    hashlib's PBKDF2 releases the GIL, so hashing runs off the request path
+    with bounded CPU concurrency. Submissions beyond max_queue are rejected
+    immediately rather than piling up behind a slow queue.
+    """
+
+    def __init__(self, workers, max_queue, timeout):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pwhash')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'peak_pending': 0,
+            'total_hash_ms': 0.0,
+            'total_wait_ms': 0.0,
+        }
+
+    def run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._stats['rejected'] += 1
+                raise HashingPoolBusy('Password hashing queue is full')
+            self._pending += 1
+            self._stats['submitted'] += 1
+            self._stats['peak_pending'] = max(self._stats['peak_pending'], self._pending)
+
+        submitted_at = time.perf_counter()
+
+        def _task():
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._pending -= 1
+                    self._stats['completed'] += 1
+                    self._stats['total_wait_ms'] += (started_at - submitted_at) * 1000
+                    self._stats['total_hash_ms'] += (finished_at - started_at) * 1000
+
+        future = self._executor.submit(_task)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise HashingPoolBusy('Password hashing timed out')
+
+    def stats(self):
+        with self._lock:
+            completed = self._stats['completed']
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'in_flight': min(self._pending, self.workers),
+                'queue_depth': max(0, self._pending - self.workers),
+                'peak_pending': self._stats['peak_pending'],
+                'submitted': self._stats['submitted'],
+                'completed': completed,
+                'rejected': self._stats['rejected'],
+                'timeouts': self._stats['timeouts'],
+                'avg_hash_ms': round(self._stats['total_hash_ms'] / completed, 2) if completed else 0.0,
+                'avg_wait_ms': round(self._stats['total_wait_ms'] / completed, 2) if completed else 0.0,
+            }
+
+
+class LoginService:
+    """Lookup, verification and throttling for email/password login"""
+
+    # Failed-attempt limits (per window)
+    ACCOUNT_MAX_FAILURES = getattr(settings, 'LOGIN_ACCOUNT_MAX_FAILURES', 5)
+    IP_MAX_FAILURES = getattr(settings, 'LOGIN_IP_MAX_FAILURES', 20)
+    FAILURE_WINDOW_SECONDS = getattr(settings, 'LOGIN_FAILURE_WINDOW_SECONDS', 15 * 60)
+    # Reverse proxies in front of the app that append to X-Forwarded-For
+    TRUSTED_PROXY_COUNT = getattr(settings, 'LOGIN_TRUSTED_PROXY_COUNT', 0)
+
+    CACHE_PREFIX = 'login_fail'
+
+    def __init__(self):
+        self.pool = PasswordHashingPool(
+            workers=getattr(settings, 'LOGIN_HASH_WORKERS', min(4, os.cpu_count() or 1)),
+            max_queue=getattr(settings, 'LOGIN_HASH_MAX_QUEUE', 32),
+            timeout=getattr(settings, 'LOGIN_HASH_TIMEOUT_SECONDS', 10),
+        )
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def find_user(identifier):
+        """
+        Case-insensitive lookup by email (if it contains '@') or username
+
+        Filters on LOWER(column) = lower(value) so the functional indexes apply.
+        """
+        identifier = (identifier or '').strip().lower()
+        if not identifier:
+            return None
+        field = 'email' if '@' in identifier else 'username'
+        return User.objects.annotate(
+            identifier_lower=Lower(field)
+        ).filter(identifier_lower=identifier).order_by('id').first()
+
+    # ------------------------------------------------------------------
+    # Hashing
+    # ------------------------------------------------------------------
+
+    def verify_password(self, user, password):
+        """
+        Check password on the hashing pool
+
+        Upgrades the stored hash (in the request thread) when the hasher's
+        parameters changed, mirroring User.check_password.
+
+        Raises:
+            HashingPoolBusy
+        """
+        encoded = user.password
+        if not self.pool.run(check_password, password, encoded):
+            return False
+
+        try:
+            must_update = identify_hasher(encoded).must_update(encoded)
+        except ValueError:
+            must_update = False
+        if must_update:
+            user.password = self.hash_password(password)
+            user.save(update_fields=['password'])
+        return True
+
+    def hash_password(self, password):
+        """
+        Raises:
+            HashingPoolBusy
+        """
+        return self.pool.run(make_password, password)
+
+    # ------------------------------------------------------------------
+    # Throttling
+    # ------------------------------------------------------------------
+
+    def _key(self, scope, value):
+        digest = hashlib.sha256(str(value).lower().encode('utf-8')).hexdigest()[:32]
+        return f"{self.CACHE_PREFIX}:{scope}:{digest}"
+
+    @staticmethod
+    def client_ip(request):
+        """
+        Address of the client as seen by the first trusted proxy
+
+        X-Forwarded-For is client-controlled except for the entries appended
+        by our own proxies, so only the LOGIN_TRUSTED_PROXY_COUNT-th entry
+        from the right is used; with no trusted proxies it is ignored.
+        """
+        proxies = LoginService.TRUSTED_PROXY_COUNT
+        if proxies > 0:
+            forwarded = [part.strip() for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if part.strip()]
+            if len(forwarded) >= proxies:
+                return forwarded[-proxies]
+        return request.META.get('REMOTE_ADDR', 'unknown')
+
+    def check_throttle(self, identifier, ip):
+        """
+        Raises:
+            LoginThrottled
+        """
+        checks = (
+            ('account', identifier, self.ACCOUNT_MAX_FAILURES),
+            ('ip', ip, self.IP_MAX_FAILURES),
+        )
+        keys = {self._key(scope, value): (scope, limit) for scope, value, limit in checks if value}
+        values = cache.get_many(list(keys) + [f"{key}:start" for key in keys])
+        now = time.time()
+        for key, (scope, limit) in keys.items():
+            count = values.get(key) or 0
+            if count >= limit:
+                started = values.get(f"{key}:start", now)
+                retry_after = max(1, int(started + self.FAILURE_WINDOW_SECONDS - now))
+                logger.warning(f"[LOGIN] Throttled by {scope} limit ({count} failures)")
+                raise LoginThrottled(scope, retry_after)
+
+    def record_failure(self, identifier, ip):
+        """
+        Count a failed attempt (fixed window from the first failure)
+
+        add() only creates the counter when it is missing and incr() is atomic
+        in the cache backend, so concurrent failures are all counted.
+        """
+        now = time.time()
+        for scope, value in (('account', identifier), ('ip', ip)):
+            if not value:
+                continue
+            key = self._key(scope, value)
+            cache.add(f"{key}:start", now, self.FAILURE_WINDOW_SECONDS)
+            cache.add(key, 0, self.FAILURE_WINDOW_SECONDS)
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Window expired between add() and incr()
+                cache.add(key, 1, self.FAILURE_WINDOW_SECONDS)
+
+    def record_success(self, identifier):
+        key = self._key('account', identifier)
+        cache.delete_many([key, f"{key}:start"])
+
+    def stats(self):
+        return {
+            'hashing_pool': self.pool.stats(),
+            'throttle': {
+                'account_max_failures': self.ACCOUNT_MAX_FAILURES,
+                'ip_max_failures': self.IP_MAX_FAILURES,
+                'window_seconds': self.FAILURE_WINDOW_SECONDS,
+                'trusted_proxy_count': self.TRUSTED_PROXY_COUNT,
+            },
+        }
+
+
+# Global instance
+login_service = LoginService()
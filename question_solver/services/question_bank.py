@@ -0,0 +1,247 @@
+"""
+Question Bank - Static quiz questions (Daily Quiz, Pair Quiz) loaded once from
+QUESTION_BANK_FILE (question_solver/data/question_bank.json)
+- Loaded on first use, not at import; each pool is kept column-wise (text and
+  option tuples, numpy arrays of answer / category / difficulty codes) instead
+  of one dict per question
+- Position indexes per category, difficulty and category+difficulty are built
+  at load, so a filtered draw never scans the pool
+- sample() draws k distinct positions by rejection (uniform pools) or from a
+  Vose alias table (weighted pools): O(k), no copy or shuffle of the pool
+- Questions keep the stable 'id' from the data file; Daily Quiz tokens carry
+  these ids. Near-duplicate questions (dedup_service) stay resolvable by id
+  but are never drawn
+"""
+
+from django.conf import settings
+import json
+import logging
+import os
+import random
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUESTION_BANK_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'question_bank.json'
+)
+
+
+def _distinct_positions(n, k, rng):
+    """k distinct positions out of range(n) in O(k) expected time"""
+    if k * 2 > n:
+        # Most of the range is wanted anyway
+        return rng.sample(range(n), k)
+    chosen = {}
+    while len(chosen) < k:
+        chosen.setdefault(rng.randrange(n), None)
+    return list(chosen)
+
+
+class AliasTable:
+    """Vose alias table: O(1) weighted draws after O(n) setup"""
+
+    def __init__(self, weights):
+        n = len(weights)
+        scaled = np.asarray(weights, dtype=np.float64) * n / float(np.sum(weights))
+        self.prob = np.ones(n)
+        self.alias = np.arange(n)
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            under, over = small.pop(), large.pop()
+            self.prob[under] = scaled[under]
+            self.alias[under] = over
+            scaled[over] -= 1.0 - scaled[under]
+            (small if scaled[over] < 1.0 else large).append(over)
+        self.n = n
+
+    def draw(self, rng):
+        i = rng.randrange(self.n)
+        return i if rng.random() < self.prob[i] else int(self.alias[i])
+
+    def draw_distinct(self, k, rng, weights):
+        """
+        k distinct positions, each draw proportional to weight among those not
+        yet drawn (repeats are rejected)
+        """
+        chosen = {}
+        attempts = 0
+        while len(chosen) < k and attempts < 32 * k:
+            chosen.setdefault(self.draw(rng), None)
+            attempts += 1
+        if len(chosen) < k:
+            # A few heavy questions keep repeating: finish without them
+            rest = np.array([i for i in range(self.n) if i not in chosen])
+            p = weights[rest] / weights[rest].sum()
+            extra = np.random.default_rng(rng.getrandbits(32)).choice(rest, k - len(chosen), replace=False, p=p)
+            chosen.update((int(i), None) for i in extra)
+        return list(chosen)
+
+
+class QuestionPool:
+    """One pool's questions as columns plus prebuilt position indexes"""
+
+    def __init__(self, name, spec, duplicate_positions=()):
+        defaults = spec.get('defaults', {})
+        questions = spec.get('questions', [])
+        self.name = name
+        self.texts = tuple(q['question'] for q in questions)
+        self.options = tuple(tuple(q['options']) for q in questions)
+        self.correct = np.array([q['correct'] for q in questions], dtype=np.int8)
+        self.ids = np.array([q['id'] for q in questions], dtype=np.int64)
+        self._position_of_id = {int(question_id): position for position, question_id in enumerate(self.ids)}
+        if len(self._position_of_id) != len(questions):
+            raise ValueError(f"duplicate question ids in pool '{name}'")
+
+        self.categories, category_codes = self._encode(questions, 'category', defaults.get('category', 'general'))
+        self.difficulties, difficulty_codes = self._encode(questions, 'difficulty', defaults.get('difficulty', 'medium'))
+        self.category_codes = category_codes
+        self.difficulty_codes = difficulty_codes
+
+        weights = np.array([q.get('weight', defaults.get('weight', 1)) for q in questions], dtype=np.float64)
+        self.weights = None if np.all(weights == weights[:1]) else weights
+        self.duplicates = frozenset(duplicate_positions)
+
+        # (category, difficulty) -> positions; None matches anything
+        active = np.array([p for p in range(len(questions)) if p not in self.duplicates], dtype=np.int64)
+        self._index = {(None, None): active}
+        for c, category in enumerate(self.categories):
+            self._index[(category, None)] = active[category_codes[active] == c]
+            for d, difficulty in enumerate(self.difficulties):
+                self._index[(category, difficulty)] = active[(category_codes[active] == c) & (difficulty_codes[active] == d)]
+        for d, difficulty in enumerate(self.difficulties):
+            self._index[(None, difficulty)] = active[difficulty_codes[active] == d]
+        self._alias = {}
+
+    @staticmethod
+    def _encode(questions, field, default):
+        names = []
+        code_of = {}
+        codes = np.empty(len(questions), dtype=np.int16)
+        for position, question in enumerate(questions):
+            value = question.get(field, default)
+            if value not in code_of:
+                code_of[value] = len(names)
+                names.append(value)
+            codes[position] = code_of[value]
+        return tuple(names), codes
+
+    def __len__(self):
+        return len(self.texts)
+
+    def positions(self, category=None, difficulty=None):
+        """Drawable positions for a filter (empty array when nothing matches)"""
+        return self._index.get((category or None, difficulty or None), self._index[(None, None)][:0])
+
+    def sample(self, k, category=None, difficulty=None, rng=random):
+        positions = self.positions(category, difficulty)
+        k = max(0, min(k, len(positions)))
+        if k == 0:
+            return []
+        if self.weights is None:
+            picks = _distinct_positions(len(positions), k, rng)
+        else:
+            key = (category or None, difficulty or None)
+            if key not in self._alias:
+                self._alias[key] = AliasTable(self.weights[positions])
+            picks = self._alias[key].draw_distinct(k, rng, self.weights[positions])
+        return [int(self.ids[positions[i]]) for i in picks]
+
+    def question(self, position):
+        return {
+            'id': int(self.ids[position]),
+            'question': self.texts[position],
+            'options': list(self.options[position]),
+            'correct': int(self.correct[position]),
+            'category': self.categories[self.category_codes[position]],
+            'difficulty': self.difficulties[self.difficulty_codes[position]],
+        }
+
+    def get(self, question_ids):
+        """Question dicts for ids, in order (unknown ids are skipped)"""
+        questions = []
+        for question_id in question_ids:
+            try:
+                position = self._position_of_id.get(int(question_id))
+            except (TypeError, ValueError):
+                position = None
+            if position is not None:
+                questions.append(self.question(position))
+        return questions
+
+    def all(self):
+        return [self.question(position) for position in range(len(self))]
+
+    def stats(self):
+        return {
+            'questions': len(self),
+            'drawable': len(self._index[(None, None)]),
+            'near_duplicates': len(self.duplicates),
+            'categories': list(self.categories),
+            'difficulties': list(self.difficulties),
+            'weighted': self.weights is not None,
+        }
+
+
+class QuestionBank:
+    def __init__(self, path):
+        self.path = path
+        self._pools = None
+        self._lock = threading.Lock()
+
+    @property
+    def pools(self):
+        if self._pools is None:
+            with self._lock:
+                if self._pools is None:
+                    self._pools = self._load()
+        return self._pools
+
+    def _load(self):
+        from .dedup_service import question_dedup
+
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"[QUESTION_BANK] Could not load {self.path}: {e}")
+            return {}
+
+        pools = {}
+        for name, spec in data.get('pools', {}).items():
+            duplicates = question_dedup.duplicate_positions(spec.get('questions', []))
+            if duplicates:
+                logger.warning(f"[QUESTION_BANK] {name}: {len(duplicates)} near-duplicate question(s) will not be drawn")
+            pools[name] = QuestionPool(name, spec, duplicates)
+        logger.info(f"[QUESTION_BANK] Loaded {sum(len(p) for p in pools.values())} questions in {len(pools)} pools from {self.path}")
+        return pools
+
+    def has_pool(self, name):
+        return name in self.pools
+
+    def pool(self, name):
+        """QuestionPool by name (KeyError if missing)"""
+        return self.pools[name]
+
+    def sample(self, name, k, category=None, difficulty=None):
+        """Up to k distinct question ids from a pool, optionally filtered"""
+        return self.pool(name).sample(k, category=category, difficulty=difficulty)
+
+    def get(self, name, question_ids):
+        return self.pool(name).get(question_ids)
+
+    def stats(self):
+        if self._pools is None:
+            return {'loaded': False, 'path': self.path}
+        return {
+            'loaded': True,
+            'path': self.path,
+            'pools': {name: pool.stats() for name, pool in self._pools.items()},
+        }
+
+
+# Global instance
+question_bank = QuestionBank(getattr(settings, 'QUESTION_BANK_FILE', '') or DEFAULT_QUESTION_BANK_FILE)
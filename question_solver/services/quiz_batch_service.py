@@ -0,0 +1,356 @@
+"""
+Quiz Batch Service - Generate many quizzes from one request
+- A batch (topics and/or uploaded documents) is stored as a QuizBatchJob with
+  one QuizBatchItem per entry and the request returns immediately; clients
+  poll the job for progress and quiz ids
+- Each unique item runs as a 'quiz_batch_item' GenerationJob (job_queue), so
+  items survive worker restarts and deploys: a job whose worker died is
+  requeued, and an item whose job failed for good is marked failed. The
+  number of job workers bounds the Gemini calls in flight
+- Uploaded documents (at most QUIZ_BATCH_MAX_DOCUMENT_BYTES each) are saved
+  to default_storage, referenced by their item and ingested (text layer /
+  OCR) by the job, not in the request thread; the file is deleted once read
+- Identical topics in a batch (compared after normalize_query) and identical
+  documents are generated once; every duplicate item points at the same quiz
+- Each quiz is written with one Quiz insert and one QuizQuestion bulk_create
+"""
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+import hashlib
+import logging
+import os
+import threading
+import uuid
+
+from ..models import QuizBatchJob, QuizBatchItem
+from .cache_service import normalize_query
+from .document_ingestion import document_ingestion
+from .job_queue import job_queue
+from .quiz_persistence import save_generated_quiz
+from .quiz_service import quiz_service
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
+
+
+def topic_hash(content):
+    """Dedupe key of a batch entry: case, punctuation and spacing are ignored"""
+    return hashlib.sha1(normalize_query(content).encode('utf-8')).hexdigest()
+
+
+def document_hash(upload):
+    """Dedupe key of an uploaded document: its bytes, read in chunks"""
+    digest = hashlib.sha1(b'document\x00')
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class QuizBatchService:
+    JOB_KIND = 'quiz_batch_item'
+
+    DOCUMENT_DIR = 'quiz_batch'
+
+    def __init__(self, max_items=50, max_document_bytes=10485760):
+        self.max_items = max_items
+        self.max_document_bytes = max_document_bytes
+        self._lock = threading.Lock()
+        self._stats = {
+            'jobs': 0,
+            'items': 0,
+            'deduplicated': 0,
+            'generated': 0,
+            'failed': 0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit(self, entries, num_questions=5, difficulty='intermediate', user_id=''):
+        """
+        Store a batch and queue one generation job per unique item
+
+        Args:
+            entries: list of {'title', 'content', 'source_type', 'source_id'};
+                uploaded files (size already checked against
+                max_document_bytes) are passed as 'document' instead of
+                'content' and saved to default_storage here
+            num_questions: questions per quiz (quiz_service clamps to 5-15)
+            difficulty: 'beginner', 'intermediate' or 'advanced'
+            user_id: optional owner (device ID or email, as elsewhere)
+
+        Returns:
+            The created QuizBatchJob
+        """
+        if difficulty not in DIFFICULTIES:
+            difficulty = 'intermediate'
+
+        # Hash (and store) documents before the transaction; duplicates are
+        # never written to storage
+        digests = []
+        stored = {}
+        try:
+            for entry in entries:
+                document = entry.get('document')
+                if document is None:
+                    digests.append(topic_hash(entry.get('content') or ''))
+                    continue
+                digest = document_hash(document)
+                if digest not in stored:
+                    stored[digest] = self._store_document(document)
+                digests.append(digest)
+            job = self._create_job(entries, digests, stored, num_questions, difficulty, user_id)
+        except Exception:
+            for path in stored.values():
+                self._delete_document(path)
+            raise
+
+        self._count('jobs')
+        self._count('items', job.total_items)
+        self._count('deduplicated', job.total_items - job.unique_items)
+        logger.info(f"[QUIZ_BATCH] Job {job.id}: {job.total_items} items, {job.unique_items} unique")
+        return job
+
+    def _create_job(self, entries, digests, stored, num_questions, difficulty, user_id):
+        with transaction.atomic():
+            job = QuizBatchJob.objects.create(
+                user_id=user_id or '',
+                num_questions=num_questions,
+                difficulty=difficulty,
+                total_items=len(entries),
+            )
+            items = []
+            seen = set()
+            for position, (entry, digest) in enumerate(zip(entries, digests)):
+                content = entry.get('content') or ''
+                duplicate = digest in seen
+                seen.add(digest)
+                item = QuizBatchItem(
+                    job=job,
+                    position=position,
+                    title=(entry.get('title') or f"Quiz {position + 1}")[:255],
+                    source_type=entry.get('source_type', 'text'),
+                    source_id=(entry.get('source_id') or '')[:255],
+                    # Duplicates are filled in from the first item with their hash
+                    content='' if duplicate else content,
+                    document_path='' if duplicate else stored.get(digest, ''),
+                    topic_hash=digest,
+                )
+                if not duplicate:
+                    # One generation per unique item; queued in this
+                    # transaction so a batch is never stored without its jobs
+                    item.generation_job, _ = job_queue.enqueue(
+                        self.JOB_KIND, {'item_id': str(item.pk)}, user_id=job.user_id
+                    )
+                items.append(item)
+            QuizBatchItem.objects.bulk_create(items)
+            job.unique_items = len(seen)
+            job.save(update_fields=['unique_items'])
+        return job
+
+    def _store_document(self, upload):
+        """Save an upload under DOCUMENT_DIR (random name, original extension); returns its storage name"""
+        ext = os.path.splitext(getattr(upload, 'name', '') or '')[1][:10]
+        return default_storage.save(f"{self.DOCUMENT_DIR}/{uuid.uuid4().hex}{ext}", upload)
+
+    def _delete_document(self, path):
+        try:
+            default_storage.delete(path)
+        except Exception as e:
+            logger.warning(f"[QUIZ_BATCH] Could not delete stored document {path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+
+    def run_item(self, item_id, progress):
+        """
+        Job handler body: generate one unique item's quiz
+
+        Safe to run again for the same item (a requeued job after a worker
+        died): finished items are left alone.
+
+        Returns:
+            (http_status, result) for the GenerationJob
+        """
+        try:
+            item = QuizBatchItem.objects.select_related('job').get(pk=item_id)
+        except QuizBatchItem.DoesNotExist:
+            return 404, {'success': False, 'error': 'Batch item not found'}
+        if item.status in ('completed', 'failed'):
+            return 200, {'item_id': str(item.pk), 'status': item.status, 'quiz_id': str(item.quiz_id) if item.quiz_id else None}
+
+        try:
+            job = item.job
+            QuizBatchJob.objects.filter(pk=job.pk, status='pending').update(status='running', started_at=timezone.now())
+            QuizBatchItem.objects.filter(job_id=job.pk, topic_hash=item.topic_hash, status='pending').update(status='running')
+
+            content = item.content
+            if item.document_path:
+                progress(10, 'Reading document')
+                with default_storage.open(item.document_path, 'rb') as document:
+                    ingested = document_ingestion.ingest(document, max_chars=quiz_service.TRANSCRIPT_CHAR_BUDGET)
+                # A rerun of this item starts from the text, not the upload
+                QuizBatchItem.objects.filter(pk=item.pk).update(
+                    content=ingested.get('text') or '', document_path=''
+                )
+                self._delete_document(item.document_path)
+                if not ingested['success']:
+                    details = ingested.get('details')
+                    return self._fail(item, f"{ingested['error']}: {details}" if details else ingested['error'])
+                if not ingested['text'].strip():
+                    return self._fail(item, 'No text found in document')
+                content = ingested['text']
+
+            progress(30, 'Generating quiz')
+            quiz_data = quiz_service.generate_quiz_from_transcript(
+                transcript=content,
+                title=item.title,
+                num_questions=job.num_questions,
+                difficulty=job.difficulty,
+                user_id=job.user_id
+            )
+            if 'error' in quiz_data:
+                return self._fail(item, quiz_data['error'])
+
+            quiz, _ = save_generated_quiz(
+                quiz_data,
+                title=item.title,
+                source_type=item.source_type,
+                source_id=item.source_id,
+                num_questions=job.num_questions,
+                difficulty=job.difficulty
+            )
+            self._finish_item(item, quiz=quiz)
+            return 200, {'item_id': str(item.pk), 'status': 'completed', 'quiz_id': str(quiz.id)}
+        except Exception as e:
+            logger.error(f"[QUIZ_BATCH] Item {item_id} failed: {e}", exc_info=True)
+            return self._fail(item, str(e))
+
+    def _fail(self, item, error):
+        self._finish_item(item, error=error)
+        return 500, {'success': False, 'item_id': str(item.pk), 'status': 'failed', 'error': error}
+
+    def _finish_item(self, item, quiz=None, error=''):
+        failed = quiz is None
+        # Only unfinished items, so a rerun or reconcile never counts twice
+        updated = QuizBatchItem.objects.filter(
+            job_id=item.job_id, topic_hash=item.topic_hash, status__in=['pending', 'running']
+        ).update(
+            status='failed' if failed else 'completed',
+            quiz=quiz,
+            error=error[:1000],
+            finished_at=timezone.now(),
+        )
+        if not updated:
+            return
+        counter = 'failed_items' if failed else 'completed_items'
+        QuizBatchJob.objects.filter(pk=item.job_id).update(**{counter: F(counter) + updated})
+        self._count('failed' if failed else 'generated')
+        if failed:
+            logger.warning(f"[QUIZ_BATCH] Job {item.job_id} item '{item.title}' failed: {error}")
+
+        job = QuizBatchJob.objects.get(pk=item.job_id)
+        if job.completed_items + job.failed_items >= job.total_items:
+            if job.failed_items == 0:
+                final = 'completed'
+            elif job.completed_items == 0:
+                final = 'failed'
+            else:
+                final = 'partial'
+            # Conditional update: exactly one finishing thread closes the job
+            if QuizBatchJob.objects.filter(pk=job.pk, status__in=['pending', 'running']).update(
+                    status=final, finished_at=timezone.now()):
+                logger.info(f"[QUIZ_BATCH] Job {job.pk} {final}: {job.completed_items}/{job.total_items} items")
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def job_status(self, job_id):
+        """
+        Returns:
+            dict with the job's status, progress and per-item quiz ids, or
+            None when the job does not exist
+        """
+        try:
+            job = QuizBatchJob.objects.get(pk=job_id)
+        except (QuizBatchJob.DoesNotExist, ValueError, TypeError):
+            return None
+        except Exception as e:
+            # Malformed UUIDs raise ValidationError
+            logger.debug(f"[QUIZ_BATCH] Bad job id {job_id}: {e}")
+            return None
+
+        if not job.is_finished:
+            job_queue.start_local_workers()
+            job = self._reconcile(job)
+
+        items = QuizBatchItem.objects.filter(job=job).only(
+            'position', 'title', 'source_type', 'status', 'quiz_id', 'error'
+        )
+        done = job.completed_items + job.failed_items
+        return {
+            'job_id': str(job.id),
+            'status': job.status,
+            'finished': job.is_finished,
+            'num_questions': job.num_questions,
+            'difficulty': job.difficulty,
+            'total_items': job.total_items,
+            'unique_items': job.unique_items,
+            'completed_items': job.completed_items,
+            'failed_items': job.failed_items,
+            'progress': round(100 * done / job.total_items, 1) if job.total_items else 100.0,
+            'created_at': job.created_at.isoformat(),
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+            'items': [
+                {
+                    'position': item.position,
+                    'title': item.title,
+                    'source_type': item.source_type,
+                    'status': item.status,
+                    'quiz_id': str(item.quiz_id) if item.quiz_id else None,
+                    'error': item.error or None,
+                }
+                for item in items
+            ],
+        }
+
+    def _reconcile(self, job):
+        """Fail items whose generation job failed without reaching run_item (e.g. its worker kept dying)"""
+        stuck = QuizBatchItem.objects.filter(
+            job=job, status__in=['pending', 'running'], generation_job__status='failed'
+        ).select_related('generation_job')
+        reconciled = False
+        for item in stuck:
+            self._finish_item(item, error=item.generation_job.error or 'Generation job failed')
+            if item.document_path:
+                QuizBatchItem.objects.filter(pk=item.pk).update(document_path='')
+                self._delete_document(item.document_path)
+            reconciled = True
+        return QuizBatchJob.objects.get(pk=job.pk) if reconciled else job
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+        s['max_items'] = self.max_items
+        s['max_document_bytes'] = self.max_document_bytes
+        return s
+
+
+# Global instance
+quiz_batch_service = QuizBatchService(
+    max_items=getattr(settings, 'QUIZ_BATCH_MAX_ITEMS', 50),
+    max_document_bytes=getattr(settings, 'QUIZ_BATCH_MAX_DOCUMENT_BYTES', 10485760),
+)
@@ -0,0 +1,128 @@
+"""
+Quiz Feedback Service - Deferred AI analysis of quiz submissions
+- QuizSubmitView returns the score at once; the Gemini analysis runs as a
+  quiz_feedback job and fills in the response's feedback/strengths/weaknesses.
+  When no job worker is alive, the job runs on a thread of the web process
+- The analysis prompt only depends on the quiz and which questions were
+  answered wrong, so analyses are cached per (quiz, wrong-answer pattern) and
+  students with the same mistakes get theirs without a Gemini call
+- Fallback analyses (Gemini failed or returned unparseable text) are stored on
+  the response but not cached
+"""
+
+import logging
+import threading
+import time
+
+from ..models import QuizQuestion, UserQuizResponse
+from .cache_service import quiz_feedback_cache
+from .job_queue import job_queue
+from .quiz_service import quiz_service
+
+logger = logging.getLogger(__name__)
+
+
+def answer_pattern(scored_responses):
+    """Sorted ids of the wrongly answered questions"""
+    return ','.join(sorted(qid for qid, r in scored_responses.items() if not r.get('is_correct')))
+
+
+class QuizFeedbackService:
+    def __init__(self, cache=quiz_feedback_cache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._stats = {
+            'cached': 0,
+            'scheduled': 0,
+            'generated': 0,
+            'failed': 0,
+        }
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _key(self, quiz_id, scored_responses):
+        return self.cache.make_key(str(quiz_id), answer_pattern(scored_responses))
+
+    def cached_analysis(self, quiz_id, scored_responses):
+        """Stored analysis for this wrong-answer pattern, or None"""
+        analysis = self.cache.get(self._key(quiz_id, scored_responses))
+        if analysis is not None:
+            self._count('cached')
+        return analysis
+
+    def schedule(self, user_response):
+        """Queue the analysis of a submission; returns the job"""
+        job, _ = job_queue.enqueue(
+            'quiz_feedback',
+            {'response_id': str(user_response.id)},
+            idempotency_key=str(user_response.id),
+            user_id=user_response.session_id,
+        )
+        self._count('scheduled')
+        # Otherwise the submission would stay 'pending' until a worker starts
+        job_queue.run_soon(job)
+        return job
+
+    def analyze(self, response_id):
+        """
+        Generate (or reuse) the analysis of a stored submission and save it
+        onto the UserQuizResponse
+
+        Returns:
+            The analysis dict
+        """
+        user_response = UserQuizResponse.objects.select_related('quiz').get(pk=response_id)
+        scored_responses = user_response.responses
+        key = self._key(user_response.quiz_id, scored_responses)
+
+        # An earlier job may have analyzed the same pattern since submission
+        analysis = self.cache.get(key)
+        if analysis is None:
+            questions = QuizQuestion.objects.filter(quiz_id=user_response.quiz_id)
+            questions_list = [
+                {
+                    'id': str(q.id),
+                    'type': q.question_type,
+                    'question': q.question_text,
+                    'correct_answer': q.correct_answer,
+                    'explanation': q.explanation
+                }
+                for q in questions
+            ]
+            started = time.perf_counter()
+            analysis = quiz_service.generate_quiz_summary_from_responses(
+                user_response.quiz.title,
+                scored_responses,
+                questions_list
+            )
+            self.cache.record_upstream((time.perf_counter() - started) * 1000)
+            if 'error' not in analysis and 'strengths' in analysis:
+                self.cache.set(key, analysis)
+            self._count('generated')
+        else:
+            self._count('cached')
+
+        failed = 'error' in analysis
+        UserQuizResponse.objects.filter(pk=user_response.pk).update(
+            feedback=analysis.get('overall_feedback', ''),
+            strengths=analysis.get('strengths', []),
+            weaknesses=analysis.get('areas_for_improvement', []),
+            analysis=analysis,
+            analysis_status='failed' if failed else 'completed',
+        )
+        if failed:
+            self._count('failed')
+            logger.warning(f"[QUIZ_FEEDBACK] Analysis failed for response {response_id}: {analysis.get('error')}")
+        return analysis
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+        s['cache'] = self.cache.stats()
+        return s
+
+
+# Global instance
+quiz_feedback_service = QuizFeedbackService()
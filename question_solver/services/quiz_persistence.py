@@ -0,0 +1,138 @@
+"""
+Quiz Persistence - Saving generated quizzes and scoring submissions
+- A generated quiz is written with one Quiz insert and one QuizQuestion
+  bulk_create, and responses are built from the in-memory objects instead of
+  re-querying quiz.questions
+- Submissions are scored in one pass over the quiz's questions, with answers
+  and results looked up by question id
+"""
+
+from django.db import transaction
+
+from ..models import Quiz, QuizQuestion
+
+
+def save_generated_quiz(quiz_data, title='Quiz', source_type='text', source_id='',
+                        num_questions=5, difficulty='intermediate'):
+    """
+    Persist a quiz_service.generate_quiz_from_transcript result
+
+    Question order comes from the generated ids when they are unique,
+    otherwise from position.
+
+    Returns:
+        (quiz, questions) - questions in order, as saved
+    """
+    questions_data = quiz_data.get('questions', [])
+    ids = [q.get('id') for q in questions_data]
+    use_ids = all(isinstance(i, int) for i in ids) and len(set(ids)) == len(ids)
+
+    with transaction.atomic():
+        quiz = Quiz.objects.create(
+            title=quiz_data.get('title', title)[:255],
+            description=quiz_data.get('summary', ''),
+            source_type=source_type,
+            source_id=source_id[:255],
+            summary=quiz_data.get('summary', ''),
+            difficulty_level=quiz_data.get('difficulty_level', difficulty),
+            total_questions=len(questions_data),
+            estimated_time=quiz_data.get('estimated_time_minutes', num_questions),
+            keywords=quiz_data.get('keywords', [])
+        )
+        questions = QuizQuestion.objects.bulk_create([
+            QuizQuestion(
+                quiz=quiz,
+                question_text=question_data.get('question', ''),
+                question_type=question_data.get('type', 'mcq'),
+                order=ids[position] if use_ids else position + 1,
+                options=question_data.get('options', []),
+                correct_answer=question_data.get('correct_answer', ''),
+                explanation=question_data.get('explanation', ''),
+                hint=question_data.get('hint', ''),
+                difficulty=question_data.get('difficulty', difficulty),
+                tags=question_data.get('tags', [])
+            )
+            for position, question_data in enumerate(questions_data)
+        ])
+    questions.sort(key=lambda q: q.order)
+    return quiz, questions
+
+
+def question_payload(question):
+    """Client view of a question (no answer or explanation)"""
+    return {
+        'id': str(question.id),
+        'type': question.question_type,
+        'question': question.question_text,
+        'options': question.options,
+        'hint': question.hint,
+        'difficulty': question.difficulty
+    }
+
+
+def is_answer_correct(question, user_answer):
+    if question.question_type == 'mcq':
+        correct_option = next(
+            (opt for opt in question.options if opt.get('is_correct')),
+            None
+        )
+        return bool(correct_option) and user_answer == correct_option.get('text')
+
+    if question.question_type == 'true_false':
+        return str(user_answer).lower() == str(question.correct_answer).lower()
+
+    if question.question_type == 'short_answer':
+        # Loose match: either answer contains the other
+        expected = question.correct_answer.lower().strip()
+        user = str(user_answer).lower().strip()
+        return len(expected) > 0 and (expected in user or user in expected)
+
+    return False
+
+
+def score_submission(questions, responses):
+    """
+    Score answers against a quiz's questions in one pass
+
+    Args:
+        questions: the quiz's QuizQuestion objects
+        responses: {question_id: user_answer}
+
+    Returns:
+        dict with scored_responses ({question_id: {user_answer, is_correct,
+        correct_answer}}), correct_count, total_questions, score_percentage and
+        results (per-question rows for the response)
+    """
+    scored_responses = {}
+    results = []
+    correct_count = 0
+
+    for question in questions:
+        question_id = str(question.id)
+        user_answer = responses.get(question_id, '')
+        is_correct = is_answer_correct(question, user_answer)
+        if is_correct:
+            correct_count += 1
+
+        scored_responses[question_id] = {
+            'user_answer': user_answer,
+            'is_correct': is_correct,
+            'correct_answer': question.correct_answer
+        }
+        results.append({
+            'question_id': question_id,
+            'question': question.question_text,
+            'user_answer': user_answer,
+            'correct_answer': question.correct_answer,
+            'is_correct': is_correct,
+            'explanation': question.explanation
+        })
+
+    total_questions = len(scored_responses)
+    return {
+        'scored_responses': scored_responses,
+        'correct_count': correct_count,
+        'total_questions': total_questions,
+        'score_percentage': (correct_count / total_questions * 100) if total_questions > 0 else 0,
+        'results': results,
+    }
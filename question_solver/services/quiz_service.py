@@ -8,6 +8,8 @@ import logging
 from typing import Dict, List, Any
 import google.generativeai as genai
 
+from .dedup_service import avoid_prompt, question_dedup
+
 logger = logging.getLogger(__name__)
 
 # Configure Gemini API
@@ -21,21 +23,32 @@ class QuizService:
     
     MODEL_NAME = "gemini-2.5-flash"
     
+    # Characters of transcript/content sent to the model
+    TRANSCRIPT_CHAR_BUDGET = 10000
+    
     def generate_quiz_from_transcript(
         self,
         transcript: str,
         title: str = "Quiz",
         num_questions: int = 5,
-        difficulty: str = "intermediate"
+        difficulty: str = "intermediate",
+        user_id: str = "",
+        avoid: List[str] = None
     ) -> Dict[str, Any]:
         """
         Generate a complete quiz from transcript with various question types
         
+        Questions that nearly duplicate each other or a question from the
+        user's recent quizzes are dropped, and only the missing count is
+        requested again (see dedup_service).
+        
         Args:
             transcript: Full transcript text
             title: Quiz title
             num_questions: Number of questions to generate (5-15)
             difficulty: 'beginner', 'intermediate', or 'advanced'
+            user_id: optional user whose recent quizzes should not be repeated
+            avoid: questions already accepted (top-up requests only)
         
         Returns:
             Dict with quiz data including questions, summary, metadata
@@ -46,7 +59,7 @@ class QuizService:
                 return {"error": "API key not configured"}
             
             # Truncate transcript if too long
-            max_chars = 10000
+            max_chars = self.TRANSCRIPT_CHAR_BUDGET
             if len(transcript) > max_chars:
                 transcript = transcript[:max_chars] + "..."
             
@@ -117,7 +130,7 @@ QUALITY RULES:
 - Include helpful hints without revealing answers
 - Ensure difficulty matches specified level
 - All questions must be answerable from the transcript
-
+{avoid_prompt(avoid)}
 IMPORTANT: Return ONLY valid JSON, no markdown, no code blocks, no explanations."""
 
             # Call Gemini API
@@ -144,6 +157,21 @@ IMPORTANT: Return ONLY valid JSON, no markdown, no code blocks, no explanations.
                 logger.error("Invalid quiz data structure")
                 return {"error": "Invalid quiz structure generated"}
             
+            if avoid is None:
+                quiz_data['questions'] = question_dedup.fill(
+                    quiz_data['questions'],
+                    num_questions,
+                    lambda count, texts: self.generate_quiz_from_transcript(
+                        transcript, title, count, difficulty, avoid=texts
+                    ).get('questions', []),
+                    index=question_dedup.recent_user_index(user_id),
+                )
+                for i, question in enumerate(quiz_data['questions']):
+                    question['id'] = i + 1
+                if not quiz_data['questions']:
+                    logger.error("No questions left after removing duplicates")
+                    return {"error": "Failed to generate new quiz questions"}
+            
             return quiz_data
             
         except json.JSONDecodeError as e:
@@ -0,0 +1,91 @@
+"""
+Quiz Token Service - Stateless Daily Quiz hand-out / verification
+The quiz is handed out with a compact HMAC-signed token (django.core.signing)
+carrying the question positions, language, user and a nonce. Submissions are
+graded against the static question bank by position, so neither endpoint
+touches request.session. A small TTL cache of used nonces blocks replays.
+"""
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+import logging
+import secrets
+
+logger = logging.getLogger(__name__)
+
+
+class QuizTokenError(Exception):
+    """Invalid, expired or already-used quiz token"""
+
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class QuizTokenService:
+    SALT = 'question_solver.daily_quiz'
+    MAX_AGE_SECONDS = getattr(settings, 'DAILY_QUIZ_TOKEN_MAX_AGE', 2 * 60 * 60)
+    USED_NONCE_PREFIX = 'daily_quiz_nonce'
+
+    def issue(self, user_id, language, question_indices):
+        """
+        Returns:
+            (token, nonce)
+        """
+        nonce = secrets.token_hex(8)
+        payload = {
+            'u': str(user_id),
+            'l': language,
+            'q': list(question_indices),
+            'n': nonce,
+        }
+        token = signing.dumps(payload, salt=self.SALT, compress=True)
+        return token, nonce
+
+    def verify(self, token, user_id):
+        """
+        Check signature, age and owner of a token
+
+        Returns:
+            dict: {'user_id', 'language', 'question_indices', 'nonce'}
+
+        Raises:
+            QuizTokenError
+        """
+        try:
+            payload = signing.loads(token, salt=self.SALT, max_age=self.MAX_AGE_SECONDS)
+        except signing.SignatureExpired:
+            raise QuizTokenError('Quiz has expired. Please reload the quiz and try again.', 'QUIZ_EXPIRED')
+        except signing.BadSignature:
+            raise QuizTokenError('Invalid quiz token. Please reload the quiz and try again.', 'INVALID_QUIZ_TOKEN')
+
+        if payload.get('u') != str(user_id):
+            raise QuizTokenError('This quiz was issued to a different user.', 'QUIZ_USER_MISMATCH')
+
+        return {
+            'user_id': payload['u'],
+            'language': payload['l'],
+            'question_indices': payload['q'],
+            'nonce': payload['n'],
+        }
+
+    def consume(self, nonce):
+        """
+        Mark a nonce as used (atomic add - only the first submission wins)
+
+        Raises:
+            QuizTokenError
+        """
+        if not cache.add(f"{self.USED_NONCE_PREFIX}:{nonce}", 1, timeout=self.MAX_AGE_SECONDS):
+            logger.warning(f"[QUIZ_TOKEN] Replay blocked for nonce {nonce}")
+            raise QuizTokenError('This quiz has already been submitted.', 'QUIZ_ALREADY_SUBMITTED')
+
+    def release(self, nonce):
+        """Undo consume() when the submission it guarded did not go through"""
+        cache.delete(f"{self.USED_NONCE_PREFIX}:{nonce}")
+
+
+# Global instance
+quiz_token_service = QuizTokenService()
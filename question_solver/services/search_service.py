@@ -3,9 +3,13 @@ Search Service - Handles web search using SearchAPI.io
 Fetches top 5 results and filters trusted domains
 """
 
-import requests
+import copy
 import logging
+import time
 from django.conf import settings
+from .cache_service import search_cache
+from .domain_index import domain_index, extract_domain
+from .fetch_engine import fetch_engine
 
 logger = logging.getLogger(__name__)
 
@@ -15,37 +19,9 @@ class SearchService:
         self.searchapi_key = settings.SEARCHAPI_KEY
         self.serp_api_key = settings.SERP_API_KEY
         
-        # Use session for connection pooling
-        self.session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=5,
-            pool_maxsize=10,
-            max_retries=0
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
-        
-        # Trusted domains for educational content
-        self.trusted_domains = [
-            'stackoverflow.com',
-            'geeksforgeeks.org',
-            'tutorialspoint.com',
-            'w3schools.com',
-            'khanacademy.org',
-            'mathway.com',
-            'symbolab.com',
-            'chegg.com',
-            'toppr.com',
-            'byjus.com',
-            'vedantu.com',
-            'unacademy.com',
-            'physics.stackexchange.com',
-            'math.stackexchange.com',
-            'chemistry.stackexchange.com',
-            'quora.com',
-            'doubtnut.com',
-            'meritnation.com',
-        ]
+        # Trusted domains for educational content (see domain_index)
+        self.domain_index = domain_index
+        self.trusted_domains = domain_index.domains
     
     def search_searchapi(self, query, count=5):
         """
@@ -62,68 +38,18 @@ class SearchService:
             logger.warning("SearchAPI key not configured")
             return self._mock_search_results(query, count)
         
-        # Check cache first
-        try:
-            from .cache_service import search_cache
-            cache_key = f"{query}_{count}"
-            cached_result = search_cache.get(cache_key)
-            if cached_result:
-                logger.info(f"Search cache hit for: {query[:50]}...")
-                return cached_result
-        except Exception as e:
-            logger.debug(f"Search cache check failed: {e}")
-        
-        try:
-            endpoint = "https://www.searchapi.io/api/v1/search"
-            params = {
-                "engine": "google",
-                "q": query,
-                "api_key": self.searchapi_key,
-                "num": count
-            }
-            
-            response = self.session.get(endpoint, params=params, timeout=3)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            results = []
-            if 'organic_results' in data:
-                for item in data['organic_results'][:count]:
-                    results.append({
-                        'title': item.get('title', ''),
-                        'url': item.get('link', ''),
-                        'snippet': item.get('snippet', ''),
-                        'domain': self._extract_domain(item.get('link', '')),
-                    })
-            
-            result = {
-                'success': True,
-                'results': results,
-                'query': query,
-                'source': 'searchapi'
-            }
-            
-            # Cache the result
-            try:
-                from .cache_service import search_cache
-                search_cache.set(cache_key, result)
-            except:
-                pass
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"SearchAPI search failed: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'results': []
-            }
+        endpoint = "https://www.searchapi.io/api/v1/search"
+        params = {
+            "engine": "google",
+            "q": query,
+            "api_key": self.searchapi_key,
+            "num": count
+        }
+        return self._cached_search('searchapi', endpoint, params, query, count)
     
     def search_serpapi(self, query, count=5):
         """
-        Search using SerpAPI (Google Search)
+        Search using SerpAPI (Google Search) with caching
         
         Args:
             query: Search query
@@ -136,44 +62,74 @@ class SearchService:
             logger.warning("SerpAPI key not configured")
             return self._mock_search_results(query, count)
         
+        endpoint = "https://serpapi.com/search"
+        params = {
+            "q": query,
+            "api_key": self.serp_api_key,
+            "num": count,
+            "engine": "google"
+        }
+        return self._cached_search('serpapi', endpoint, params, query, count)
+    
+    def _cached_search(self, source, endpoint, params, query, count):
+        """
+        Run a provider request through the tiered search cache
+        
+        Failed lookups are negatively cached for a short time, so repeated
+        questions fall through to the other provider without waiting on
+        the failing one again.
+        """
+        cache_key = search_cache.make_key(query, count, source)
+        cached_result = search_cache.get(cache_key)
+        if cached_result is not None:
+            if search_cache.is_negative(cached_result):
+                logger.info(f"[SEARCH] Negative cache hit ({source}) for: {query[:50]}...")
+                return {
+                    'success': False,
+                    'error': cached_result.get('error') or f'{source} lookup recently failed',
+                    'results': [],
+                    'cached': True
+                }
+            logger.info(f"[SEARCH] Cache hit ({source}) for: {query[:50]}...")
+            # Callers annotate result dicts in place, so never hand out the L1 copy
+            result = copy.deepcopy(cached_result)
+            result.update(query=query, cached=True)
+            return result
+        
+        started = time.perf_counter()
         try:
-            endpoint = "https://serpapi.com/search"
-            params = {
-                "q": query,
-                "api_key": self.serp_api_key,
-                "num": count,
-                "engine": "google"
-            }
-            
-            response = requests.get(endpoint, params=params, timeout=3)
+            response = fetch_engine.get(endpoint, params=params, timeout=3)
             response.raise_for_status()
-            
             data = response.json()
-            
-            results = []
-            if 'organic_results' in data:
-                for item in data['organic_results'][:count]:
-                    results.append({
-                        'title': item.get('title', ''),
-                        'url': item.get('link', ''),
-                        'snippet': item.get('snippet', ''),
-                        'domain': self._extract_domain(item.get('link', '')),
-                    })
-            
-            return {
-                'success': True,
-                'results': results,
-                'query': query,
-                'source': 'serpapi'
-            }
-            
         except Exception as e:
-            logger.error(f"SerpAPI search failed: {e}")
+            search_cache.record_upstream((time.perf_counter() - started) * 1000)
+            logger.error(f"{source} search failed: {e}")
+            search_cache.set_negative(cache_key, e)
             return {
                 'success': False,
                 'error': str(e),
                 'results': []
             }
+        search_cache.record_upstream((time.perf_counter() - started) * 1000)
+        
+        results = []
+        if 'organic_results' in data:
+            for item in data['organic_results'][:count]:
+                results.append({
+                    'title': item.get('title', ''),
+                    'url': item.get('link', ''),
+                    'snippet': item.get('snippet', ''),
+                    'domain': self._extract_domain(item.get('link', '')),
+                })
+        
+        result = {
+            'success': True,
+            'results': results,
+            'query': query,
+            'source': source
+        }
+        search_cache.set(cache_key, copy.deepcopy(result))
+        return result
     
     def search(self, query, count=5, prefer_source='searchapi'):
         """
@@ -213,10 +169,11 @@ class SearchService:
         filtered = []
         
         for result in results:
-            domain = result.get('domain', '')
-            trust_score = self._calculate_trust_score(domain)
+            domain = result.get('domain') or extract_domain(result.get('url', ''))
+            trust_score, tier = self.domain_index.lookup(domain)
             
             result['trust_score'] = trust_score
+            result['trust_tier'] = tier
             result['is_trusted'] = trust_score > 50
             
             filtered.append(result)
@@ -230,41 +187,15 @@ class SearchService:
         }
     
     def _extract_domain(self, url):
-        """Extract domain from URL"""
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            return parsed.netloc.replace('www.', '')
-        except:
-            return ''
+        """Extract domain from URL (memoized)"""
+        return extract_domain(url)
     
     def _calculate_trust_score(self, domain):
         """
         Calculate trust score for a domain
         Returns score 0-100
         """
-        if not domain:
-            return 0
-        
-        # Check if domain is in trusted list
-        for trusted in self.trusted_domains:
-            if trusted in domain.lower():
-                return 90
-        
-        # Educational domains (.edu)
-        if '.edu' in domain:
-            return 80
-        
-        # Government/Academic domains
-        if '.gov' in domain or '.ac.' in domain:
-            return 75
-        
-        # Reputable domains heuristic
-        if any(keyword in domain.lower() for keyword in ['learn', 'study', 'education', 'tutorial']):
-            return 60
-        
-        # Default score for other domains
-        return 40
+        return self.domain_index.score(domain)
     
     def _mock_search_results(self, query, count):
         """
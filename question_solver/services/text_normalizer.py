@@ -0,0 +1,203 @@
+"""
+Text Normalizer - Precompiled normalization for OCR text, questions and queries
+clean_text() sits on every request path, so the character filter, whitespace
+folding and operator spacing run as table lookups instead of regex passes:
+- ASCII input (the common case): one bytes.translate() that maps whitespace to
+  spaces and deletes disallowed characters, then operator spacing
+- Other input: one str.translate() over a lazily-filled code point table that
+  does filtering, whitespace folding and operator spacing in a single pass
+Combining marks (Devanagari matras etc.) are kept, so Hindi text survives
+cleaning intact.
+"""
+
+import re
+import unicodedata
+
+# Characters kept besides letters, digits, '_' and combining marks
+KEEP_SYMBOLS = '+-*/=()[]{}?.,:;°√∫∑∏αβγδεπθλμσφψω'
+OPERATORS = '+-*/='
+
+# Normalized to ASCII operators by normalize_question
+MATH_SUBSTITUTIONS = {'×': '*', '÷': '/', '–': '-'}
+
+# Separator used to normalize a batch of ASCII strings in one call; deleted
+# from single strings, so it can never leak into output
+_BATCH_SEPARATOR = '\x00'
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for from
+further had has have having he her here hers him his how i if in into is it its itself just
+me more most my no nor not now of off on once only or other our ours out over own same she
+should so some such than that the their theirs them then there these they this those through
+to too under until up very was we were what when where which while who whom why will with
+would you your yours
+find calculate solve determine evaluate compute given value show prove explain answer question
+following using let suppose then hence therefore also
+क्या है हैं का की के को में से पर और या एक यह वह था थी थे हो तो भी ही किस कौन कितना कितने कैसे ज्ञात करें कीजिए
+""".split())
+
+
+def _is_kept(char):
+    return (
+        char.isalnum()
+        or char == '_'
+        or char in KEEP_SYMBOLS
+        or unicodedata.category(char) in ('Mn', 'Mc')
+    )
+
+
+def _build_ascii_tables():
+    whitespace = b'\t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+    table = bytes.maketrans(whitespace, b' ' * len(whitespace))
+    keep_whitespace = set(whitespace) | {ord(' ')}
+    delete = bytes(
+        code for code in range(128)
+        if code not in keep_whitespace and not _is_kept(chr(code))
+    )
+    batch_delete = delete.replace(_BATCH_SEPARATOR.encode('ascii'), b'')
+    return table, delete, batch_delete
+
+
+_ASCII_TABLE, _ASCII_DELETE, _ASCII_BATCH_DELETE = _build_ascii_tables()
+
+
+class _CodePointTable(dict):
+    """
+    str.translate() mapping filled on first sight of each code point
+
+    Whitespace -> ' ', operators -> ' op ', kept characters -> themselves,
+    everything else -> deleted. Lookups after warm-up stay in C.
+    """
+
+    def __init__(self, substitutions=None):
+        super().__init__()
+        self.substitutions = substitutions or {}
+
+    def __missing__(self, code_point):
+        char = chr(code_point)
+        if char in self.substitutions:
+            value = f' {self.substitutions[char]} '
+        elif char.isspace():
+            value = ' '
+        elif char in OPERATORS:
+            value = f' {char} '
+        elif _is_kept(char):
+            value = char
+        else:
+            value = None
+        self[code_point] = value
+        return value
+
+
+class _KeywordTable(dict):
+    """Lower-cases word characters (letters, digits, marks) and blanks the rest"""
+
+    def __missing__(self, code_point):
+        char = chr(code_point)
+        if char.isalnum() or unicodedata.category(char) in ('Mn', 'Mc'):
+            value = char.lower()
+        else:
+            value = ' '
+        self[code_point] = value
+        return value
+
+
+class TextNormalizer:
+    def __init__(self):
+        self._table = _CodePointTable()
+        self._math_table = _CodePointTable(MATH_SUBSTITUTIONS)
+        self._keyword_table = _KeywordTable()
+        self._digit_letter_re = re.compile(r'(\d)([a-zA-Z])')
+        self._letter_digit_re = re.compile(r'([a-zA-Z])(\d)')
+
+    def clean(self, text):
+        """
+        Clean and normalize extracted text
+        - Collapse all whitespace to single spaces and trim
+        - Drop characters other than letters, digits, combining marks and
+          mathematical symbols (+ - * / = () [] {} ? . , : ; ° √ ∫ ∑ ∏ greek)
+        - Put single spaces around + - * / =
+        """
+        if not text:
+            return ""
+        if text.isascii():
+            text = text.encode('ascii').translate(_ASCII_TABLE, _ASCII_DELETE).decode('ascii')
+            for operator in OPERATORS:
+                text = text.replace(operator, f' {operator} ')
+        else:
+            text = text.translate(self._table)
+        return ' '.join(text.split())
+
+    def clean_many(self, texts):
+        """
+        clean() for a list of strings
+
+        ASCII strings are joined and filtered with a single bytes.translate()
+        call; the rest go through the code point table one by one.
+
+        Returns:
+            list: cleaned strings aligned with texts
+        """
+        results = [''] * len(texts)
+        ascii_positions = []
+        for position, text in enumerate(texts):
+            if not text:
+                continue
+            if text.isascii() and _BATCH_SEPARATOR not in text:
+                ascii_positions.append(position)
+            else:
+                results[position] = self.clean(text)
+
+        if ascii_positions:
+            joined = _BATCH_SEPARATOR.join(texts[position] for position in ascii_positions)
+            joined = joined.encode('ascii').translate(_ASCII_TABLE, _ASCII_BATCH_DELETE).decode('ascii')
+            for operator in OPERATORS:
+                joined = joined.replace(operator, f' {operator} ')
+            for position, part in zip(ascii_positions, joined.split(_BATCH_SEPARATOR)):
+                results[position] = ' '.join(part.split())
+
+        return results
+
+    def normalize_question(self, text):
+        """
+        clean() plus standard math notation (× ÷ – become * / -) and spacing
+        between numbers and Latin letters ("2x" -> "2 x")
+        """
+        if not text:
+            return ""
+        text = ' '.join(text.translate(self._math_table).split())
+        text = self._digit_letter_re.sub(r'\1 \2', text)
+        return self._letter_digit_re.sub(r'\1 \2', text)
+
+    def tokens(self, text):
+        """Lower-cased word tokens (letters, digits, combining marks), stop words dropped"""
+        if not text:
+            return []
+        return [
+            word for word in text.translate(self._keyword_table).split()
+            if len(word) > 1 and word not in STOP_WORDS
+        ]
+
+    def keywords(self, text, limit=10):
+        """
+        Distinct non-stop-word tokens longer than two characters, in order
+        """
+        if not text:
+            return []
+        seen = set()
+        keywords = []
+        for word in text.translate(self._keyword_table).split():
+            if len(word) > 2 and word not in STOP_WORDS and word not in seen:
+                seen.add(word)
+                keywords.append(word)
+                if len(keywords) == limit:
+                    break
+        return keywords
+
+    def keywords_many(self, texts, limit=10):
+        return [self.keywords(text, limit) for text in texts]
+
+
+# Global instance
+text_normalizer = TextNormalizer()
@@ -1,52 +1,92 @@
 """
 Text Processing Service - Handles text cleaning, language detection, and translation
+Translations and language detections are cached in translation_cache (L1 LRU +
+shared L2) keyed by the exact text; a Unicode script pre-check settles obvious
+cases (Devanagari, no letters at all) without calling langdetect, and cache
+misses are translated in batched upstream calls.
 """
 
 from langdetect import detect, DetectorFactory
 from deep_translator import GoogleTranslator
-import re
+from .cache_service import translation_cache
+from .text_normalizer import text_normalizer
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 # Set seed for consistent language detection
 DetectorFactory.seed = 0
 
+# Segments are joined with newlines into one upstream request, staying under
+# Google Translate's 5000 character limit
+BATCH_SEPARATOR = '\n'
+MAX_BATCH_CHARS = 4500
+
 
 class TextProcessingService:
     def __init__(self):
         self.translator = GoogleTranslator(source='auto', target='en')
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'precheck_devanagari': 0,
+            'precheck_no_letters': 0,
+            'precheck_undecided': 0,
+            'langdetect_calls': 0,
+            'upstream_calls': 0,
+            'segments_translated': 0,
+            'batch_split_fallbacks': 0,
+        }
+    
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
     
     def clean_text(self, text):
         """
         Clean and normalize extracted text
         - Remove extra whitespace
-        - Fix common OCR errors
-        - Normalize punctuation
-        """
-        if not text:
-            return ""
+        - Drop special characters but keep mathematical symbols
+        - Normalize whitespace around operators
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep mathematical symbols
-        # Keep: +, -, *, /, =, (), [], {}, numbers, letters
-        text = re.sub(r'[^\w\s\+\-\*/=\(\)\[\]\{\}\?\.,:;°√∫∑∏αβγδεπθλμσφψω]', '', text)
-        
-        # Fix common OCR errors
-        replacements = {
-            '0': 'O',  # Only in certain contexts
-            'l': '1',  # Only in numeric contexts
-        }
-        
-        # Normalize whitespace around operators
-        text = re.sub(r'\s*([+\-*/=])\s*', r' \1 ', text)
+        See text_normalizer for the precompiled implementation.
+        """
+        return text_normalizer.clean(text)
+    
+    def clean_texts(self, texts):
+        """Batch clean_text() for a list of strings"""
+        return text_normalizer.clean_many(texts)
+    
+    def script_precheck(self, text):
+        """
+        Decide the language from Unicode scripts alone when it is obvious
         
-        # Remove leading/trailing whitespace
-        text = text.strip()
+        Returns:
+            'hi' when Devanagari letters dominate, 'en' when the text has no
+            letters at all (numbers / math only), None when langdetect is needed
+        """
+        devanagari = 0
+        latin = 0
+        other = 0
+        for char in text:
+            if '\u0900' <= char <= '\u097F':
+                devanagari += 1
+            elif char.isalpha():
+                if char < '\u0250':
+                    latin += 1
+                else:
+                    other += 1
         
-        return text
+        letters = devanagari + latin + other
+        if letters == 0:
+            self._count('precheck_no_letters')
+            return 'en'
+        if devanagari / letters > 0.5:
+            self._count('precheck_devanagari')
+            return 'hi'
+        self._count('precheck_undecided')
+        return None
     
     def detect_language(self, text):
         """
@@ -57,6 +97,11 @@ class TextProcessingService:
             if not text or len(text.strip()) < 3:
                 return 'unknown'
             
+            lang = self.script_precheck(text)
+            if lang:
+                return lang
+            
+            self._count('langdetect_calls')
             lang = detect(text)
             return lang
         except Exception as e:
@@ -79,48 +124,148 @@ class TextProcessingService:
                 'success': boolean
             }
         """
-        try:
+        return self.translate_batch([text], source_lang)[0]
+    
+    def translate_batch(self, texts, source_lang='auto'):
+        """
+        Translate several texts to English, one upstream call per batch
+        
+        Cached texts and texts detected as English never reach the translator;
+        the remaining ones are de-duplicated and sent newline-joined.
+        
+        Returns:
+            list: translate_to_english() result dicts, aligned with texts
+        """
+        results = [None] * len(texts)
+        pending = {}  # cache key -> (text, detected_lang, [positions])
+        
+        for position, text in enumerate(texts):
             if not text:
-                return {
+                results[position] = {
                     'success': False,
                     'error': 'Empty text',
                     'original': '',
                     'translated': ''
                 }
+                continue
+            
+            # Exact text: a normalized key would return another text's translation
+            cache_key = translation_cache.make_exact_key(text, 'en')
+            if cache_key in pending:
+                pending[cache_key][2].append(position)
+                continue
+            
+            cached = translation_cache.get(cache_key)
+            if cached is not None:
+                if translation_cache.is_negative(cached):
+                    results[position] = self._failed_translation(text, source_lang, cached.get('error'))
+                else:
+                    results[position] = self._translation_result(text, cached)
+                continue
             
             # Detect if already in English
             detected_lang = self.detect_language(text)
-            
             if detected_lang == 'en':
-                return {
-                    'success': True,
-                    'original': text,
-                    'translated': text,
-                    'source_lang': 'en',
-                    'translation_needed': False
-                }
+                entry = {'translated': None, 'source_lang': 'en'}
+                translation_cache.set(cache_key, entry)
+                results[position] = self._translation_result(text, entry)
+                continue
             
-            # Translate to English
-            translator = GoogleTranslator(source='auto', target='en')
-            translated = translator.translate(text)
+            pending[cache_key] = (text, detected_lang, [position])
+        
+        if pending:
+            items = list(pending.items())
+            for batch in self._split_batches(items):
+                try:
+                    translations = self._translate_segments([text for _, (text, _, _) in batch])
+                except Exception as e:
+                    logger.error(f"Translation failed: {e}")
+                    for cache_key, (text, _, positions) in batch:
+                        translation_cache.set_negative(cache_key, e)
+                        for position in positions:
+                            results[position] = self._failed_translation(texts[position], source_lang, str(e))
+                    continue
+                
+                for (cache_key, (text, detected_lang, positions)), translated in zip(batch, translations):
+                    entry = {'translated': translated, 'source_lang': detected_lang}
+                    translation_cache.set(cache_key, entry)
+                    for position in positions:
+                        results[position] = self._translation_result(texts[position], entry)
+        
+        return results
+    
+    @staticmethod
+    def _split_batches(items):
+        batch, size = [], 0
+        for item in items:
+            length = len(item[1][0]) + len(BATCH_SEPARATOR)
+            if batch and size + length > MAX_BATCH_CHARS:
+                yield batch
+                batch, size = [], 0
+            batch.append(item)
+            size += length
+        if batch:
+            yield batch
+    
+    def _translate_segments(self, segments):
+        """
+        Translate segments in one request, falling back to one request per
+        segment if the translator merged or split lines
+        """
+        started = time.perf_counter()
+        try:
+            if len(segments) == 1:
+                self._count('upstream_calls')
+                return [self.translator.translate(segments[0])]
             
-            return {
-                'success': True,
-                'original': text,
-                'translated': translated,
-                'source_lang': detected_lang,
-                'translation_needed': True
-            }
+            flattened = [' '.join(segment.split()) for segment in segments]
+            self._count('upstream_calls')
+            joined = self.translator.translate(BATCH_SEPARATOR.join(flattened)) or ''
+            parts = [part.strip() for part in joined.split(BATCH_SEPARATOR)]
+            if len(parts) == len(segments):
+                return parts
             
-        except Exception as e:
-            logger.error(f"Translation failed: {e}")
+            self._count('batch_split_fallbacks')
+            logger.warning(f"[TRANSLATE] Batch of {len(segments)} came back as {len(parts)} lines, translating individually")
+            self._count('upstream_calls', len(segments))
+            return [self.translator.translate(segment) for segment in segments]
+        finally:
+            self._count('segments_translated', len(segments))
+            translation_cache.record_upstream((time.perf_counter() - started) * 1000)
+    
+    @staticmethod
+    def _translation_result(text, entry):
+        if entry['source_lang'] == 'en':
             return {
-                'success': False,
-                'error': str(e),
+                'success': True,
                 'original': text,
-                'translated': text,  # Return original if translation fails
-                'source_lang': source_lang
+                'translated': text,
+                'source_lang': 'en',
+                'translation_needed': False
             }
+        return {
+            'success': True,
+            'original': text,
+            'translated': entry['translated'],
+            'source_lang': entry['source_lang'],
+            'translation_needed': True
+        }
+    
+    @staticmethod
+    def _failed_translation(text, source_lang, error):
+        return {
+            'success': False,
+            'error': error or 'Translation failed',
+            'original': text,
+            'translated': text,  # Return original if translation fails
+            'source_lang': source_lang
+        }
+    
+    def translation_stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['cache'] = translation_cache.stats()
+        return stats
     
     def generate_search_queries(self, text, max_queries=3):
         """
@@ -149,14 +294,7 @@ class TextProcessingService:
         Extract important keywords from text
         Focus on mathematical, scientific terms
         """
-        # Remove common words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-                     'of', 'with', 'is', 'are', 'was', 'were', 'find', 'calculate', 'solve'}
-        
-        words = text.lower().split()
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
-        
-        return keywords[:10]  # Return top 10 keywords
+        return text_normalizer.keywords(text, limit=10)  # Return top 10 keywords
     
     def normalize_question(self, text):
         """
@@ -165,18 +303,7 @@ class TextProcessingService:
         - Fix spacing
         - Remove noise
         """
-        text = self.clean_text(text)
-        
-        # Standardize mathematical operators
-        text = text.replace('×', '*')
-        text = text.replace('÷', '/')
-        text = text.replace('–', '-')
-        
-        # Ensure proper spacing around numbers and operators
-        text = re.sub(r'(\d)([a-zA-Z])', r'\1 \2', text)
-        text = re.sub(r'([a-zA-Z])(\d)', r'\1 \2', text)
-        
-        return text
+        return text_normalizer.normalize_question(text)
 
 
 # Global instance
@@ -1,38 +1,135 @@
 """  
 Web Scraping Service - Fetches and parses content from URLs
-Uses BeautifulSoup for parsing
+Page text is pulled with the streaming extractor (html_extractor); BeautifulSoup
+is used for solution-section extraction and as the extraction fallback.
+Extracted page text is kept in a size-bounded LRU and revalidated with
+conditional GETs (ETag / Last-Modified), so popular solution pages are only
+downloaded and parsed once.
 """
 
 import requests
 from bs4 import BeautifulSoup
+from collections import OrderedDict
+from .fetch_engine import fetch_engine
+from .html_extractor import extract_page_text, soup_extract_page_text
+from django.conf import settings
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
 
 logger = logging.getLogger(__name__)
+
+
+class PageContentCache:
+    """
+    Thread-safe LRU of extracted page content, bounded by total size in bytes
+
+    Entries are served without any request while fresh; afterwards the stored
+    ETag / Last-Modified validators let the scraper revalidate with a
+    conditional GET and skip parsing entirely on 304 Not Modified.
+    """
+
+    def __init__(self, max_bytes=4 * 1024 * 1024, fresh_seconds=600):
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._stats = {
+            'fresh_hits': 0,
+            'revalidated': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+        }
+
+    @staticmethod
+    def _entry_size(entry):
+        return len(entry['title'].encode('utf-8')) + len(entry['content'].encode('utf-8')) + 256
+
+    def get(self, url):
+        """
+        Returns:
+            (entry or None, is_fresh)
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None, False
+            self._entries.move_to_end(url)
+            is_fresh = time.time() - entry['validated_at'] < self.fresh_seconds
+            if is_fresh:
+                self._stats['fresh_hits'] += 1
+            return dict(entry), is_fresh
+
+    def set(self, url, title, content, etag=None, last_modified=None):
+        entry = {
+            'title': title or '',
+            'content': content or '',
+            'etag': etag,
+            'last_modified': last_modified,
+            'validated_at': time.time(),
+        }
+        entry['size'] = self._entry_size(entry)
+        if entry['size'] > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self._bytes -= previous['size']
+            self._entries[url] = entry
+            self._bytes += entry['size']
+            self._stats['stores'] += 1
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted['size']
+                self._stats['evictions'] += 1
+
+    def mark_revalidated(self, url):
+        """Record a 304 Not Modified - the entry is fresh again"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                entry['validated_at'] = time.time()
+                self._entries.move_to_end(url)
+            self._stats['revalidated'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+            s['entries'] = len(self._entries)
+            s['bytes'] = self._bytes
+        s['max_bytes'] = self.max_bytes
+        s['fresh_seconds'] = self.fresh_seconds
+        return s
+
+
 class WebScraperService:
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        # Use session for connection pooling and reuse
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-        # Configure session for speed
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,
-            pool_maxsize=20,
-            max_retries=0  # No retries for speed
+        # Requests go through the shared fetch engine (pooled, per-host limits)
+        
+        self.page_cache = PageContentCache(
+            max_bytes=getattr(settings, 'SCRAPER_CACHE_MAX_BYTES', 4 * 1024 * 1024),
+            fresh_seconds=getattr(settings, 'SCRAPER_CACHE_FRESH_SECONDS', 600),
         )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
     
-    def fetch_url_content(self, url, timeout=1.2):
+    def fetch_url_content(self, url, timeout=1.2, deadline=None):
         """
         Fetch and parse content from a URL
         
         Args:
             url: URL to fetch
             timeout: Request timeout in seconds
+            deadline: Optional time.monotonic() value the fetch must finish by
             
         Returns:
             dict: {
@@ -42,31 +139,34 @@ class WebScraperService:
                 'url': original URL
             }
         """
+        cached, is_fresh = self.page_cache.get(url)
+        if cached is not None and is_fresh:
+            return self._cached_result(url, cached)
+        
         try:
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            request_headers = dict(self.headers)
+            if cached is not None:
+                if cached['etag']:
+                    request_headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    request_headers['If-Modified-Since'] = cached['last_modified']
             
-            # Extract title
-            title = soup.title.string if soup.title else ''
+            response = fetch_engine.get(url, timeout=timeout, deadline=deadline, headers=request_headers)
             
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
+            # Unchanged since last fetch - skip download body and parsing
+            if response.status_code == 304 and cached is not None:
+                self.page_cache.mark_revalidated(url)
+                return self._cached_result(url, cached)
             
-            # Get text
-            text = soup.get_text(separator=' ', strip=True)
+            response.raise_for_status()
             
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            title, text = self._extract_page_text(response.content, response.headers.get('Content-Type'))
             
-            # Limit content length for speed - reduced to 800 chars
-            max_length = 800
-            if len(text) > max_length:
-                text = text[:max_length] + "..."
+            self.page_cache.set(
+                url, title, text,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+            )
             
             return {
                 'success': True,
@@ -78,6 +178,9 @@ class WebScraperService:
             
         except requests.RequestException as e:
             logger.error(f"Failed to fetch {url}: {e}")
+            if cached is not None:
+                # Stale content beats no content when the origin is unreachable
+                return self._cached_result(url, cached)
             return {
                 'success': False,
                 'error': str(e),
@@ -95,42 +198,61 @@ class WebScraperService:
                 'content': ''
             }
     
-    def fetch_multiple_urls(self, urls, max_concurrent=5):
+    def _extract_page_text(self, html, content_type=None):
+        """
+        Returns:
+            (title, text) - text trimmed to 800 chars
+        """
+        try:
+            return extract_page_text(html, max_length=800, content_type=content_type)
+        except Exception as e:
+            logger.warning(f"[SCRAPER] Streaming extraction failed, using BeautifulSoup: {e}")
+            return soup_extract_page_text(html, max_length=800)
+    
+    def _cached_result(self, url, entry):
+        return {
+            'success': True,
+            'title': entry['title'],
+            'content': entry['content'],
+            'url': url,
+            'length': len(entry['content']),
+            'cached': True
+        }
+    
+    def fetch_multiple_urls(self, urls, max_concurrent=5, deadline=2.5):
         """
         Fetch content from multiple URLs in parallel
         
         Args:
             urls: List of URLs
-            max_concurrent: Maximum concurrent requests
+            max_concurrent: Maximum number of URLs to fetch
+            deadline: Overall time budget in seconds - pages still loading
+                when it passes are reported as failed, the rest are kept
             
         Returns:
-            list: List of results for each URL
+            list: List of results for each URL (same order as urls)
         """
-        results = []
-        
         # Limit URLs to process
         urls_to_fetch = urls[:max_concurrent]
         
-        # Use ThreadPoolExecutor for parallel requests
-        with ThreadPoolExecutor(max_workers=min(max_concurrent, 5)) as executor:
-            # Submit all URL fetch tasks
-            future_to_url = {executor.submit(self.fetch_url_content, url): url for url in urls_to_fetch}
-            
-            # Collect results as they complete (with timeout)
-            for future in as_completed(future_to_url, timeout=2.5):
-                try:
-                    result = future.result(timeout=1.5)
-                    results.append(result)
-                except Exception as e:
-                    url = future_to_url[future]
-                    logger.error(f"Failed to fetch {url}: {e}")
-                    results.append({
-                        'success': False,
-                        'error': str(e),
-                        'url': url,
-                        'title': '',
-                        'content': ''
-                    })
+        outcomes = fetch_engine.gather(
+            [(self.fetch_url_content, (url,)) for url in urls_to_fetch],
+            deadline_seconds=deadline
+        )
+        
+        results = []
+        for url, (ok, value) in zip(urls_to_fetch, outcomes):
+            if ok:
+                results.append(value)
+            else:
+                logger.error(f"Failed to fetch {url}: {value}")
+                results.append({
+                    'success': False,
+                    'error': str(value),
+                    'url': url,
+                    'title': '',
+                    'content': ''
+                })
         
         return results
     
@@ -1,18 +1,90 @@
 """
 YouTube Service - Searches for educational concept videos
+Searches cost 100 quota units each, so results are cached per normalized
+concept (youtube_search_cache, long TTLs) and every API call is charged to a
+daily quota budget. Close to the budget the service switches to cache-only
+mode until the quota resets at midnight Pacific time.
 """
 
-import requests
 import logging
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
 from django.conf import settings
+from django.core.cache import cache
+from .cache_service import youtube_search_cache
+from .fetch_engine import fetch_engine
 
 logger = logging.getLogger(__name__)
 
+SEARCH_COST_UNITS = 100
+VIDEOS_COST_UNITS = 1
+
+
+class YouTubeQuotaBudget:
+    """
+    Daily YouTube Data API unit counter shared through the Django cache
+
+    Spending stops reserve_units short of the daily quota, leaving headroom
+    for other workers' in-flight calls and for the cheap videos.list lookups.
+    """
+
+    CACHE_PREFIX = 'youtube_quota'
+
+    def __init__(self, daily_units=10000, reserve_units=1000):
+        self.daily_units = daily_units
+        self.reserve_units = reserve_units
+
+    @staticmethod
+    def quota_day():
+        # YouTube quotas reset at midnight Pacific time
+        return datetime.now(ZoneInfo('America/Los_Angeles')).strftime('%Y-%m-%d')
+
+    def _key(self):
+        return f"{self.CACHE_PREFIX}:{self.quota_day()}"
+
+    def used(self):
+        return cache.get(self._key(), 0)
+
+    def can_spend(self, units):
+        return self.used() + units <= self.daily_units - self.reserve_units
+
+    def spend(self, units):
+        key = self._key()
+        cache.add(key, 0, timeout=2 * 24 * 60 * 60)
+        try:
+            return cache.incr(key, units)
+        except ValueError:
+            cache.set(key, units, timeout=2 * 24 * 60 * 60)
+            return units
+
+    def mark_exhausted(self):
+        """The API reported quotaExceeded - stop spending until the reset"""
+        cache.set(self._key(), self.daily_units, timeout=2 * 24 * 60 * 60)
+
+    def stats(self):
+        used = self.used()
+        return {
+            'quota_day': self.quota_day(),
+            'used_units': used,
+            'daily_units': self.daily_units,
+            'reserve_units': self.reserve_units,
+            'cache_only': not self.can_spend(SEARCH_COST_UNITS),
+        }
+
 
 class YouTubeService:
+    # Results fetched per search call (same 100 units for 1..50), cached and
+    # sliced so callers asking for different counts share one entry
+    SEARCH_FETCH_COUNT = 8
+
     def __init__(self):
         self.api_key = settings.YOUTUBE_API_KEY
         self.base_url = "https://www.googleapis.com/youtube/v3/search"
+        self.quota = YouTubeQuotaBudget(
+            daily_units=getattr(settings, 'YOUTUBE_DAILY_QUOTA_UNITS', 10000),
+            reserve_units=getattr(settings, 'YOUTUBE_QUOTA_RESERVE_UNITS', 1000),
+        )
     
     def search_concept_videos(self, query, max_results=3):
         """
@@ -36,43 +108,83 @@ class YouTubeService:
                 'videos': []
             }
 
+        # Enhance query for educational content
+        enhanced_query = f"{query} tutorial explanation"
+        
+        cache_key = youtube_search_cache.make_key(enhanced_query, 'en', 'strict')
+        cached = youtube_search_cache.get(cache_key)
+        if cached is not None and not youtube_search_cache.is_negative(cached):
+            if len(cached) >= max_results or len(cached) < self.SEARCH_FETCH_COUNT:
+                videos = cached[:max_results]
+                return {
+                    'success': True,
+                    'videos': videos,
+                    'query': query,
+                    'count': len(videos),
+                    'cached': True
+                }
+        
+        if not self.quota.can_spend(SEARCH_COST_UNITS):
+            logger.warning(f"[YOUTUBE] Quota budget reached, cache-only mode (miss for: {query[:50]})")
+            return {
+                'success': False,
+                'error': 'YouTube quota budget reached for today',
+                'videos': [],
+                'quota_exhausted': True
+            }
+        
+        if cached is not None:
+            # Recent failure for this query - do not spend quota on it again yet
+            return {
+                'success': False,
+                'error': cached.get('error') or 'YouTube search recently failed',
+                'videos': [],
+                'cached': True
+            }
+        
         try:
-            # Enhance query for educational content
-            enhanced_query = f"{query} tutorial explanation"
-
             params = {
                 'part': 'snippet',
                 'q': enhanced_query,
                 'type': 'video',
-                'maxResults': max_results,
+                'maxResults': max(max_results, self.SEARCH_FETCH_COUNT),
                 'key': self.api_key,
                 'relevanceLanguage': 'en',
                 'safeSearch': 'strict',
                 'videoEmbeddable': 'true',
                 'order': 'relevance'
             }
-
-            response = requests.get(self.base_url, params=params, timeout=10)
+            
+            self.quota.spend(SEARCH_COST_UNITS)
+            started = time.perf_counter()
+            response = fetch_engine.get(self.base_url, params=params, timeout=3)
+            youtube_search_cache.record_upstream((time.perf_counter() - started) * 1000)
+            if response.status_code == 403 and 'quotaExceeded' in response.text:
+                self.quota.mark_exhausted()
             response.raise_for_status()
-
+            
             data = response.json()
-
+            
             videos = []
             if 'items' in data:
                 for item in data['items']:
                     video = self._parse_video_item(item)
                     if video:
                         videos.append(video)
-
+            
+            youtube_search_cache.set(cache_key, videos)
+            videos = videos[:max_results]
+            
             return {
                 'success': True,
                 'videos': videos,
                 'query': query,
                 'count': len(videos)
             }
-
+            
         except Exception as e:
             logger.error(f"YouTube search failed: {e}")
+            youtube_search_cache.set_negative(cache_key, e)
             return {
                 'success': False,
                 'error': str(e),
@@ -126,7 +238,8 @@ class YouTubeService:
                 'key': self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            self.quota.spend(VIDEOS_COST_UNITS)
+            response = fetch_engine.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -178,5 +291,12 @@ class YouTubeService:
         return self.search_concept_videos(enhanced_query, max_results)
 
 
+    def stats(self):
+        return {
+            'quota': self.quota.stats(),
+            'search_cache': youtube_search_cache.stats(),
+        }
+
+
 # Global instance
 youtube_service = YouTubeService()
@@ -9,7 +9,6 @@ import secrets
 from datetime import datetime, timedelta
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from django.contrib.auth.hashers import make_password, check_password
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.core.mail import send_mail
@@ -18,6 +17,8 @@ from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from .auth_middleware import authenticate_request
+from .services.login_service import login_service, LoginThrottled, HashingPoolBusy
 import logging
 
 logger = logging.getLogger(__name__)
@@ -65,6 +66,17 @@ def validate_password(password):
     return True, "Password is valid"
 
 
+def hashing_busy_response(message='Service is busy. Please retry in a few seconds.', error_code='SERVICE_BUSY'):
+    """503 with Retry-After when the password hashing pool is saturated"""
+    response = Response({
+        'success': False,
+        'error': message,
+        'error_code': error_code
+    }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Retry-After'] = '2'
+    return response
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class RegisterView(APIView):
     """
@@ -138,7 +150,7 @@ class RegisterView(APIView):
             user = User.objects.create(
                 username=username,
                 email=email,
-                password=make_password(password),
+                password=login_service.hash_password(password),
                 first_name=full_name.split(' ')[0] if full_name else '',
                 last_name=' '.join(full_name.split(' ')[1:]) if full_name and len(full_name.split(' ')) > 1 else ''
             )
@@ -169,6 +181,9 @@ class RegisterView(APIView):
                 }
             }, status=status.HTTP_201_CREATED)
 
+        except HashingPoolBusy:
+            logger.warning("Registration rejected - password hashing pool is saturated")
+            return hashing_busy_response()
         except Exception as e:
             logger.error(f"Registration error: {str(e)}")
             return Response({
@@ -205,25 +220,27 @@ class LoginView(APIView):
                     'error': 'Username/email and password are required'
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            # Determine whether this is an email or username and perform case-insensitive lookup
-            user = None
-            if '@' in username_or_email:
-                email_val = username_or_email.lower()
-                try:
-                    user = User.objects.filter(email__iexact=email_val).first()
-                    logger.debug(f"Email lookup for: {email_val} -> {user and user.username}")
-                except Exception:
-                    user = None
-            else:
-                uname = username_or_email
-                try:
-                    user = User.objects.filter(username__iexact=uname).first()
-                    logger.debug(f"Username lookup for: {uname} -> {user and user.username}")
-                except Exception:
-                    user = None
+            # Reject early if this account or IP has too many recent failures
+            client_ip = login_service.client_ip(request)
+            try:
+                login_service.check_throttle(username_or_email, client_ip)
+            except LoginThrottled as e:
+                response = Response({
+                    'success': False,
+                    'error': 'Too many failed login attempts. Please try again later.',
+                    'error_code': 'TOO_MANY_ATTEMPTS',
+                    'retry_after': e.retry_after
+                }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+                response['Retry-After'] = str(e.retry_after)
+                return response
+
+            # Case-insensitive lookup on lower(email) / lower(username) (functional indexes)
+            user = login_service.find_user(username_or_email)
+            logger.debug(f"Login lookup for: {username_or_email} -> {user and user.username}")
 
             # Invalid credentials - differentiate between user not found and wrong password
             if not user:
+                login_service.record_failure(username_or_email, client_ip)
                 logger.info(f"Login failed - no matching user for identifier: {username_or_email}")
                 return Response({
                     'success': False,
@@ -231,8 +248,15 @@ class LoginView(APIView):
                     'error_code': 'USER_NOT_FOUND'
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
-            # Use User method to check password (handles hashing)
-            if not user.check_password(password):
+            # Verify password on the bounded hashing pool
+            try:
+                password_ok = login_service.verify_password(user, password)
+            except HashingPoolBusy:
+                logger.warning("Login rejected - password hashing pool is saturated")
+                return hashing_busy_response('Login service is busy. Please retry in a few seconds.', 'LOGIN_BUSY')
+
+            if not password_ok:
+                login_service.record_failure(username_or_email, client_ip)
                 logger.info(f"Login failed - invalid password for user: {user.username}")
                 return Response({
                     'success': False,
@@ -240,15 +264,14 @@ class LoginView(APIView):
                     'error_code': 'INVALID_PASSWORD'
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
+            login_service.record_success(username_or_email)
+
             # Generate JWT token
             token = generate_jwt_token(user)
 
-            # Get user coins
+            # Get user coins (read-only - the coin ledger creates the row on first credit)
             from .models import UserCoins
-            user_coins_obj, created = UserCoins.objects.get_or_create(
-                user_id=str(user.id),
-                defaults={'total_coins': 0, 'lifetime_coins': 0}
-            )
+            coins = UserCoins.objects.filter(user_id=str(user.id)).values_list('total_coins', flat=True).first() or 0
 
             logger.info(f"User logged in: {user.username}")
 
@@ -261,7 +284,7 @@ class LoginView(APIView):
                     'email': user.email,
                     'full_name': f"{user.first_name} {user.last_name}".strip(),
                     'token': token,
-                    'coins': user_coins_obj.total_coins,
+                    'coins': coins,
                     'last_login': user.last_login.isoformat() if user.last_login else None
                 }
             }, status=status.HTTP_200_OK)
@@ -292,30 +315,24 @@ class VerifyTokenView(APIView):
                     'error': 'Invalid authorization header'
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
-            token = auth_header.split(' ')[1]
-            user_id, payload = validate_jwt_token(token)
+            # Token + user projection verified by JWTAuthenticationMiddleware (LRU-cached)
+            user = authenticate_request(request)
 
-            if not user_id:
+            if request.auth_claims is None:
                 return Response({
                     'success': False,
-                    'error': payload.get('error', 'Invalid token')
+                    'error': 'Token has expired' if request.auth_error == 'Token has expired' else 'Invalid token'
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
-            # Get user
-            try:
-                user = User.objects.get(id=user_id)
-            except User.DoesNotExist:
+            if user is None:
                 return Response({
                     'success': False,
                     'error': 'User not found'
                 }, status=status.HTTP_404_NOT_FOUND)
 
-            # Get user coins
+            # Get user coins (read-only)
             from .models import UserCoins
-            user_coins_obj, created = UserCoins.objects.get_or_create(
-                user_id=str(user.id),
-                defaults={'total_coins': 0, 'lifetime_coins': 0}
-            )
+            coins = UserCoins.objects.filter(user_id=str(user.id)).values_list('total_coins', flat=True).first() or 0
 
             return Response({
                 'success': True,
@@ -324,7 +341,7 @@ class VerifyTokenView(APIView):
                     'username': user.username,
                     'email': user.email,
                     'full_name': f"{user.first_name} {user.last_name}".strip(),
-                    'coins': user_coins_obj.total_coins,
+                    'coins': coins,
                     'is_active': user.is_active,
                     'date_joined': user.date_joined.isoformat()
                 }
@@ -371,8 +388,21 @@ class ChangePasswordView(APIView):
                     'error': 'User not found with this email'
                 }, status=status.HTTP_404_NOT_FOUND)
 
-            # Verify old password
-            if not check_password(old_password, user.password):
+            # Verify old password (throttled like login - this endpoint also checks credentials)
+            client_ip = login_service.client_ip(request)
+            try:
+                login_service.check_throttle(email, client_ip)
+            except LoginThrottled as e:
+                response = Response({
+                    'success': False,
+                    'error': 'Too many failed attempts. Please try again later.',
+                    'retry_after': e.retry_after
+                }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+                response['Retry-After'] = str(e.retry_after)
+                return response
+
+            if not login_service.verify_password(user, old_password):
+                login_service.record_failure(email, client_ip)
                 return Response({
                     'success': False,
                     'error': 'Incorrect old password'
@@ -387,7 +417,7 @@ class ChangePasswordView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
 
             # Update password
-            user.password = make_password(new_password)
+            user.password = login_service.hash_password(new_password)
             user.save()
 
             logger.info(f"Password changed for user: {user.username}")
@@ -397,6 +427,9 @@ class ChangePasswordView(APIView):
                 'message': 'Password changed successfully'
             }, status=status.HTTP_200_OK)
 
+        except HashingPoolBusy:
+            logger.warning("Password change rejected - password hashing pool is saturated")
+            return hashing_busy_response()
         except Exception as e:
             logger.error(f"Password change error: {str(e)}")
             return Response({
@@ -595,7 +628,7 @@ class ResetPasswordView(APIView):
 
             # Update password
             user = reset_obj.user
-            user.password = make_password(new_password)
+            user.password = login_service.hash_password(new_password)
             user.save()
 
             # Mark token as used
@@ -610,6 +643,9 @@ class ResetPasswordView(APIView):
                 'message': 'Password reset successfully. You can now login with your new password.'
             }, status=status.HTTP_200_OK)
 
+        except HashingPoolBusy:
+            logger.warning("Password reset rejected - password hashing pool is saturated")
+            return hashing_busy_response()
         except Exception as e:
             logger.error(f"Password reset error: {str(e)}")
             return Response({
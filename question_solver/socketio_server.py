@@ -126,7 +126,7 @@ async def connect(sid, environ):
         await sio.emit('connected', {
             'sid': sid,
             'server_time': now,
-            'features': ['pair_quiz', 'realtime_sync', 'heartbeat']
+            'features': ['pair_quiz', 'realtime_sync', 'heartbeat', 'job_progress']
         }, room=sid)
 
         # Start heartbeat monitoring for this connection
@@ -536,6 +536,88 @@ async def get_metrics(sid, data):
         logger.error(f"❌ Error getting metrics: {str(e)}")
 
 
+# Background job progress (generation jobs and quiz batches). Jobs run in
+# separate worker processes, so progress is read from the job row: one
+# watcher task per subscribed job polls it and pushes changes to the job's room
+JOB_PROGRESS_POLL_SECONDS = getattr(settings, 'JOB_PROGRESS_POLL_SECONDS', 1.0)
+JOB_PROGRESS_MAX_WATCH_SECONDS = 30 * 60
+job_watchers = {}  # {job_id: asyncio.Task}
+
+
+def job_room(job_id):
+    return f"job:{job_id}"
+
+
+@sio.event
+async def subscribe_job(sid, data):
+    """Receive job_progress / job_complete events for a job"""
+    try:
+        job_id = str((data or {}).get('jobId') or (data or {}).get('job_id') or '')
+        if not job_id:
+            await sio.emit('error', {'message': 'Job ID required'}, room=sid)
+            return
+
+        snapshot = await get_job_snapshot(job_id)
+        if snapshot is None:
+            await sio.emit('error', {'message': 'Job not found', 'jobId': job_id}, room=sid)
+            return
+
+        await sio.enter_room(sid, job_room(job_id))
+        await sio.emit('job_progress', snapshot, room=sid)
+        if snapshot['finished']:
+            await sio.emit('job_complete', snapshot, room=sid)
+        elif job_id not in job_watchers:
+            job_watchers[job_id] = asyncio.create_task(watch_job(job_id, snapshot))
+
+    except Exception as e:
+        logger.error(f"❌ Error subscribing to job: {str(e)}")
+        await sio.emit('error', {'message': str(e)}, room=sid)
+
+
+@sio.event
+async def unsubscribe_job(sid, data):
+    """Stop receiving events for a job"""
+    job_id = str((data or {}).get('jobId') or (data or {}).get('job_id') or '')
+    if job_id:
+        await sio.leave_room(sid, job_room(job_id))
+
+
+def _progress_key(snapshot):
+    return (
+        snapshot['status'],
+        snapshot['progress'],
+        snapshot.get('progress_message'),
+        snapshot.get('completed_items'),
+        snapshot.get('failed_items'),
+    )
+
+
+async def watch_job(job_id, snapshot):
+    """Push a job's progress to its room until it finishes or nobody listens"""
+    room = job_room(job_id)
+    last = _progress_key(snapshot)
+    deadline = time.time() + JOB_PROGRESS_MAX_WATCH_SECONDS
+    try:
+        while time.time() < deadline:
+            await asyncio.sleep(JOB_PROGRESS_POLL_SECONDS)
+            if not any(True for _ in sio.manager.get_participants('/', room)):
+                break
+
+            snapshot = await get_job_snapshot(job_id)
+            if snapshot is None:
+                break
+            if _progress_key(snapshot) != last:
+                last = _progress_key(snapshot)
+                await sio.emit('job_progress', snapshot, room=room)
+            if snapshot['finished']:
+                await sio.emit('job_complete', snapshot, room=room)
+                break
+    except Exception as e:
+        logger.error(f"❌ Job watcher error for {job_id}: {str(e)}")
+    finally:
+        job_watchers.pop(job_id, None)
+
+
 async def monitor_connection_health(sid):
     """Monitor connection health and handle timeouts"""
     try:
@@ -894,3 +976,24 @@ async def cancel_session_db(session_id, reason):
         session.save()
     
     await _cancel()
+
+
+async def get_job_snapshot(job_id):
+    """Status of a generation job or quiz batch, or None if neither exists"""
+    from asgiref.sync import sync_to_async
+    from .services.job_queue import job_queue
+    from .services.quiz_batch_service import quiz_batch_service
+    
+    @sync_to_async
+    def _snapshot():
+        job = job_queue.get(job_id)
+        if job is None:
+            return quiz_batch_service.job_status(job_id)
+        snapshot = job_queue.job_status(job)
+        if job.is_finished:
+            # Push the result with the final event so clients need no extra fetch
+            snapshot['result'] = job.result
+            snapshot['result_status'] = job.result_status
+        return snapshot
+    
+    return await _snapshot()
@@ -1,3 +1,111 @@
+from django.db import connection
 from django.test import TestCase
+from unittest import skipUnless
 
-# Create your tests here.
+from .models import CoinTransaction, UserCoins
+from .services.cache_service import normalize_query
+from .services.coin_ledger_service import coin_ledger, CoinLedgerService
+
+
+class CoinLedgerTests(TestCase):
+    """Balance updates through the portable ORM path (or the CTE path on PostgreSQL)"""
+
+    def balance(self, user_id):
+        return UserCoins.objects.get(user_id=user_id)
+
+    def test_credit_creates_and_increments_balance(self):
+        self.assertEqual(coin_ledger.credit('alice', 10, reason='quiz'), 10)
+        self.assertEqual(coin_ledger.credit('alice', 5, reason='quiz'), 15)
+
+        coins = self.balance('alice')
+        self.assertEqual(coins.total_coins, 15)
+        self.assertEqual(coins.lifetime_coins, 15)
+        self.assertEqual(
+            sorted(coins.transactions.values_list('amount', 'transaction_type')),
+            [(5, 'earn'), (10, 'earn')]
+        )
+
+    def test_debit_spends_coins(self):
+        coin_ledger.credit('bob', 20)
+        self.assertEqual(coin_ledger.debit('bob', 8, reason='unlock'), 12)
+
+        coins = self.balance('bob')
+        self.assertEqual(coins.total_coins, 12)
+        self.assertEqual(coins.coins_spent, 8)
+        self.assertEqual(coins.lifetime_coins, 20)
+        self.assertTrue(coins.transactions.filter(amount=8, transaction_type='spend').exists())
+
+    def test_debit_with_insufficient_funds_returns_none(self):
+        coin_ledger.credit('carol', 5)
+        self.assertIsNone(coin_ledger.debit('carol', 6))
+
+        coins = self.balance('carol')
+        self.assertEqual(coins.total_coins, 5)
+        self.assertEqual(coins.coins_spent, 0)
+        self.assertFalse(coins.transactions.filter(transaction_type='spend').exists())
+
+    def test_debit_unknown_user_returns_none(self):
+        self.assertIsNone(coin_ledger.debit('nobody', 1))
+        self.assertFalse(UserCoins.objects.filter(user_id='nobody').exists())
+
+    def test_negative_amounts_are_rejected(self):
+        with self.assertRaises(ValueError):
+            coin_ledger.credit('dave', -1)
+        with self.assertRaises(ValueError):
+            coin_ledger.debit('dave', -1)
+
+    def test_bulk_award_sums_repeated_users(self):
+        coin_ledger.credit('erin', 3)
+        credited = coin_ledger.bulk_award([
+            ('erin', 10, 'rank 1'),
+            ('frank', 7, 'rank 2'),
+            ('erin', 5, 'streak'),
+        ])
+
+        self.assertEqual(credited, 2)
+        self.assertEqual(self.balance('erin').total_coins, 18)
+        self.assertEqual(self.balance('erin').lifetime_coins, 18)
+        self.assertEqual(self.balance('frank').total_coins, 7)
+        # One transaction per entry, not per user
+        self.assertEqual(
+            sorted(CoinTransaction.objects.filter(transaction_type='bonus').values_list('user_coins__user_id', 'amount')),
+            [('erin', 5), ('erin', 10), ('frank', 7)]
+        )
+
+    def test_bulk_award_empty(self):
+        self.assertEqual(coin_ledger.bulk_award([]), 0)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'CTE ledger statements are PostgreSQL only')
+class CoinLedgerCteTests(TestCase):
+    """The single-statement PostgreSQL paths, called directly"""
+
+    def test_credit_cte_upserts_balance_and_transaction(self):
+        self.assertEqual(CoinLedgerService._credit_cte('gina', 10, 'quiz', 'earn'), 10)
+        self.assertEqual(CoinLedgerService._credit_cte('gina', 4, 'quiz', 'earn'), 14)
+
+        coins = UserCoins.objects.get(user_id='gina')
+        self.assertEqual((coins.total_coins, coins.lifetime_coins), (14, 14))
+        self.assertEqual(coins.transactions.count(), 2)
+
+    def test_debit_cte(self):
+        CoinLedgerService._credit_cte('hank', 10, '', 'earn')
+        self.assertEqual(CoinLedgerService._debit_cte('hank', 4, 'unlock', 'spend'), 6)
+        self.assertIsNone(CoinLedgerService._debit_cte('hank', 7, 'unlock', 'spend'))
+
+        coins = UserCoins.objects.get(user_id='hank')
+        self.assertEqual((coins.total_coins, coins.coins_spent), (6, 4))
+        self.assertEqual(coins.transactions.filter(transaction_type='spend').count(), 1)
+
+
+class NormalizeQueryTests(TestCase):
+    def test_folds_case_whitespace_and_sentence_punctuation(self):
+        self.assertEqual(normalize_query("What is  Newton\u2019s 2nd law?"), "what is newton's 2nd law")
+        self.assertEqual(normalize_query('Hello, world!!'), 'hello world')
+
+    def test_keeps_punctuation_inside_tokens(self):
+        for left, right in [('C# basics', 'C basics'), ('2*3', '2 3'), ('50%', '50'), ('2x-3', '2x 3'), ('3.5', '3 5')]:
+            self.assertNotEqual(normalize_query(left), normalize_query(right))
+
+    def test_keeps_devanagari(self):
+        self.assertEqual(normalize_query('\u092d\u093e\u0930\u0924 \u0915\u0940 \u0930\u093e\u091c\u0927\u093e\u0928\u0940?'), '\u092d\u093e\u0930\u0924 \u0915\u0940 \u0930\u093e\u091c\u0927\u093e\u0928\u0940')
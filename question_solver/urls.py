@@ -11,11 +11,14 @@ from .views import (
     FlashcardGeneratorView,
     StudyMaterialGeneratorView,
     QuizGenerateView,
+    QuizBatchGenerateView,
+    QuizBatchStatusView,
     QuizSubmitView,
     QuizResultsView,
     QuizDetailView,
     PredictedQuestionsView
 )
+from .job_views import JobStatusView, JobResultView
 from .subscription_views import (
     SubscriptionStatusView,
     LogFeatureUsageView
@@ -70,6 +73,10 @@ from .daily_quiz_views import (
     get_daily_quiz_attempt_detail,
     get_quiz_settings,
 )
+from .leaderboard_views import (
+    get_leaderboard,
+    get_leaderboard_rank,
+)
 from .pair_quiz_views import (
     CreatePairQuizView,
     JoinPairQuizView,
@@ -114,9 +121,15 @@ urlpatterns = [
     path('health/', HealthCheckView.as_view(), name='health-check'),
     path('status/', ServiceStatusView.as_view(), name='service-status'),
     
+    # Background generation jobs (generation endpoints with async=true)
+    path('jobs/<str:job_id>/', JobStatusView.as_view(), name='job-status'),
+    path('jobs/<str:job_id>/result/', JobResultView.as_view(), name='job-result'),
+    
     # ✅ SPECIFIC QUIZ PATHS (MUST BE BEFORE GENERIC <str:quiz_id> PATTERNS)
     path('quiz/generate/', QuizGeneratorView.as_view(), name='generate-quiz'),
     path('quiz/create/', QuizGenerateView.as_view(), name='create-quiz'),
+    path('quiz/batch/', QuizBatchGenerateView.as_view(), name='batch-quiz'),
+    path('quiz/batch/<str:job_id>/', QuizBatchStatusView.as_view(), name='batch-quiz-status'),
     path('quiz/settings/', get_quiz_settings, name='quiz-settings'),
     
     # Daily Quiz endpoints (MUST BE BEFORE generic quiz/<str:quiz_id>/ pattern)
@@ -127,6 +140,10 @@ urlpatterns = [
     path('quiz/daily-quiz/history/', get_quiz_history, name='quiz-history'),
     path('quiz/daily-quiz/attempt/detail/', get_daily_quiz_attempt_detail, name='daily-quiz-attempt-detail'),
     
+    # Leaderboards (coins / daily quiz scores, daily / weekly / all-time)
+    path('leaderboard/', get_leaderboard, name='leaderboard'),
+    path('leaderboard/rank/', get_leaderboard_rank, name='leaderboard-rank'),
+    
     # ✅ GENERIC QUIZ PATTERNS (AFTER SPECIFIC ONES)
     path('quiz/<str:quiz_id>/', QuizDetailView.as_view(), name='quiz-detail'),
     path('quiz/<str:quiz_id>/submit/', QuizSubmitView.as_view(), name='submit-quiz'),
@@ -23,9 +23,21 @@ from .services import (
 )
 from .services.gemini_service import gemini_service
 from .services.quiz_service import quiz_service
+from .services.login_service import login_service
+from .services.cache_service import search_cache
+from .services.fetch_engine import fetch_engine
+from .services.document_ingestion import document_ingestion, detect_document_type, HEAD_BYTES
+from .services.quiz_batch_service import quiz_batch_service
+from .services.job_queue import job_queue
+from .services.quiz_persistence import save_generated_quiz, question_payload, score_submission
+from .services.quiz_feedback_service import quiz_feedback_service
+from .services.dedup_service import question_dedup
+from .services.question_bank import question_bank
 from .models import Quiz, QuizQuestion, UserQuizResponse, QuizSummary
 from .decorators import check_feature_access_class_based
+from .job_views import wants_async, queue_generation
 from django.utils import timezone
+from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
@@ -338,14 +350,28 @@ class ServiceStatusView(APIView):
             },
             'search': {
                 'searchapi': bool(settings.SEARCHAPI_KEY),
-                'serpapi': bool(settings.SERP_API_KEY)
+                'serpapi': bool(settings.SERP_API_KEY),
+                'cache': search_cache.stats()
             },
             'youtube': {
-                'available': bool(settings.YOUTUBE_API_KEY)
+                'available': bool(settings.YOUTUBE_API_KEY),
+                **youtube_service.stats()
             },
             'firecrawl': {
                 'available': bool(settings.FIRECRAWL_API_KEY)
-            }
+            },
+            'scraper': {
+                'page_cache': web_scraper.page_cache.stats()
+            },
+            'fetch_engine': fetch_engine.stats(),
+            'translation': text_processor.translation_stats(),
+            'document_ingestion': document_ingestion.stats(),
+            'quiz_batch': quiz_batch_service.stats(),
+            'job_queue': job_queue.stats(),
+            'quiz_feedback': quiz_feedback_service.stats(),
+            'question_dedup': question_dedup.stats(),
+            'question_bank': question_bank.stats(),
+            'login': login_service.stats()
         }
         
         return Response(status_data)
@@ -394,49 +420,14 @@ class QuizGeneratorView(APIView):
                 logger.info(f"[QUIZ_GENERATION] Document name: {document_file.name}")
                 logger.info(f"[QUIZ_GENERATION] Document size: {document_file.size} bytes")
                 
-                # Save temporarily
-                file_name = default_storage.save(f'temp/{document_file.name}', 
-                                                ContentFile(document_file.read()))
-                file_path = default_storage.path(file_name)
-                logger.info(f"[QUIZ_GENERATION] Document saved to: {file_path}")
-                
-                try:
-                    # Extract text from document (using Tesseract OCR for images, or read text files)
-                    if document_file.name.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.gif', '.webp')):
-                        # Use Tesseract OCR for fast local text extraction
-                        ocr_result = ocr_service.extract_text_from_image(file_path)
-                        if ocr_result['success']:
-                            topic = ocr_result['text']
-                        else:
-                            return Response({
-                                'error': 'Failed to extract text from document',
-                                'details': ocr_result.get('error', 'Unknown error')
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    elif document_file.name.lower().endswith('.txt'):
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            topic = f.read()
-                    elif document_file.name.lower().endswith('.pdf'):
-                        # Extract text from PDF
-                        try:
-                            import PyPDF2
-                            with open(file_path, 'rb') as f:
-                                pdf_reader = PyPDF2.PdfReader(f)
-                                topic = ""
-                                for page in pdf_reader.pages:
-                                    topic += page.extract_text() + "\n"
-                        except ImportError:
-                            return Response({
-                                'error': 'PDF support requires PyPDF2. Please install it.',
-                                'details': 'pip install PyPDF2'
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    else:
-                        return Response({
-                            'error': 'Unsupported file format. Please use .txt, .pdf, .png, .jpg, or .jpeg'
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                finally:
-                    # Clean up temp file
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
+                ingested = document_ingestion.ingest(document_file, max_chars=gemini_service.QUIZ_CONTENT_BUDGET)
+                if not ingested['success']:
+                    return Response({
+                        'error': ingested['error'],
+                        'details': ingested.get('details', '')
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                topic = ingested['text']
+                logger.info(f"[QUIZ_GENERATION] Extracted {len(topic)} chars from {ingested['kind']} document")
             
             if not topic or not topic.strip():
                 logger.error("[QUIZ_GENERATION] ❌ No topic provided")
@@ -500,6 +491,10 @@ class FlashcardGeneratorView(APIView):
     """
     parser_classes = [MultiPartParser, FormParser, JSONParser]
     
+    # When set, requests for this many cards are queued as a job unless the
+    # client sends async=false; 0 keeps async strictly opt-in
+    ASYNC_MIN_CARDS = getattr(settings, 'FLASHCARD_ASYNC_MIN_CARDS', 0)
+    
     def post(self, request):
         """
         Generate flashcards based on topic or document
@@ -509,6 +504,7 @@ class FlashcardGeneratorView(APIView):
         - num_cards: Number of flashcards (default: 10, max: 50)
         - language: 'english' or 'hindi' (default: 'english')
         - document: Optional document file upload (.txt, .pdf, .jpg, .png)
+        - async: queue a job and return its id (default: off, or on for ASYNC_MIN_CARDS+ cards when set)
         """
         try:
             # Get and validate parameters
@@ -531,92 +527,27 @@ class FlashcardGeneratorView(APIView):
             # Handle document upload
             if 'document' in request.FILES:
                 logger.info("[FLASHCARD] Processing document for flashcards")
-                try:
-                    document_file = request.FILES['document']
-                    file_name = default_storage.save(f'temp/{document_file.name}', 
-                                                    ContentFile(document_file.read()))
-                    file_path = default_storage.path(file_name)
-                    
-                    # Extract text from document (using Tesseract OCR for images, or read text files)
-                    if document_file.name.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.gif', '.webp')):
-                        logger.info(f"[FLASHCARD] Processing image file: {document_file.name}")
-                        ocr_result = ocr_service.extract_text_from_image(file_path)
-                        if ocr_result.get('success') and ocr_result.get('text', '').strip():
-                            topic = ocr_result.get('text', '').strip()
-                            logger.info(f"[FLASHCARD] Text extraction successful: extracted {len(topic)} characters")
-                        else:
-                            logger.warning(f"[FLASHCARD] Text extraction failed for {document_file.name}: {ocr_result.get('error', 'Unknown error')}")
-                            return Response({
-                                'success': False,
-                                'error': 'Failed to extract text from image',
-                                'message': 'Please ensure the image contains clear, readable text and try again',
-                                'supported_formats': ['.png', '.jpg', '.jpeg', '.gif'],
-                                'details': ocr_result.get('error', 'Text extraction failed')
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    elif document_file.name.lower().endswith('.txt'):
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            topic = f.read()
-                        logger.info(f"[FLASHCARD] Extracted {len(topic)} chars from text file")
-                    elif document_file.name.lower().endswith('.md'):
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            topic = f.read()
-                        logger.info(f"[FLASHCARD] Extracted {len(topic)} chars from markdown file")
-                    elif document_file.name.lower().endswith('.pdf'):
-                        # Extract text from PDF
-                        try:
-                            import PyPDF2
-                            with open(file_path, 'rb') as f:
-                                pdf_reader = PyPDF2.PdfReader(f)
-                                topic = ""
-                                for page in pdf_reader.pages:
-                                    topic += page.extract_text() + "\n"
-                            logger.info(f"[FLASHCARD] Extracted {len(topic)} chars from PDF")
-                        except ImportError:
-                            logger.error("[FLASHCARD] PyPDF2 not installed")
-                            return Response({
-                                'success': False,
-                                'error': 'PDF support requires PyPDF2',
-                                'details': 'Install with: pip install PyPDF2'
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                        except Exception as pdf_error:
-                            logger.error(f"[FLASHCARD] PDF extraction error: {pdf_error}")
-                            return Response({
-                                'success': False,
-                                'error': 'Failed to extract text from PDF',
-                                'message': 'Please ensure the PDF contains readable text',
-                                'details': str(pdf_error)
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    else:
-                        logger.warning(f"[FLASHCARD] Unsupported file format: {document_file.name}")
-                        return Response({
-                            'success': False,
-                            'error': f'Unsupported document type: {document_file.name}',
-                            'supported_formats': ['.txt', '.md', '.pdf', '.jpg', '.jpeg', '.png', '.gif']
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    if not topic or not topic.strip():
-                        logger.warning("[FLASHCARD] Document extracted but is empty")
-                        return Response({
-                            'success': False,
-                            'error': 'Could not extract text from document',
-                            'message': 'Please ensure the document contains readable text'
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                except Exception as file_error:
-                    logger.error(f"[FLASHCARD] File processing error: {file_error}", exc_info=True)
+                document_file = request.FILES['document']
+                ingested = document_ingestion.ingest(document_file, max_chars=gemini_service.FLASHCARD_CONTENT_BUDGET)
+                if not ingested['success']:
+                    logger.warning(f"[FLASHCARD] Text extraction failed for {document_file.name}: {ingested['error']}")
                     return Response({
                         'success': False,
-                        'error': 'Failed to process document',
-                        'details': str(file_error)
+                        'error': ingested['error'],
+                        'message': 'Please ensure the document contains clear, readable text and try again',
+                        'supported_formats': ingested['supported_formats'],
+                        'details': ingested.get('details', '')
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                
+                topic = ingested['text']
+                logger.info(f"[FLASHCARD] Extracted {len(topic)} chars from {ingested['kind']} document")
+                if not topic.strip():
+                    logger.warning("[FLASHCARD] Document extracted but is empty")
+                    return Response({
+                        'success': False,
+                        'error': 'Could not extract text from document',
+                        'message': 'Please ensure the document contains readable text'
                     }, status=status.HTTP_400_BAD_REQUEST)
-                finally:
-                    # Clean up temp file
-                    try:
-                        if os.path.exists(file_path):
-                            os.remove(file_path)
-                        default_storage.delete(file_name)
-                    except Exception as cleanup_error:
-                        logger.warning(f"[FLASHCARD] Cleanup error: {cleanup_error}")
             
             elif not topic:
                 logger.warning("[FLASHCARD] Missing topic and no document provided")
@@ -628,6 +559,25 @@ class FlashcardGeneratorView(APIView):
                     'supported_formats': ['.txt', '.md', '.pdf', '.jpg', '.jpeg', '.png', '.gif']
                 }, status=status.HTTP_400_BAD_REQUEST)
             
+            if wants_async(request, default=0 < self.ASYNC_MIN_CARDS <= num_cards):
+                return queue_generation(request, 'flashcards', {
+                    'topic': topic,
+                    'num_cards': num_cards,
+                    'language': language
+                })
+            
+            return self.generate(topic, num_cards, language)
+                
+        except Exception as e:
+            logger.error(f"Flashcard generation error: {e}", exc_info=True)
+            return Response({
+                'error': 'Internal server error',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def generate(self, topic, num_cards, language):
+        """Generate flashcards from validated input (also run by job workers)"""
+        try:
             # Generate flashcards using Gemini with language support
             logger.info(f"[FLASHCARD] Generating {num_cards} flashcards in {language}")
             
@@ -675,7 +625,8 @@ class FlashcardGeneratorView(APIView):
                 }, status=status.HTTP_200_OK)
             else:
                 if result.get('error') == 'quota_exceeded':
-                    retry_seconds = result.get('retry_after_seconds', 60)
+                    # The key may be present with a None value
+                    retry_seconds = result.get('retry_after_seconds') or 60
                     headers = {'Retry-After': str(retry_seconds)}
                     return Response({
                         'success': False,
@@ -711,6 +662,7 @@ class StudyMaterialGeneratorView(APIView):
         Request body:
         - text: Direct text content
         - document: Document file upload (.txt, .pdf, .jpg, .png)
+        - async: queue a job and return its id instead of waiting
         
         Returns topics, concepts, study notes, and sample questions
         """
@@ -719,61 +671,37 @@ class StudyMaterialGeneratorView(APIView):
             
             # Handle document upload
             if 'document' in request.FILES:
-                document_file = request.FILES['document']
-                file_name = default_storage.save(f'temp/{document_file.name}', 
-                                                ContentFile(document_file.read()))
-                file_path = default_storage.path(file_name)
-                
-                try:
-                    # Extract text from document
-                    if document_file.name.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-                        # Use OCR for images
-                        ocr_result = ocr_service.extract_text_from_image(file_path)
-                        if ocr_result['success']:
-                            text_content = ocr_result['text']
-                        else:
-                            return Response({
-                                'error': 'Failed to extract text from image',
-                                'details': ocr_result.get('error', 'Unknown error')
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    elif document_file.name.lower().endswith('.txt'):
-                        # Read text file
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            text_content = f.read()
-                    elif document_file.name.lower().endswith('.pdf'):
-                        # For PDF, try to read as text (basic support)
-                        try:
-                            import PyPDF2
-                            with open(file_path, 'rb') as f:
-                                pdf_reader = PyPDF2.PdfReader(f)
-                                text_content = ""
-                                for page in pdf_reader.pages:
-                                    text_content += page.extract_text() + "\n"
-                        except ImportError:
-                            # If PyPDF2 not available, use OCR on each page
-                            ocr_result = ocr_service.extract_text_from_image(file_path)
-                            if ocr_result['success']:
-                                text_content = ocr_result['text']
-                            else:
-                                return Response({
-                                    'error': 'PDF support requires PyPDF2. Please install it or upload as image.',
-                                    'details': 'pip install PyPDF2'
-                                }, status=status.HTTP_400_BAD_REQUEST)
-                    else:
-                        return Response({
-                            'error': 'Unsupported file format',
-                            'details': 'Please use .txt, .pdf, .png, .jpg, or .jpeg'
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                finally:
-                    # Clean up temp file
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
+                ingested = document_ingestion.ingest(
+                    request.FILES['document'],
+                    max_chars=gemini_service.STUDY_MATERIAL_CONTENT_BUDGET
+                )
+                if not ingested['success']:
+                    return Response({
+                        'error': ingested['error'],
+                        'details': ingested.get('details', '')
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                text_content = ingested['text']
             
             if not text_content or not text_content.strip():
                 return Response({
                     'error': 'Please provide text content or upload a document'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
+            if wants_async(request):
+                return queue_generation(request, 'study_material', {'text_content': text_content})
+            
+            return self.generate(text_content)
+                
+        except Exception as e:
+            logger.error(f"Study material generation error: {e}", exc_info=True)
+            return Response({
+                'error': 'Internal server error',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def generate(self, text_content):
+        """Generate study material from extracted text (also run by job workers)"""
+        try:
             # Generate study material using Gemini
             logger.info("Generating comprehensive study material")
             result = gemini_service.generate_study_material(text_content)
@@ -819,7 +747,8 @@ class QuizGenerateView(APIView):
             "source_type": "youtube|text|image",
             "source_id": "video_id or content_id",
             "num_questions": 5-15,
-            "difficulty": "beginner|intermediate|advanced"
+            "difficulty": "beginner|intermediate|advanced",
+            "user_id": "optional; questions from the user's recent quizzes are not repeated"
         }
         """
         try:
@@ -845,7 +774,8 @@ class QuizGenerateView(APIView):
                 transcript=transcript,
                 title=title,
                 num_questions=num_questions,
-                difficulty=difficulty
+                difficulty=difficulty,
+                user_id=request.data.get('user_id', '')
             )
             
             if 'error' in quiz_data:
@@ -853,33 +783,15 @@ class QuizGenerateView(APIView):
             
             # Save to database
             try:
-                quiz = Quiz.objects.create(
-                    title=quiz_data.get('title', title),
-                    description=quiz_data.get('summary', ''),
+                quiz, questions = save_generated_quiz(
+                    quiz_data,
+                    title=title,
                     source_type=source_type,
                     source_id=source_id,
-                    summary=quiz_data.get('summary', ''),
-                    difficulty_level=quiz_data.get('difficulty_level', difficulty),
-                    total_questions=len(quiz_data.get('questions', [])),
-                    estimated_time=quiz_data.get('estimated_time_minutes', num_questions),
-                    keywords=quiz_data.get('keywords', [])
+                    num_questions=num_questions,
+                    difficulty=difficulty
                 )
                 
-                # Create questions
-                for question_data in quiz_data.get('questions', []):
-                    QuizQuestion.objects.create(
-                        quiz=quiz,
-                        question_text=question_data.get('question', ''),
-                        question_type=question_data.get('type', 'mcq'),
-                        order=question_data.get('id', 1),
-                        options=question_data.get('options', []),
-                        correct_answer=question_data.get('correct_answer', ''),
-                        explanation=question_data.get('explanation', ''),
-                        hint=question_data.get('hint', ''),
-                        difficulty=question_data.get('difficulty', difficulty),
-                        tags=question_data.get('tags', [])
-                    )
-                
                 logger.info(f"Quiz saved with ID: {quiz.id}")
                 
                 # Return quiz data
@@ -891,17 +803,7 @@ class QuizGenerateView(APIView):
                     'difficulty': quiz.difficulty_level,
                     'estimated_time': quiz.estimated_time,
                     'keywords': quiz.keywords,
-                    'questions': [
-                        {
-                            'id': str(q.id),
-                            'type': q.question_type,
-                            'question': q.question_text,
-                            'options': q.options,
-                            'hint': q.hint,
-                            'difficulty': q.difficulty
-                        }
-                        for q in quiz.questions.all()
-                    ]
+                    'questions': [question_payload(q) for q in questions]
                 }, status=status.HTTP_201_CREATED)
                 
             except Exception as e:
@@ -919,6 +821,139 @@ class QuizGenerateView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class QuizBatchGenerateView(APIView):
+    """
+    Generate quizzes for many topics/documents in the background
+    POST /api/quiz/batch/
+    """
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    
+    def _topic_entries(self, request):
+        """Topics as a JSON list, a JSON-encoded string or repeated form fields"""
+        if hasattr(request.data, 'getlist'):
+            topics = request.data.getlist('topics')
+            if len(topics) == 1 and topics[0].strip().startswith('['):
+                topics = json.loads(topics[0])
+        else:
+            topics = request.data.get('topics') or []
+        if not isinstance(topics, list):
+            raise ValueError('topics must be a list')
+        
+        entries = []
+        for topic in topics:
+            if isinstance(topic, dict):
+                content = str(topic.get('content') or topic.get('topic') or '').strip()
+                title = str(topic.get('title') or topic.get('topic') or '').strip()
+            else:
+                content = title = str(topic).strip()
+            if not content:
+                continue
+            entries.append({
+                'title': title[:255] or content[:255],
+                'content': content,
+                'source_type': 'text',
+                'source_id': title[:255],
+            })
+        return entries
+    
+    def post(self, request):
+        """
+        Queue a batch of quizzes
+        
+        Request body:
+        {
+            "topics": ["Chapter 1 text or topic", {"title": "...", "content": "..."}],
+            "documents": [file, ...],   (multipart, same formats as other uploads;
+                                        at most QUIZ_BATCH_MAX_DOCUMENT_BYTES each, else 413)
+            "num_questions": 5-15,
+            "difficulty": "beginner|intermediate|advanced",
+            "user_id": "optional owner"
+        }
+        
+        Returns 202 with job_id; poll GET /api/quiz/batch/{job_id}/ for progress
+        """
+        try:
+            try:
+                entries = self._topic_entries(request)
+            except ValueError as e:
+                return Response({
+                    'error': 'Invalid topics',
+                    'details': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            documents = request.FILES.getlist('documents')
+            if len(entries) + len(documents) > quiz_batch_service.max_items:
+                return Response({
+                    'error': f'Too many items. Maximum {quiz_batch_service.max_items} topics and documents per batch.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Only the size and type are checked here; text extraction / OCR
+            # runs in each item's job
+            for document in documents:
+                if document.size > quiz_batch_service.max_document_bytes:
+                    return Response({
+                        'error': f'Document too large: {document.name}',
+                        'details': f'Each document may be at most {quiz_batch_service.max_document_bytes} bytes',
+                        'document': document.name
+                    }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+                kind, _ = detect_document_type(document.read(HEAD_BYTES))
+                document.seek(0)
+                if kind is None:
+                    return Response({
+                        'error': f'Unsupported document type: {document.name}',
+                        'details': 'Upload a PDF, an image or a plain-text file',
+                        'document': document.name
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                entries.append({
+                    'title': os.path.splitext(document.name)[0][:255],
+                    'document': document,
+                    'source_type': 'text',
+                    'source_id': document.name[:255],
+                })
+            
+            if not entries:
+                return Response({
+                    'error': 'Please provide topics or upload documents'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            job = quiz_batch_service.submit(
+                entries,
+                num_questions=int(request.data.get('num_questions', 5)),
+                difficulty=request.data.get('difficulty', 'intermediate'),
+                user_id=request.data.get('user_id', '')
+            )
+            
+            return Response({
+                'job_id': str(job.id),
+                'status': job.status,
+                'total_items': job.total_items,
+                'unique_items': job.unique_items,
+                'status_url': f'/api/quiz/batch/{job.id}/'
+            }, status=status.HTTP_202_ACCEPTED)
+            
+        except Exception as e:
+            logger.error(f"Batch quiz generation error: {e}", exc_info=True)
+            return Response({
+                'error': 'Failed to queue quiz batch',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class QuizBatchStatusView(APIView):
+    """
+    Progress and quiz ids of a batch
+    GET /api/quiz/batch/{job_id}/
+    """
+    
+    def get(self, request, job_id):
+        job_status = quiz_batch_service.job_status(job_id)
+        if job_status is None:
+            return Response({
+                'error': 'Batch not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        return Response(job_status)
+
+
 class QuizSubmitView(APIView):
     """
     Submit quiz responses and get scoring
@@ -948,60 +983,31 @@ class QuizSubmitView(APIView):
                     'error': 'No responses provided'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Get quiz
-            try:
-                quiz = Quiz.objects.get(id=quiz_id)
-            except Quiz.DoesNotExist:
-                return Response({
-                    'error': 'Quiz not found'
-                }, status=status.HTTP_404_NOT_FOUND)
+            # Questions and their quiz in one query; the quiz on its own
+            # only when it has no questions
+            questions = list(QuizQuestion.objects.select_related('quiz').filter(quiz_id=quiz_id))
+            if questions:
+                quiz = questions[0].quiz
+            else:
+                try:
+                    quiz = Quiz.objects.get(id=quiz_id)
+                except Quiz.DoesNotExist:
+                    return Response({
+                        'error': 'Quiz not found'
+                    }, status=status.HTTP_404_NOT_FOUND)
             
             logger.info(f"Processing quiz submission for quiz: {quiz.title}")
             
             # Score responses
-            questions = quiz.questions.all()
-            scored_responses = {}
-            correct_count = 0
-            
-            for question in questions:
-                question_id = str(question.id)
-                user_answer = responses_dict.get(question_id, '')
-                
-                is_correct = False
-                
-                if question.question_type == 'mcq':
-                    # Check MCQ answer
-                    correct_option = next(
-                        (opt for opt in question.options if opt.get('is_correct')),
-                        None
-                    )
-                    is_correct = correct_option and user_answer == correct_option.get('text')
-                
-                elif question.question_type == 'true_false':
-                    # Simple true/false check
-                    is_correct = str(user_answer).lower() == str(question.correct_answer).lower()
-                
-                elif question.question_type == 'short_answer':
-                    # Fuzzy matching for short answers
-                    expected = question.correct_answer.lower().strip()
-                    user = user_answer.lower().strip()
-                    # Simple check: contain key words
-                    is_correct = len(expected) > 0 and (expected in user or user in expected)
-                
-                scored_responses[question_id] = {
-                    'user_answer': user_answer,
-                    'is_correct': is_correct,
-                    'correct_answer': question.correct_answer
-                }
-                
-                if is_correct:
-                    correct_count += 1
-            
-            # Calculate score
-            total_questions = len(scored_responses)
-            score_percentage = (correct_count / total_questions * 100) if total_questions > 0 else 0
-            
-            # Save response
+            scoring = score_submission(questions, responses_dict)
+            scored_responses = scoring['scored_responses']
+            correct_count = scoring['correct_count']
+            total_questions = scoring['total_questions']
+            score_percentage = scoring['score_percentage']
+            
+            # Score now; the AI analysis is reused for a known wrong-answer
+            # pattern or generated in the background
+            analysis = quiz_feedback_service.cached_analysis(quiz.id, scored_responses)
             user_response = UserQuizResponse.objects.create(
                 quiz=quiz,
                 session_id=session_id,
@@ -1009,31 +1015,16 @@ class QuizSubmitView(APIView):
                 responses=scored_responses,
                 score=score_percentage,
                 correct_answers=correct_count,
-                total_answers=total_questions
-            )
-            
-            # Generate summary/feedback
-            questions_list = [
-                {
-                    'id': str(q.id),
-                    'type': q.question_type,
-                    'question': q.question_text,
-                    'correct_answer': q.correct_answer,
-                    'explanation': q.explanation
-                }
-                for q in questions
-            ]
-            
-            analysis = quiz_service.generate_quiz_summary_from_responses(
-                quiz.title,
-                scored_responses,
-                questions_list
+                total_answers=total_questions,
+                feedback=(analysis or {}).get('overall_feedback', ''),
+                strengths=(analysis or {}).get('strengths', []),
+                weaknesses=(analysis or {}).get('areas_for_improvement', []),
+                analysis=analysis or {},
+                analysis_status='completed' if analysis is not None else 'pending'
             )
-            
-            user_response.feedback = analysis.get('overall_feedback', '')
-            user_response.strengths = analysis.get('strengths', [])
-            user_response.weaknesses = analysis.get('areas_for_improvement', [])
-            user_response.save()
+            analysis_job = None
+            if analysis is None:
+                analysis_job = quiz_feedback_service.schedule(user_response)
             
             logger.info(f"Quiz submitted. Score: {score_percentage}%")
             
@@ -1043,20 +1034,10 @@ class QuizSubmitView(APIView):
                 'correct_answers': correct_count,
                 'total_questions': total_questions,
                 'analysis': analysis,
-                'results': [
-                    {
-                        'question_id': qid,
-                        'question': next((q.question_text for q in questions if str(q.id) == qid), ''),
-                        'user_answer': resp['user_answer'],
-                        'correct_answer': resp['correct_answer'],
-                        'is_correct': resp['is_correct'],
-                        'explanation': next(
-                            (q.explanation for q in questions if str(q.id) == qid),
-                            ''
-                        )
-                    }
-                    for qid, resp in scored_responses.items()
-                ]
+                'analysis_status': user_response.analysis_status,
+                'analysis_job_id': str(analysis_job.id) if analysis_job else None,
+                'results_url': f'/api/quiz/{user_response.id}/results/',
+                'results': scoring['results']
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
@@ -1089,6 +1070,8 @@ class QuizResultsView(APIView):
                 'feedback': user_response.feedback,
                 'strengths': user_response.strengths,
                 'weaknesses': user_response.weaknesses,
+                'analysis': user_response.analysis or None,
+                'analysis_status': user_response.analysis_status,
                 'completed_at': user_response.completed_at
             }, status=status.HTTP_200_OK)
             
@@ -1163,6 +1146,9 @@ class PredictedQuestionsView(APIView):
     """
     parser_classes = [MultiPartParser, FormParser, JSONParser]
     
+    # Characters of topic/document content used in the prompt
+    CONTENT_CHAR_BUDGET = 2000
+    
     def post(self, request):
         """
         Generate predicted questions from topic or document
@@ -1173,6 +1159,7 @@ class PredictedQuestionsView(APIView):
         - exam_type: Type of exam (default: General)
         - num_questions: Number of questions (default: 5, max: 20)
         - language: 'english' or 'hindi' (default: 'english')
+        - async: queue a job and return its id instead of waiting
         """
         try:
             # Get and validate parameters
@@ -1197,80 +1184,27 @@ class PredictedQuestionsView(APIView):
             # Get content from either topic or document
             if 'document' in request.FILES:
                 logger.info("[PREDICTED_Q] Processing document for predicted questions")
-                try:
-                    document_file = request.FILES['document']
-                    file_name = default_storage.save(f'temp/{document_file.name}', ContentFile(document_file.read()))
-                    file_path = default_storage.path(file_name)
-                    
-                    # Extract text from document
-                    if document_file.name.lower().endswith(('.txt', '.md')):
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            document = f.read()
-                        logger.info(f"[PREDICTED_Q] Extracted {len(document)} chars from text")
-                    elif document_file.name.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp')):
-                        # Use Tesseract OCR for images (fast local extraction)
-                        logger.info("[PREDICTED_Q] Processing image with Tesseract OCR")
-                        ocr_result = ocr_service.extract_text_from_image(file_path)
-                        if ocr_result.get('success'):
-                            document = ocr_result.get('text', '')
-                            logger.info(f"[PREDICTED_Q] Text extraction successful: {len(document)} chars")
-                        else:
-                            logger.warning(f"[PREDICTED_Q] Text extraction failed: {ocr_result.get('error')}")
-                            return Response({
-                                'success': False,
-                                'error': 'Failed to extract text from image',
-                                'details': ocr_result.get('error', 'Text extraction failed')
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    elif document_file.name.lower().endswith('.pdf'):
-                        # Try to extract text from PDF
-                        try:
-                            import PyPDF2
-                            with open(file_path, 'rb') as f:
-                                reader = PyPDF2.PdfReader(f)
-                                document = ' '.join([page.extract_text() for page in reader.pages])
-                            logger.info(f"[PREDICTED_Q] Extracted {len(document)} chars from PDF")
-                        except ImportError:
-                            logger.error("[PREDICTED_Q] PyPDF2 not installed")
-                            return Response({
-                                'success': False,
-                                'error': 'PDF support requires PyPDF2',
-                                'details': 'Install with: pip install PyPDF2'
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                        except Exception as pdf_error:
-                            logger.warning(f"[PREDICTED_Q] PDF extraction failed: {pdf_error}")
-                            document = None
-                    else:
-                        return Response({
-                            'success': False,
-                            'error': f'Unsupported document type: {document_file.name}',
-                            'supported_formats': ['.txt', '.md', '.pdf', '.jpg', '.jpeg', '.png']
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    # Clean up temp file
-                    try:
-                        if os.path.exists(file_path):
-                            os.remove(file_path)
-                        default_storage.delete(file_name)
-                    except Exception as cleanup_error:
-                        logger.warning(f"[PREDICTED_Q] Cleanup error: {cleanup_error}")
-                    
-                    if not document or not document.strip():
-                        return Response({
-                            'success': False,
-                            'error': 'Could not extract text from document',
-                            'message': 'Please ensure the document contains readable text'
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    topic = document[:500]  # Use first 500 chars as topic label
-                    logger.info(f"[PREDICTED_Q] Document processed, topic set to first 500 chars")
-                    
-                except Exception as file_error:
-                    logger.error(f"[PREDICTED_Q] File processing error: {file_error}", exc_info=True)
+                ingested = document_ingestion.ingest(request.FILES['document'], max_chars=self.CONTENT_CHAR_BUDGET)
+                if not ingested['success']:
+                    logger.warning(f"[PREDICTED_Q] Text extraction failed: {ingested['error']}")
                     return Response({
                         'success': False,
-                        'error': 'Failed to process document',
-                        'details': str(file_error)
+                        'error': ingested['error'],
+                        'details': ingested.get('details', ''),
+                        'supported_formats': ingested['supported_formats']
                     }, status=status.HTTP_400_BAD_REQUEST)
+                
+                document = ingested['text']
+                logger.info(f"[PREDICTED_Q] Extracted {len(document)} chars from {ingested['kind']} document")
+                if not document.strip():
+                    return Response({
+                        'success': False,
+                        'error': 'Could not extract text from document',
+                        'message': 'Please ensure the document contains readable text'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                
+                topic = document[:500]  # Use first 500 chars as topic label
+                logger.info(f"[PREDICTED_Q] Document processed, topic set to first 500 chars")
                     
             elif not topic:
                 logger.warning("[PREDICTED_Q] Missing topic and no document provided")
@@ -1282,6 +1216,33 @@ class PredictedQuestionsView(APIView):
                     'supported_formats': ['.txt', '.md', '.pdf', '.jpg', '.jpeg', '.png']
                 }, status=status.HTTP_400_BAD_REQUEST)
             
+            if wants_async(request):
+                return queue_generation(request, 'predicted_questions', {
+                    'topic': topic,
+                    'document': document,
+                    'exam_type': exam_type,
+                    'num_questions': num_questions,
+                    'language': language
+                })
+            
+            return self.generate(topic, document, exam_type, num_questions, language)
+            
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.error(f"JSON parsing error: {e}")
+            return Response({
+                'error': 'Failed to parse generated questions',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except Exception as e:
+            logger.error(f"Error generating predicted questions: {e}", exc_info=True)
+            return Response({
+                'error': 'Failed to generate predicted questions',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def generate(self, topic, document, exam_type, num_questions, language):
+        """Generate predicted questions from validated input (also run by job workers)"""
+        try:
             # Prepare content for Gemini
             content = document if document else topic
             
@@ -1291,7 +1252,7 @@ class PredictedQuestionsView(APIView):
             prompt = f"""You are an expert educator preparing comprehensive study material with predicted exam questions.
 
 CONTENT/TOPIC:
-{content[:2000]}
+{content[:self.CONTENT_CHAR_BUDGET]}
 
 EXAM TYPE: {exam_type}
 NUMBER OF QUESTIONS: {num_questions}
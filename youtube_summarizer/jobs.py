@@ -0,0 +1,14 @@
+"""
+Job handler for queued YouTube summaries
+"""
+
+from question_solver.job_views import job_result
+from question_solver.services.job_queue import job_queue
+
+from .views import YouTubeSummarizerView
+
+
+@job_queue.handler('youtube_summary')
+def summarize_video(payload, progress):
+    progress(10, 'Fetching transcript and summarizing')
+    return job_result(YouTubeSummarizerView().generate(payload['video_url'], payload['video_id']))
@@ -0,0 +1,55 @@
+# Generated by Django 5.0 on 2026-10-19 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('video_id', models.CharField(max_length=32)),
+                ('language', models.CharField(max_length=10)),
+                ('prompt_version', models.CharField(max_length=20)),
+                ('summary', models.TextField()),
+                ('summary_type', models.CharField(max_length=30)),
+                ('segment_count', models.IntegerField(default=0)),
+                ('video_title', models.CharField(blank=True, max_length=255)),
+                ('channel', models.CharField(blank=True, max_length=255)),
+                ('hits', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='VideoTranscript',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('video_id', models.CharField(max_length=32)),
+                ('language', models.CharField(max_length=10)),
+                ('segments', models.JSONField(default=list)),
+                ('segment_count', models.IntegerField(default=0)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-fetched_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='videosummary',
+            constraint=models.UniqueConstraint(fields=('video_id', 'language', 'prompt_version'), name='unique_video_summary_version'),
+        ),
+        migrations.AddConstraint(
+            model_name='videotranscript',
+            constraint=models.UniqueConstraint(fields=('video_id', 'language'), name='unique_video_transcript_language'),
+        ),
+    ]
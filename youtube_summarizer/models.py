@@ -0,0 +1,54 @@
+from django.db import models
+
+
+class VideoTranscript(models.Model):
+    """
+    Fetched YouTube transcript, stored once per video and language
+    Segments are kept as returned by YouTubeService.get_transcript
+    ([{'text', 'start', 'duration'}, ...]).
+    """
+    video_id = models.CharField(max_length=32)
+    language = models.CharField(max_length=10)
+    segments = models.JSONField(default=list)
+    segment_count = models.IntegerField(default=0)
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-fetched_at']
+        constraints = [
+            models.UniqueConstraint(fields=['video_id', 'language'], name='unique_video_transcript_language'),
+        ]
+
+    def __str__(self):
+        return f"{self.video_id} ({self.language}) - {self.segment_count} segments"
+
+
+class VideoSummary(models.Model):
+    """
+    Generated summary of a transcript
+    prompt_version tags the summarization prompt that produced it, so changing
+    the prompt (SUMMARY_PROMPT_VERSION) regenerates summaries instead of
+    serving ones written for the old prompt.
+    """
+    video_id = models.CharField(max_length=32)
+    language = models.CharField(max_length=10)
+    prompt_version = models.CharField(max_length=20)
+    summary = models.TextField()
+    summary_type = models.CharField(max_length=30)
+    segment_count = models.IntegerField(default=0)
+    video_title = models.CharField(max_length=255, blank=True)
+    channel = models.CharField(max_length=255, blank=True)
+    hits = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['video_id', 'language', 'prompt_version'],
+                name='unique_video_summary_version'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.video_id} ({self.language}, {self.prompt_version}) - {self.summary_type}"
@@ -0,0 +1,325 @@
+"""
+Summary Store - Persistent transcript and summary cache for the YouTube summarizer
+- Transcripts are stored per (video_id, language) and summaries per
+  (video_id, language, SUMMARY_PROMPT_VERSION), so a repeat request is one
+  indexed query instead of a transcript fetch, a Gemini call and a Data API call
+- Single-flight: concurrent requests for the same video share one generation.
+  Threads in a worker wait on the leader directly; other workers see a
+  cache.add() lock and poll the table until the leader's summary lands
+- Video details are fetched concurrently with the transcript and summary
+- Only Gemini summaries are stored: the extractive fallback is cheap, and
+  storing it would pin a degraded summary until the next prompt version.
+  Summaries with failed parts are cached for partial_ttl instead, so a part
+  that keeps failing doesn't make every request regenerate the video
+"""
+
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db.models import F
+import logging
+import threading
+import time
+
+from question_solver.services.fetch_engine import fetch_engine
+
+from .models import VideoSummary, VideoTranscript
+from .youtube_service import SUMMARY_PROMPT_VERSION, TRANSCRIPT_LANGUAGE_PREFERENCE
+
+logger = logging.getLogger(__name__)
+
+STORED_SUMMARY_TYPES = ('gemini_ai',)
+PARTIAL_SUMMARY_TYPES = ('gemini_partial', 'gemini_part_notes')
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key, func):
+        """
+        Returns:
+            (result, shared) - shared is True when another thread produced it
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func()
+            return flight.result, False
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+
+def _language_rank(language):
+    try:
+        return TRANSCRIPT_LANGUAGE_PREFERENCE.index(language)
+    except ValueError:
+        return len(TRANSCRIPT_LANGUAGE_PREFERENCE)
+
+
+class SummaryStore:
+    def __init__(self, youtube_service, lock_timeout=180, wait_seconds=90, poll_interval=0.5, partial_ttl=900):
+        self.youtube_service = youtube_service
+        self.prompt_version = SUMMARY_PROMPT_VERSION
+        self.lock_timeout = lock_timeout
+        self.partial_ttl = partial_ttl
+        self.wait_seconds = wait_seconds
+        self.poll_interval = poll_interval
+        self.details_timeout = 10
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'partial_hits': 0,
+            'misses': 0,
+            'shared': 0,
+            'remote_waits': 0,
+            'transcript_hits': 0,
+            'transcript_fetches': 0,
+            'generated': 0,
+        }
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    # ------------------------------------------------------------------
+    # Stored rows
+    # ------------------------------------------------------------------
+
+    def _stored_summary(self, video_id):
+        summaries = list(VideoSummary.objects.filter(video_id=video_id, prompt_version=self.prompt_version))
+        if not summaries:
+            return None
+        return min(summaries, key=lambda row: _language_rank(row.language))
+
+    def _partial_key(self, video_id):
+        return f"yt_summary_partial:{video_id}:{self.prompt_version}"
+
+    def _stored_partial(self, video_id):
+        try:
+            return cache.get(self._partial_key(video_id))
+        except Exception as e:
+            logger.warning(f"[SUMMARY_STORE] Partial summary cache unavailable: {e}")
+            return None
+
+    def _store_partial(self, video_id, result):
+        try:
+            cache.set(self._partial_key(video_id), result, self.partial_ttl)
+        except Exception as e:
+            logger.warning(f"[SUMMARY_STORE] Could not cache partial summary for {video_id}: {e}")
+
+    def _stored_transcript(self, video_id):
+        transcripts = list(VideoTranscript.objects.filter(video_id=video_id))
+        if not transcripts:
+            return None
+        return min(transcripts, key=lambda row: _language_rank(row.language))
+
+    def _summary_result(self, row, cached):
+        return {
+            'success': True,
+            'video_id': row.video_id,
+            'language': row.language,
+            'segments_count': row.segment_count,
+            'summary': row.summary,
+            'summary_type': row.summary_type,
+            'video_title': row.video_title,
+            'channel': row.channel,
+            'prompt_version': row.prompt_version,
+            'cached': cached,
+        }
+
+    def _hit(self, row):
+        VideoSummary.objects.filter(pk=row.pk).update(hits=F('hits') + 1)
+        self._count('hits')
+        return self._summary_result(row, cached=True)
+
+    def _lookup(self, video_id):
+        """Stored summary, else a cached partial one, else None"""
+        row = self._stored_summary(video_id)
+        if row is not None:
+            return self._hit(row)
+        partial = self._stored_partial(video_id)
+        if partial is not None:
+            self._count('partial_hits')
+            return dict(partial, cached=True)
+        return None
+
+    # ------------------------------------------------------------------
+    # Transcript
+    # ------------------------------------------------------------------
+
+    def get_transcript(self, video_id):
+        """
+        Stored transcript, or fetch one and store it
+
+        Returns:
+            YouTubeService.get_transcript result plus 'cached'
+        """
+        row = self._stored_transcript(video_id)
+        if row is not None:
+            self._count('transcript_hits')
+            return {'success': True, 'transcript': row.segments, 'language': row.language, 'cached': True}
+
+        self._count('transcript_fetches')
+        result = self.youtube_service.get_transcript(video_id)
+        if result.get('success'):
+            transcript = result.get('transcript') or []
+            VideoTranscript.objects.update_or_create(
+                video_id=video_id,
+                language=result.get('language', 'unknown'),
+                defaults={'segments': transcript, 'segment_count': len(transcript)}
+            )
+        result['cached'] = False
+        return result
+
+    # ------------------------------------------------------------------
+    # Summary
+    # ------------------------------------------------------------------
+
+    def summarize(self, video_id):
+        """
+        Stored summary for the current prompt version, generating it at most
+        once across concurrent requests
+
+        Returns:
+            dict with success, language, segments_count, summary, summary_type,
+            video_title, channel, prompt_version and cached; on failure success
+            False with error, details and stage ('transcript' or 'summary')
+        """
+        stored = self._lookup(video_id)
+        if stored is not None:
+            return stored
+
+        key = f"{video_id}:{self.prompt_version}"
+        result, shared = self._flight.do(key, lambda: self._generate_locked(video_id))
+        if shared:
+            self._count('shared')
+            result = dict(result, cached=result.get('success', False))
+        return result
+
+    def _generate_locked(self, video_id):
+        lock_key = f"yt_summary_lock:{video_id}:{self.prompt_version}"
+        try:
+            acquired = cache.add(lock_key, 1, self.lock_timeout)
+        except Exception as e:
+            logger.warning(f"[SUMMARY_STORE] Lock unavailable, generating without it: {e}")
+            acquired = True
+
+        if not acquired:
+            # Another worker is generating - wait for its result rather than
+            # paying for a second Gemini call
+            self._count('remote_waits')
+            logger.info(f"[SUMMARY_STORE] Waiting for in-flight summary of {video_id}")
+            give_up_at = time.monotonic() + self.wait_seconds
+            while time.monotonic() < give_up_at:
+                time.sleep(self.poll_interval)
+                stored = self._lookup(video_id)
+                if stored is not None:
+                    return stored
+                try:
+                    if cache.get(lock_key) is None:
+                        break
+                except Exception:
+                    break
+            logger.warning(f"[SUMMARY_STORE] No stored summary for {video_id} after waiting, generating")
+
+        try:
+            # The previous holder may have finished between our lookup and the lock
+            stored = self._lookup(video_id)
+            if stored is not None:
+                return stored
+            return self._generate(video_id)
+        finally:
+            if acquired:
+                try:
+                    cache.delete(lock_key)
+                except Exception:
+                    pass
+
+    def _generate(self, video_id):
+        self._count('misses')
+        # Video details don't depend on the transcript or summary: fetch them
+        # on the shared pool while this thread does the slow part
+        details_future = fetch_engine.submit(self.youtube_service.get_video_details, video_id)
+
+        transcript_result = self.get_transcript(video_id)
+        if not transcript_result.get('success'):
+            return {
+                'success': False,
+                'stage': 'transcript',
+                'error': transcript_result.get('error'),
+                'details': transcript_result.get('details'),
+            }
+
+        transcript = transcript_result.get('transcript')
+        language = transcript_result.get('language', 'unknown')
+        logger.info(f"[SUMMARY_STORE] Generating {self.prompt_version} summary for {video_id} ({language}, {len(transcript)} segments)")
+
+        summary_result = self.youtube_service.summarize_transcript(transcript)
+        if not summary_result.get('success'):
+            return {
+                'success': False,
+                'stage': 'summary',
+                'error': summary_result.get('error'),
+                'details': summary_result.get('details'),
+            }
+        self._count('generated')
+
+        try:
+            video_details = details_future.result(timeout=self.details_timeout)
+        except Exception as e:
+            logger.warning(f"[SUMMARY_STORE] Video details for {video_id} unavailable: {e}")
+            video_details = None
+        snippet = (video_details or {}).get('snippet', {})
+
+        row = VideoSummary(
+            video_id=video_id,
+            language=language,
+            prompt_version=self.prompt_version,
+            summary=summary_result.get('summary'),
+            summary_type=summary_result.get('summary_type'),
+            segment_count=len(transcript),
+            video_title=snippet.get('title', 'Unknown Title')[:255],
+            channel=snippet.get('channelTitle', 'Unknown Channel')[:255],
+        )
+        if row.summary_type in STORED_SUMMARY_TYPES:
+            try:
+                row.save()
+            except IntegrityError:
+                # Lost a race with a worker that generated without the lock
+                logger.info(f"[SUMMARY_STORE] Summary for {video_id} already stored")
+        elif row.summary_type in PARTIAL_SUMMARY_TYPES:
+            self._store_partial(video_id, self._summary_result(row, cached=False))
+        return self._summary_result(row, cached=False)
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+        s['prompt_version'] = self.prompt_version
+        return s
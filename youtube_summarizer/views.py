@@ -3,16 +3,26 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
 import logging
+from question_solver.job_views import wants_async, queue_generation
+from .summary_store import SummaryStore
 from .youtube_service import YouTubeService
 
 logger = logging.getLogger(__name__)
 youtube_service = YouTubeService()
+summary_store = SummaryStore(
+    youtube_service,
+    lock_timeout=getattr(settings, 'SUMMARY_LOCK_TIMEOUT_SECONDS', 180),
+    wait_seconds=getattr(settings, 'SUMMARY_WAIT_SECONDS', 90),
+    partial_ttl=getattr(settings, 'SUMMARY_PARTIAL_TTL_SECONDS', 900),
+)
 
 
 class YouTubeSummarizerView(APIView):
     """
     API view to summarize YouTube videos
     Extracts transcript and generates AI summary
+    Send async=true (or 'Prefer: respond-async') to get a job id instead of
+    waiting for generation
     """
     def post(self, request):
         try:
@@ -38,64 +48,60 @@ class YouTubeSummarizerView(APIView):
             
             logger.info(f"Extracted video ID: {video_id}")
             
-            # Fetch transcript
-            transcript_result = youtube_service.get_transcript(video_id)
-            if not transcript_result.get('success'):
-                logger.error(f"Failed to get transcript: {transcript_result.get('error')}")
-                return Response(
-                    {
-                        'success': False,
-                        'error': transcript_result.get('error'),
-                        'details': transcript_result.get('details')
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+            if wants_async(request):
+                return queue_generation(request, 'youtube_summary', {'video_url': video_url, 'video_id': video_id})
             
-            transcript = transcript_result.get('transcript')
-            language = transcript_result.get('language', 'unknown')
+            return self.generate(video_url, video_id)
             
-            logger.info(f"Successfully fetched transcript ({language}) with {len(transcript)} segments")
-            
-            # Summarize transcript
-            summary_result = youtube_service.summarize_transcript(transcript)
-            if not summary_result.get('success'):
-                logger.error(f"Failed to summarize transcript: {summary_result.get('error')}")
+        except Exception as e:
+            logger.error(f"Error in YouTubeSummarizerView: {str(e)}", exc_info=True)
+            return Response(
+                {
+                    'error': 'Internal server error',
+                    'details': str(e)
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    def generate(self, video_url, video_id):
+        """Summarize a validated video (also run by job workers)"""
+        try:
+            # Stored summary, or transcript -> Gemini -> video details once
+            # for all concurrent requests of this video
+            result = summary_store.summarize(video_id)
+            if not result.get('success'):
+                logger.error(f"Failed to summarize video ({result.get('stage')}): {result.get('error')}")
                 return Response(
                     {
                         'success': False,
-                        'error': summary_result.get('error'),
-                        'details': summary_result.get('details')
+                        'error': result.get('error'),
+                        'details': result.get('details')
                     },
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                    status=status.HTTP_400_BAD_REQUEST if result.get('stage') == 'transcript'
+                    else status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
             
-            summary = summary_result.get('summary')
-            summary_type = summary_result.get('summary_type')
-            
-            logger.info(f"Successfully summarized transcript using {summary_type}")
-            
-            # Get video details if available
-            video_details = youtube_service.get_video_details(video_id)
-            if video_details:
-                video_title = video_details.get('snippet', {}).get('title', 'Unknown Title')
-                video_channel = video_details.get('snippet', {}).get('channelTitle', 'Unknown Channel')
-            else:
-                video_title = 'Unknown Title'
-                video_channel = 'Unknown Channel'
+            segments_count = result.get('segments_count', 0)
+            logger.info(
+                f"Summary for {video_id} ({result.get('language')}) via {result.get('summary_type')}"
+                f"{' [cached]' if result.get('cached') else ''}"
+            )
             
             return Response({
                 'success': True,
                 'video_url': video_url,
                 'video_id': video_id,
-                'video_title': video_title,
-                'channel': video_channel,
+                'video_title': result.get('video_title') or 'Unknown Title',
+                'channel': result.get('channel') or 'Unknown Channel',
                 'transcript': {
-                    'language': language,
-                    'segments_count': len(transcript),
-                    'duration_text': f"{len(transcript)} text segments"
+                    'language': result.get('language', 'unknown'),
+                    'segments_count': segments_count,
+                    'duration_text': f"{segments_count} text segments"
                 },
-                'summary': summary,
-                'summary_type': summary_type,
+                'summary': result.get('summary'),
+                'summary_type': result.get('summary_type'),
+                'prompt_version': result.get('prompt_version'),
+                'cached': result.get('cached', False),
                 'message': 'Video successfully summarized'
             }, status=status.HTTP_200_OK)
             
@@ -1,11 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor, wait
 from django.conf import settings
+import hashlib
 import logging
-import requests
+import os
+import time
+from question_solver.services.cache_service import summary_chunk_cache, youtube_metadata_cache
+from question_solver.services.fetch_engine import fetch_engine
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the summarization prompt or model changes: stored summaries
+# are keyed by this tag, so old ones stop being served
+SUMMARY_PROMPT_VERSION = 'v2'
+
+# Order get_transcript() settles on when a video has several transcripts
+TRANSCRIPT_LANGUAGE_PREFERENCE = ('en', 'hi', 'es', 'fr')
+
+SUMMARY_MODEL = 'gemini-2.0-flash'
+
+SUMMARY_STRUCTURE = """The summary should include:
+
+1. **EXECUTIVE SUMMARY** (2-3 sentences)
+   - What is the video fundamentally about?
+   - Main message and purpose
+
+2. **VIDEO TIMELINE & KEY SECTIONS WITH TIMESTAMPS**
+   - For each major topic/section, provide:
+     - Exact timestamp [MM:SS] when section starts
+     - What is being discussed
+     - Key points and important details
+     - Speaker's emphasis and tone
+     - Duration of each section
+
+3. **MAIN TOPIC AND CORE MESSAGE**
+   - Primary subject matter
+   - Central thesis or argument
+   - Overall narrative flow
+
+4. **DETAILED KEY POINTS** (Numbered, with timestamps)
+   - Each point with its timestamp
+   - Explanation of importance
+   - Related context
+
+5. **IMPORTANT CONCEPTS & DEFINITIONS** (with timestamps)
+   - Each concept explained
+   - Why it matters
+   - Examples provided in the video
+
+6. **STATISTICS, DATA & NUMBERS** (with timestamps)
+   - All quantifiable information
+   - Percentages, metrics, values
+   - Sources mentioned
+
+7. **QUOTES & NOTABLE STATEMENTS** (with exact timestamps)
+   - Important quotes
+   - Key statements or declarations
+   - Speaker's emphasis
+
+8. **VISUAL DESCRIPTIONS** (if mentioned with timestamps)
+   - What was shown on screen
+   - Visual aids or demonstrations
+   - Graphics or charts mentioned
+
+9. **TARGET AUDIENCE**
+   - Who is this video for?
+   - Required background knowledge
+   - Difficulty level
+
+10. **KEY TAKEAWAYS** (5-10 main learnings)
+    - What viewers should remember
+    - Practical applications
+    - Action items if any
+
+11. **CHAPTER BREAKDOWN** (If applicable)
+    - Introduction [00:00]
+    - Body sections [MM:SS - MM:SS]
+    - Conclusion [MM:SS]
+
+12. **OVERALL ASSESSMENT**
+    - Quality of content
+    - Credibility and accuracy
+    - Engagement level
+    - Educational value
+    - Entertainment value
+    - Recommendations
+
+13. **VIEWER QUESTIONS ANSWERED**
+    - Common questions about the topic
+    - Answers from the video
+
+14. **RELATED TOPICS & SUGGESTIONS**
+    - Topics mentioned but not deeply explored
+    - Suggestions for further learning
+
+FORMAT:
+- Use clear markdown headers
+- Use timestamps for all references
+- Use bullet points for listelists
+- Use numbered lists for sequential information
+- Bold important terms and concepts
+- Include time references for everything possible"""
+
+
+def format_timestamp(seconds):
+    """[MM:SS] (minutes keep counting past the hour, as in the summaries)"""
+    seconds = int(seconds)
+    return f"[{seconds // 60:02d}:{seconds % 60:02d}]"
+
+
+def chunk_transcript(transcript_list, chunk_seconds=600, max_chars=15000):
+    """
+    Split transcript segments into consecutive time-bounded chunks
+
+    A chunk closes when it spans chunk_seconds or would exceed max_chars, so
+    every segment lands in exactly one chunk.
+
+    Returns:
+        list of {'start': seconds, 'end': seconds, 'segments': [...]}
+    """
+    chunks = []
+    current = []
+    chunk_start = 0
+    chars = 0
+    for item in transcript_list:
+        start = item.get('start', 0)
+        if current and (start - chunk_start >= chunk_seconds or chars + len(item['text']) > max_chars):
+            chunks.append(current)
+            current = []
+            chars = 0
+        if not current:
+            chunk_start = start
+        current.append(item)
+        chars += len(item['text']) + 1
+    if current:
+        chunks.append(current)
+
+    return [
+        {
+            'start': segments[0].get('start', 0),
+            'end': segments[-1].get('start', 0) + segments[-1].get('duration', 0),
+            'segments': segments,
+        }
+        for segments in chunks
+    ]
+
 
 class YouTubeService:
     """
@@ -14,16 +154,35 @@ class YouTubeService:
     def __init__(self):
         self.api_key = settings.YOUTUBE_API_KEY
         self.base_url = 'https://www.googleapis.com/youtube/v3'
+        # Reused so transcript calls keep their HTTP connections alive
+        self._transcript_api = YouTubeTranscriptApi()
+        self.chunk_seconds = getattr(settings, 'SUMMARY_CHUNK_SECONDS', 600)
+        self.chunk_max_chars = getattr(settings, 'SUMMARY_CHUNK_MAX_CHARS', 15000)
+        self.map_timeout = getattr(settings, 'SUMMARY_MAP_TIMEOUT_SECONDS', 90)
+        self.map_retries = getattr(settings, 'SUMMARY_MAP_RETRIES', 1)
+        # Long-lived pool for chunk summaries; its size bounds concurrent
+        # Gemini calls per worker
+        self._map_executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'SUMMARY_MAP_CONCURRENCY', 4),
+            thread_name_prefix='summary-map'
+        )
     
     def get_video_details(self, video_id):
         """
         Fetch video details from YouTube API
+        Cached in youtube_metadata_cache; unknown videos are cached negatively
         """
         try:
             if not self.api_key:
                 logger.warning("YouTube API key not configured")
                 return None
             
+            # Video ids are case-sensitive, so no query normalization here
+            cache_key = youtube_metadata_cache.make_exact_key(video_id, 'videos')
+            cached = youtube_metadata_cache.get(cache_key)
+            if cached is not None:
+                return None if youtube_metadata_cache.is_negative(cached) else cached
+            
             url = f"{self.base_url}/videos"
             params = {
                 'part': 'snippet,contentDetails,statistics',
@@ -31,12 +190,16 @@ class YouTubeService:
                 'key': self.api_key
             }
             
-            response = requests.get(url, params=params)
+            started = time.perf_counter()
+            response = fetch_engine.get(url, params=params, timeout=10)
             response.raise_for_status()
+            youtube_metadata_cache.record_upstream((time.perf_counter() - started) * 1000)
             
             data = response.json()
             if data.get('items'):
+                youtube_metadata_cache.set(cache_key, data['items'][0])
                 return data['items'][0]
+            youtube_metadata_cache.set_negative(cache_key, 'not found')
             return None
         except Exception as e:
             logger.error(f"Error fetching video details: {str(e)}")
@@ -58,7 +221,7 @@ class YouTubeService:
                 'key': self.api_key
             }
             
-            response = requests.get(url, params=params)
+            response = fetch_engine.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -82,80 +245,56 @@ class YouTubeService:
             logger.error(f"Error extracting video ID: {str(e)}")
             return None
 
+    @staticmethod
+    def _pick_transcript(transcript_list):
+        """
+        Best available transcript by TRANSCRIPT_LANGUAGE_PREFERENCE, matched in
+        memory: exact language codes before regional variants (en before
+        en-GB), manually created before auto-generated
+        """
+        best = None
+        best_rank = None
+        for transcript in transcript_list:
+            code = transcript.language_code.lower()
+            base = code.split('-')[0]
+            if base not in TRANSCRIPT_LANGUAGE_PREFERENCE:
+                continue
+            rank = (TRANSCRIPT_LANGUAGE_PREFERENCE.index(base), code != base, transcript.is_generated)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = transcript, rank
+        return best
+
     def get_transcript(self, video_id):
+        """
+        One list() call for the available transcripts, then one download of
+        the preferred one (no per-language lookups)
+        """
         try:
             logger.info(f"Fetching transcript for video ID: {video_id}")
             
-            # Create API instance
-            api = YouTubeTranscriptApi()
-            
-            # Try to fetch transcript (preferring English)
-            try:
-                transcript_data = api.fetch(video_id)
-                logger.info(f"Successfully fetched transcript for {video_id}")
-                # Convert to dict format
-                transcript = [{'text': item.text, 'start': item.start, 'duration': item.duration} 
-                             for item in transcript_data]
+            transcript_list = self._transcript_api.list(video_id)
+            found = self._pick_transcript(transcript_list)
+            if found is None:
+                logger.error(f"No transcripts available for {video_id} in {TRANSCRIPT_LANGUAGE_PREFERENCE}")
                 return {
-                    'success': True,
-                    'transcript': transcript,
-                    'language': 'en'
+                    'success': False,
+                    'error': 'No transcripts available for this video',
+                    'details': 'The video does not have captions/subtitles enabled or they are disabled'
                 }
-            except NoTranscriptFound:
-                # If English transcript not found, try to list available ones
-                logger.warning(f"English transcript not found for {video_id}, trying other languages")
-                try:
-                    transcript_list = api.list(video_id)
-                    
-                    # Try to find Hindi transcript first
-                    transcripts_to_try = [
-                        ('hi', 'Hindi'),
-                        ('en', 'English'),
-                        ('es', 'Spanish'),
-                        ('fr', 'French'),
-                    ]
-                    
-                    found_transcript = None
-                    found_lang = None
-                    found_lang_name = None
-                    
-                    for lang_code, lang_name in transcripts_to_try:
-                        try:
-                            found_transcript = transcript_list.find_generated_transcript([lang_code])
-                            found_lang = lang_code
-                            found_lang_name = lang_name
-                            logger.info(f"Found auto-generated {lang_name} ({lang_code}) transcript")
-                            break
-                        except:
-                            try:
-                                found_transcript = transcript_list.find_manually_created_transcript([lang_code])
-                                found_lang = lang_code
-                                found_lang_name = lang_name
-                                logger.info(f"Found manually created {lang_name} ({lang_code}) transcript")
-                                break
-                            except:
-                                continue
-                    
-                    if found_transcript:
-                        transcript_data = found_transcript.fetch()
-                        transcript = [{'text': item.text, 'start': item.start, 'duration': item.duration} 
-                                     for item in transcript_data]
-                        logger.info(f"Fetched {found_lang_name} transcript with {len(transcript)} segments")
-                        return {
-                            'success': True,
-                            'transcript': transcript,
-                            'language': found_lang
-                        }
-                    else:
-                        raise Exception("No suitable transcript found")
-                        
-                except Exception as e:
-                    logger.error(f"No transcripts available for {video_id}: {str(e)}")
-                    return {
-                        'success': False,
-                        'error': 'No transcripts available for this video',
-                        'details': 'The video does not have captions/subtitles enabled or they are disabled'
-                    }
+            
+            transcript_data = found.fetch()
+            transcript = [{'text': item.text, 'start': item.start, 'duration': item.duration}
+                          for item in transcript_data]
+            language = found.language_code.split('-')[0].lower()
+            logger.info(
+                f"Fetched {'auto-generated' if found.is_generated else 'manually created'} "
+                f"{found.language} ({found.language_code}) transcript with {len(transcript)} segments"
+            )
+            return {
+                'success': True,
+                'transcript': transcript,
+                'language': language
+            }
             
         except TranscriptsDisabled:
             logger.warning(f"Transcripts are disabled for video {video_id}")
@@ -164,6 +303,13 @@ class YouTubeService:
                 'error': 'Transcripts disabled',
                 'details': 'This video has transcripts disabled'
             }
+        except NoTranscriptFound:
+            logger.error(f"No transcripts available for {video_id}")
+            return {
+                'success': False,
+                'error': 'No transcripts available for this video',
+                'details': 'The video does not have captions/subtitles enabled or they are disabled'
+            }
         except Exception as e:
             logger.error(f"Error fetching transcript: {str(e)}")
             return {
@@ -175,13 +321,20 @@ class YouTubeService:
     def summarize_transcript(self, transcript_list):
         """
         Summarize transcript using Gemini AI with timestamps and deep analysis
+
+        Transcripts longer than one chunk (SUMMARY_CHUNK_SECONDS /
+        SUMMARY_CHUNK_MAX_CHARS) go through _map_reduce_summarize so the whole
+        video is covered; shorter ones use a single prompt.
         """
         try:
-            import sys
-            import os
-            from question_solver.services.gemini_service import gemini_service
             import datetime
             
+            chunks = chunk_transcript(transcript_list, self.chunk_seconds, self.chunk_max_chars)
+            if len(chunks) > 1:
+                result = self._map_reduce_summarize(transcript_list, chunks)
+                if result:
+                    return result
+            
             # Build transcript with timestamps
             transcript_with_timestamps = []
             for item in transcript_list:
@@ -219,88 +372,7 @@ Video Metadata:
 - Total Segments: {len(transcript_list)} segments
 - Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
-The summary should include:
-
-1. **EXECUTIVE SUMMARY** (2-3 sentences)
-   - What is the video fundamentally about?
-   - Main message and purpose
-
-2. **VIDEO TIMELINE & KEY SECTIONS WITH TIMESTAMPS**
-   - For each major topic/section, provide:
-     - Exact timestamp [MM:SS] when section starts
-     - What is being discussed
-     - Key points and important details
-     - Speaker's emphasis and tone
-     - Duration of each section
-
-3. **MAIN TOPIC AND CORE MESSAGE**
-   - Primary subject matter
-   - Central thesis or argument
-   - Overall narrative flow
-
-4. **DETAILED KEY POINTS** (Numbered, with timestamps)
-   - Each point with its timestamp
-   - Explanation of importance
-   - Related context
-
-5. **IMPORTANT CONCEPTS & DEFINITIONS** (with timestamps)
-   - Each concept explained
-   - Why it matters
-   - Examples provided in the video
-
-6. **STATISTICS, DATA & NUMBERS** (with timestamps)
-   - All quantifiable information
-   - Percentages, metrics, values
-   - Sources mentioned
-
-7. **QUOTES & NOTABLE STATEMENTS** (with exact timestamps)
-   - Important quotes
-   - Key statements or declarations
-   - Speaker's emphasis
-
-8. **VISUAL DESCRIPTIONS** (if mentioned with timestamps)
-   - What was shown on screen
-   - Visual aids or demonstrations
-   - Graphics or charts mentioned
-
-9. **TARGET AUDIENCE**
-   - Who is this video for?
-   - Required background knowledge
-   - Difficulty level
-
-10. **KEY TAKEAWAYS** (5-10 main learnings)
-    - What viewers should remember
-    - Practical applications
-    - Action items if any
-
-11. **CHAPTER BREAKDOWN** (If applicable)
-    - Introduction [00:00]
-    - Body sections [MM:SS - MM:SS]
-    - Conclusion [MM:SS]
-
-12. **OVERALL ASSESSMENT**
-    - Quality of content
-    - Credibility and accuracy
-    - Engagement level
-    - Educational value
-    - Entertainment value
-    - Recommendations
-
-13. **VIEWER QUESTIONS ANSWERED**
-    - Common questions about the topic
-    - Answers from the video
-
-14. **RELATED TOPICS & SUGGESTIONS**
-    - Topics mentioned but not deeply explored
-    - Suggestions for further learning
-
-FORMAT:
-- Use clear markdown headers
-- Use timestamps for all references
-- Use bullet points for listelists
-- Use numbered lists for sequential information
-- Bold important terms and concepts
-- Include time references for everything possible
+{SUMMARY_STRUCTURE}
 
 TRANSCRIPT WITH TIMESTAMPS:
 {full_text_with_ts}
@@ -308,13 +380,7 @@ TRANSCRIPT WITH TIMESTAMPS:
 Please analyze this comprehensively and provide a detailed, well-structured summary with timestamps for every key point."""
             
             try:
-                # Try using Gemini API directly
-                import google.generativeai as genai
-                genai.configure(api_key=os.getenv('GEMINI_API_KEY', ''))
-                model = genai.GenerativeModel('gemini-2.0-flash')
-                response = model.generate_content(prompt)
-                
-                summary = response.text if response and hasattr(response, 'text') else str(response)
+                summary = self._gemini_generate(prompt)
                 
                 return {
                     'success': True,
@@ -332,6 +398,146 @@ Please analyze this comprehensively and provide a detailed, well-structured summ
             logger.error(f"Error summarizing transcript: {str(e)}")
             return self._simple_summarize(transcript_list)
 
+    def _gemini_generate(self, prompt):
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv('GEMINI_API_KEY', ''))
+        model = genai.GenerativeModel(SUMMARY_MODEL)
+        response = model.generate_content(prompt)
+        return response.text if response and hasattr(response, 'text') else str(response)
+
+    def _summarize_chunk(self, chunk, index, total):
+        """
+        Map step: timestamped notes for one chunk, cached by content hash
+
+        Returns:
+            (notes, from_cache)
+        """
+        lines = '\n'.join(f"{format_timestamp(item.get('start', 0))} {item['text']}" for item in chunk['segments'])
+        digest = hashlib.sha256(f"{SUMMARY_MODEL}\x1f{lines}".encode('utf-8')).hexdigest()
+        cache_key = summary_chunk_cache.make_key(digest, SUMMARY_PROMPT_VERSION)
+        cached = summary_chunk_cache.get(cache_key)
+        if cached is not None and not summary_chunk_cache.is_negative(cached):
+            return cached, True
+
+        prompt = f"""You are taking detailed notes on part {index + 1} of {total} of a YouTube video transcript.
+This part covers {format_timestamp(chunk['start'])} to {format_timestamp(chunk['end'])}.
+
+Write concise but complete notes for THIS PART ONLY:
+- Every topic or section discussed, each starting with its [MM:SS] timestamp
+- Key points, concepts and definitions, with timestamps
+- Statistics, numbers, examples and notable quotes, with timestamps
+- Use only timestamps that appear in the transcript below
+- Markdown bullet points, no introduction or conclusion
+
+TRANSCRIPT PART {index + 1} WITH TIMESTAMPS:
+{lines}"""
+        started = time.perf_counter()
+        notes = self._gemini_generate(prompt)
+        summary_chunk_cache.record_upstream((time.perf_counter() - started) * 1000)
+        summary_chunk_cache.set(cache_key, notes)
+        return notes, False
+
+    @staticmethod
+    def _extractive_chunk_notes(chunk):
+        """Stand-in notes for a chunk whose map call failed, so its minutes stay covered"""
+        segments = chunk['segments']
+        picked = segments if len(segments) <= 6 else segments[:3] + segments[-3:]
+        return '\n'.join(f"- {format_timestamp(item.get('start', 0))} {item['text']}" for item in picked)
+
+    def _map_reduce_summarize(self, transcript_list, chunks):
+        """
+        Summarize each chunk concurrently (map), then merge the timestamped
+        notes into the full summary structure (reduce)
+
+        Returns:
+            summary result dict, or None to fall back to the single-prompt path
+        """
+        import datetime
+
+        started = time.perf_counter()
+        futures = [
+            self._map_executor.submit(self._summarize_chunk, chunk, index, len(chunks))
+            for index, chunk in enumerate(chunks)
+        ]
+        wait(futures, timeout=self.map_timeout)
+
+        # Chunks whose map call raised get one more attempt (Gemini errors
+        # are mostly transient); chunks still running past the timeout don't
+        retry = [
+            index for index, future in enumerate(futures)
+            if future.done() and not future.cancelled() and future.exception() is not None
+        ]
+        for _ in range(self.map_retries if retry else 0):
+            logger.info(f"[SUMMARY_MAP] Retrying {len(retry)} failed chunk(s)")
+            for index in retry:
+                futures[index] = self._map_executor.submit(self._summarize_chunk, chunks[index], index, len(chunks))
+            wait([futures[index] for index in retry], timeout=self.map_timeout)
+            retry = [index for index in retry if futures[index].done() and futures[index].exception() is not None]
+            if not retry:
+                break
+
+        sections = []
+        failed = 0
+        cache_hits = 0
+        for index, (chunk, future) in enumerate(zip(chunks, futures)):
+            span = f"{format_timestamp(chunk['start'])} - {format_timestamp(chunk['end'])}"
+            try:
+                notes, from_cache = future.result(timeout=0)
+                cache_hits += from_cache
+            except Exception as e:
+                future.cancel()
+                failed += 1
+                logger.warning(f"[SUMMARY_MAP] Chunk {index + 1}/{len(chunks)} ({span}) failed: {e}")
+                notes = self._extractive_chunk_notes(chunk)
+            sections.append(f"### Part {index + 1} {span}\n{notes}")
+
+        if failed == len(chunks):
+            logger.warning("[SUMMARY_MAP] Every chunk failed, falling back")
+            return None
+
+        logger.info(
+            f"[SUMMARY_MAP] {len(chunks)} chunks ({cache_hits} cached, {failed} failed) "
+            f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+        total_duration = chunks[-1]['end']
+        notes_text = '\n\n'.join(sections)
+        prompt = f"""Please provide an EXTREMELY DETAILED and COMPREHENSIVE summary of a YouTube video.
+You are given timestamped notes covering the whole video, part by part, in order.
+
+IMPORTANT: Include timestamps [MM:SS] for all key points, moments, and sections discussed.
+Keep the timestamps from the notes - do not invent new ones - and cover every part.
+
+Video Metadata:
+- Total Duration: {format_timestamp(total_duration)[1:-1]} minutes
+- Total Segments: {len(transcript_list)} segments
+- Parts: {len(chunks)}
+- Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+{SUMMARY_STRUCTURE}
+
+TIMESTAMPED NOTES BY PART:
+{notes_text}
+
+Please analyze this comprehensively and provide a detailed, well-structured summary with timestamps for every key point."""
+
+        try:
+            summary = self._gemini_generate(prompt)
+            summary_type = 'gemini_ai'
+        except Exception as e:
+            # The part notes already cover the whole video with timestamps
+            logger.warning(f"[SUMMARY_REDUCE] Reduce call failed: {e}, returning part notes")
+            summary = notes_text
+            summary_type = 'gemini_part_notes'
+
+        return {
+            'success': True,
+            'summary': summary,
+            'summary_type': summary_type if not failed else 'gemini_partial',
+            'chunks': len(chunks),
+            'failed_chunks': failed,
+        }
+
     def _simple_summarize(self, transcript_list):
         """
         Simple fallback summarization based on extracting key sentences